@@ -1,16 +1,57 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+import anyio
 import argparse
 import math
 import numpy as np
-from scipy import stats
-from sympy import symbols, solve, sympify, diff, integrate, oo, Sum
-from typing import List, Tuple
+from scipy import optimize, sparse, stats, special
+from scipy.sparse import linalg as sparse_linalg
+from scipy import integrate as scipy_integrate
+from sympy import symbols, solve, sympify, diff, integrate, oo, Sum, linsolve, nsolve
+from typing import Dict, List, Optional, Tuple, Union
 import matplotlib.pyplot as plt
 import sympy as sp
+import mpmath
 import numpy as np
 import matplotlib.pyplot as plt
 from sympy import integrate as sympy_integrate
+from sympy.core.mul import _keep_coeff
+from sympy.integrals.heurisch import heurisch
+from sympy.integrals.manualintegrate import manualintegrate
+from sympy.integrals.meijerint import meijerint_indefinite
+from sympy.integrals.risch import NonElementaryIntegral, risch_integrate
+from collections import OrderedDict
+from fractions import Fraction
+import ast
+import base64
+import cmath
+import concurrent.futures
+import decimal
+import functools
+import hashlib
+import io
+import json
+import keyword
+import linecache
 import logging
+import multiprocessing
+import operator
+import os
+import queue
+import re
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import tokenize
+import types
+import warnings
+import weakref
+
+try:
+    import resource
+except ImportError:  # resource limits are only available on POSIX
+    resource = None
 
 # Create MCP Server
 app = FastMCP(
@@ -19,9 +60,127 @@ app = FastMCP(
 
 TRANSPORT = "sse"
 
+
+def _blocking_tool():
+    """
+    Registers a tool that may block (worker pools, time budgets) to run off the event loop.
+
+    FastMCP calls synchronous tools directly on its event loop, so a tool waiting for a
+    worker process or a time budget would stall every other client. The server instead
+    gets an async wrapper that awaits the tool in a worker thread; the decorated function
+    itself is returned unchanged, so in-process callers keep calling it synchronously.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def run_in_thread(*args, **kwargs):
+            return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs))
+
+        app.tool()(run_in_thread)
+        return func
+
+    return decorator
+
+class Allowlisted:
+    """
+    A module exposed to `calculate` expressions through an explicit allowlist of its members.
+
+    Expressions see this object instead of the module itself, so everything not listed
+    (submodules, file I/O, ctypes, ...) is unreachable. Names missing from the installed
+    version of the module are skipped; listed members must not be modules themselves.
+    """
+
+    def __init__(self, module: types.ModuleType, names):
+        self.name = module.__name__
+        self.members = {}
+        for name in names:
+            if not hasattr(module, name):
+                continue
+            member = getattr(module, name)
+            if isinstance(member, types.ModuleType):
+                raise TypeError(f"{self.name}.{name} is a module and cannot be allowlisted")
+            self.members[name] = member
+
+    def __repr__(self):
+        return f"<allowlisted module '{self.name}'>"
+
+
+def _isolated(func):
+    """
+    Rebuilds a helper function with empty globals.
+
+    Expressions can reach the helpers of ALLOW_FUNCTION, and a function's __globals__
+    would otherwise lead back to this module (and from there to os.environ). The
+    helpers therefore take everything they need from their closure.
+    """
+    return types.FunctionType(func.__code__, {"__builtins__": {}}, func.__name__, func.__defaults__, func.__closure__)
+
+
+def _reciprocal(func):
+    """1 / func(x), e.g. cot from tan."""
+    return _isolated(lambda x: 1 / func(x))
+
+
+def _log_with_base(log):
+    """log(x) with an optional base, as in math.log."""
+    return _isolated(lambda x, base=None: log(x) if base is None else log(x) / log(base))
+
+
+def _integer_sqrt(floor, sqrt, int64):
+    """Element-wise isqrt of an array."""
+    return _isolated(lambda x: floor(sqrt(x)).astype(int64))
+
+
+# Members of `math` available to expressions
+_MATH_ALLOWLIST = (
+    "acos", "acosh", "asin", "asinh", "atan", "atan2", "atanh", "cbrt", "ceil", "comb", "copysign",
+    "cos", "cosh", "degrees", "dist", "e", "erf", "erfc", "exp", "exp2", "expm1", "fabs", "factorial",
+    "floor", "fmod", "frexp", "fsum", "gamma", "gcd", "hypot", "inf", "isclose", "isfinite", "isinf",
+    "isnan", "isqrt", "lcm", "ldexp", "lgamma", "log", "log10", "log1p", "log2", "modf", "nan",
+    "nextafter", "perm", "pi", "pow", "prod", "radians", "remainder", "sin", "sinh", "sqrt", "sumprod",
+    "tan", "tanh", "tau", "trunc", "ulp",
+)
+
+# Members of `np` available to expressions: constants, ufuncs, reductions and array
+# constructors. Nothing here reads or writes files or exposes raw memory.
+_NUMPY_ALLOWLIST = (
+    # Constants
+    "pi", "e", "inf", "nan", "euler_gamma",
+    # Elementwise functions
+    "abs", "absolute", "sign", "sqrt", "cbrt", "square", "exp", "exp2", "expm1", "log", "log2",
+    "log10", "log1p", "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh",
+    "tanh", "arcsinh", "arccosh", "arctanh", "hypot", "degrees", "radians", "deg2rad", "rad2deg",
+    "floor", "ceil", "trunc", "rint", "round", "fix", "mod", "fmod", "remainder", "divmod", "power",
+    "float_power", "reciprocal", "maximum", "minimum", "fmax", "fmin", "clip", "isfinite", "isinf",
+    "isnan", "isclose", "allclose", "array_equal", "real", "imag", "conj", "conjugate", "angle",
+    "gcd", "lcm", "heaviside", "sinc", "add", "subtract", "multiply", "divide", "true_divide",
+    "floor_divide", "negative", "where",
+    # Reductions and statistics
+    "sum", "prod", "mean", "median", "std", "var", "min", "max", "amin", "amax", "argmin", "argmax",
+    "cumsum", "cumprod", "average", "percentile", "quantile", "ptp", "nansum", "nanprod", "nanmean",
+    "nanmedian", "nanstd", "nanvar", "nanmin", "nanmax", "all", "any", "count_nonzero", "diff",
+    "gradient", "trapezoid", "trapz", "interp", "histogram", "bincount", "unique", "sort", "argsort",
+    "searchsorted", "nonzero",
+    # Linear algebra and polynomials
+    "dot", "vdot", "inner", "outer", "matmul", "cross", "tensordot", "kron", "trace", "polyval",
+    "polyfit", "roots", "convolve", "correlate",
+    # Array construction and shape manipulation
+    "array", "asarray", "arange", "linspace", "logspace", "geomspace", "zeros", "ones", "full",
+    "eye", "identity", "zeros_like", "ones_like", "full_like", "diag", "diagonal", "tril", "triu",
+    "meshgrid", "transpose", "reshape", "ravel", "flip", "roll", "concatenate", "stack", "vstack",
+    "hstack", "column_stack", "tile", "repeat",
+)
+
+_NUMPY_LINALG_ALLOWLIST = (
+    "det", "inv", "pinv", "norm", "solve", "lstsq", "eig", "eigh", "eigvals", "eigvalsh", "svd",
+    "qr", "cholesky", "matrix_rank", "matrix_power", "slogdet", "cond",
+)
+
+_NUMPY_NAMESPACE = Allowlisted(np, _NUMPY_ALLOWLIST)
+_NUMPY_NAMESPACE.members["linalg"] = Allowlisted(np.linalg, _NUMPY_LINALG_ALLOWLIST)
+
 ALLOW_FUNCTION = {
-    "math": math,
-    "np": np,
+    "math": Allowlisted(math, _MATH_ALLOWLIST),
+    "np": _NUMPY_NAMESPACE,
     "sin": math.sin,
     "cos": math.cos,
     "tan": math.tan,
@@ -35,9 +194,9 @@ ALLOW_FUNCTION = {
     "asin": math.asin,
     "acos": math.acos,
     "atan": math.atan,
-    "cot": lambda x: 1 / math.tan(x),
-    "csc": lambda x: 1 / math.sin(x),
-    "sec": lambda x: 1 / math.cos(x),
+    "cot": _reciprocal(math.tan),
+    "csc": _reciprocal(math.sin),
+    "sec": _reciprocal(math.cos),
     "ceil": math.ceil,
     "floor": math.floor,
     "round": round,
@@ -69,23 +228,1819 @@ ALLOW_FUNCTION = {
     "argmax": np.argmax,
 }
 
+# Array-aware counterparts of ALLOW_FUNCTION, used when `calculate` is given variable bindings
+VECTOR_FUNCTION = {
+    **ALLOW_FUNCTION,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": _log_with_base(np.log),
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "cot": _reciprocal(np.tan),
+    "csc": _reciprocal(np.sin),
+    "sec": _reciprocal(np.cos),
+    "ceil": np.ceil,
+    "floor": np.floor,
+    "round": np.round,
+    "factorial": special.factorial,
+    "gamma": special.gamma,
+    "erf": special.erf,
+    "erfc": special.erfc,
+    "lgamma": special.gammaln,
+    "degrees": np.degrees,
+    "radians": np.radians,
+    "isfinite": np.isfinite,
+    "isinf": np.isinf,
+    "isnan": np.isnan,
+    "isqrt": _integer_sqrt(np.floor, np.sqrt, np.int64),
+}
 
-@app.tool()
-def calculate(expression: str) -> dict:
+# Per-session workspaces of named calculate results
+WORKSPACE_MAX_BYTES = 64 * 1024 * 1024  # per session
+WORKSPACE_MAX_VARIABLES = 1024  # per session
+WORKSPACE_MAX_SESSIONS = 256
+WORKSPACE_IDLE_TIMEOUT = 3600.0  # seconds
+
+# Grid sweeps are evaluated in chunks of about this many points
+GRID_CHUNK_POINTS = 2 ** 16
+GRID_EXPENSIVE_POINTS = 10 ** 7
+GRID_REJECT_POINTS = 10 ** 9
+# Default and maximum number of points in one page of evaluate_grid's array output
+GRID_PAGE_POINTS = 10 ** 5
+
+# Arbitrary-precision counterparts of ALLOW_FUNCTION, used when `calculate` escalates to mpmath
+MP_FUNCTION = {
+    **ALLOW_FUNCTION,
+    "sin": mpmath.sin,
+    "cos": mpmath.cos,
+    "tan": mpmath.tan,
+    "exp": mpmath.exp,
+    "log": mpmath.log,
+    "log10": mpmath.log10,
+    "sqrt": mpmath.sqrt,
+    "pi": mpmath.pi,
+    "e": mpmath.e,
+    "asin": mpmath.asin,
+    "acos": mpmath.acos,
+    "atan": mpmath.atan,
+    "cot": mpmath.cot,
+    "csc": mpmath.csc,
+    "sec": mpmath.sec,
+    "factorial": mpmath.factorial,
+    "gamma": mpmath.gamma,
+    "erf": mpmath.erf,
+    "erfc": mpmath.erfc,
+    "lgamma": mpmath.loggamma,
+    "degrees": mpmath.degrees,
+    "radians": mpmath.radians,
+    "isfinite": mpmath.isfinite,
+    "isinf": mpmath.isinf,
+    "isnan": mpmath.isnan,
+}
+
+# Significant digits used when `calculate` escalates to mpmath without an explicit digit count
+ESCALATION_DIGITS = 30
+# Largest digit count `calculate` accepts; evaluation holds the global mpmath lock throughout
+ESCALATION_MAX_DIGITS = 5000
+
+# A float sum or difference smaller than this fraction of its largest operand has lost
+# at least half of its significant bits (catastrophic cancellation)
+CANCELLATION_TOLERANCE = math.sqrt(sys.float_info.epsilon)
+
+# Default per-call limits for the isolated `calculate` worker pool
+CALCULATE_TIMEOUT = 5.0  # seconds
+CALCULATE_MEMORY_LIMIT = 512 * 1024 * 1024  # bytes
+
+# Default per-task limits for the SymPy worker pool of the symbolic tools
+SYMBOLIC_TIMEOUT = 30.0  # seconds
+SYMBOLIC_MEMORY_LIMIT = 1024 * 1024 * 1024  # bytes
+
+# Admission control thresholds. Requests classified as expensive run in the worker
+# pool when one is configured; rejected requests are refused before any evaluation.
+COST_EXPENSIVE_BITS = 2 ** 22  # largest integer (or array) an expression may build inline
+COST_REJECT_BITS = 2 ** 30
+SUMMATION_EXPENSIVE_TERMS = 10 ** 5  # terms of a summation without a polynomial summand
+SUMMATION_NUMERIC_EXPENSIVE_TERMS = 10 ** 7  # terms of one that NumPy can sum instead
+SUMMATION_REJECT_TERMS = 10 ** 9
+FACTORIZE_EXPENSIVE_DEGREE = 64  # total degree of a polynomial to factorize
+FACTORIZE_REJECT_DEGREE = 1000
+COST_EXPENSIVE_DIGITS = 250  # requested significant digits of an mpmath evaluation
+
+# Results larger than these limits are summarized unless the full result is requested
+RESULT_MAX_DIGITS = 1000
+RESULT_MAX_ELEMENTS = 10000
+RESULT_EDGE_DIGITS = 20  # leading/trailing digits included in an integer summary
+
+# Maximum number of compiled expressions kept by `calculate`
+EXPRESSION_CACHE_SIZE = 1024
+
+# Maximum number of admission cost estimates kept by `calculate`
+COST_CACHE_SIZE = 1024
+
+# Maximum number of parsed SymPy expressions shared by the symbolic tools
+SYMPY_CACHE_SIZE = 1024
+
+# Without the SymPy worker pool, a budgeted computation that overruns keeps running in an
+# abandoned thread; once this many are still running, new budgeted work is refused
+BUDGET_MAX_ABANDONED_THREADS = 8
+
+# Time budget of one `integrate` request, shared by its integration methods
+INTEGRATE_TIME_BUDGET = 10.0  # seconds
+
+# Time budget of the symbolic solver in `solve_equation`, after which it falls back to root bracketing
+SOLVE_TIME_BUDGET = 5.0  # seconds
+
+# Time budget of one `simplify` request, shared by its rewrites
+SIMPLIFY_TIME_BUDGET = 5.0  # seconds
+
+# Equivalence checking: default number of random sample points, their limit, and the time
+# budget of the symbolic proof attempted when the numeric comparison is inconclusive
+EQUIVALENCE_POINTS = 64
+EQUIVALENCE_MAX_POINTS = 100000
+EQUIVALENCE_VERIFY_POINTS = 8
+EQUIVALENCE_TIME_BUDGET = 5.0  # seconds
+
+# Numeric root finding: default search interval and the number of points scanned for sign changes
+SOLVE_INTERVAL = (-10.0, 10.0)
+ROOT_SCAN_POINTS = 10001
+
+# Systems of equations: size limit, the largest numeric linear system still solved exactly by default,
+# and the size and density below which coefficient matrices are solved as sparse matrices
+SYSTEM_MAX_UNKNOWNS = 5000
+SYSTEM_EXACT_MAX_UNKNOWNS = 32
+SPARSE_MIN_UNKNOWNS = 100
+SPARSE_MAX_DENSITY = 0.1
+
+# Highest order of a `series` expansion
+SERIES_MAX_ORDER = 200
+
+# Compiled function registry: number of compiled expressions kept, their total size,
+# and the number of points one `evaluate_compiled` call may evaluate
+COMPILED_MAX_FUNCTIONS = 1024
+COMPILED_MAX_BYTES = 64 * 1024 * 1024
+COMPILED_MAX_POINTS = 10 ** 7
+
+# Maximum number of entries of a Jacobian or Hessian computed by `derivatives`
+DERIVATIVE_MAX_ENTRIES = 10000
+
+# Time budget of the closed form of a `summation`, and the block size of its numeric fallback
+SUMMATION_TIME_BUDGET = 2.0  # seconds
+SUMMATION_CHUNK_TERMS = 2 ** 16
+# An accelerated infinite sum must agree to this relative tolerance with the same sum
+# accelerated only after its first SUMMATION_CHECK_TERMS terms
+SUMMATION_CHECK_TERMS = 64
+SUMMATION_AGREEMENT_TOLERANCE = 1e-8
+
+# Numeric integration: default relative tolerance and the sample budget of quasi-Monte Carlo
+INTEGRAL_TOLERANCE = 1e-10
+QMC_SAMPLES = 2 ** 16
+QMC_MAX_SAMPLES = 2 ** 24
+QMC_REPLICATES = 8  # independently scrambled sequences, used for the error estimate
+CUBATURE_MAX_SUBDIVISIONS = 256
+
+# Size limit of the persistent symbolic result cache (enabled with --result-cache)
+RESULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit, miss and eviction counters.
+
+    Args:
+        maxsize: Maximum number of entries kept before the least recently
+                 used entry is evicted. A size of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+EXPRESSION_CACHE = LRUCache(EXPRESSION_CACHE_SIZE)
+COST_CACHE = LRUCache(COST_CACHE_SIZE)
+SYMPY_CACHE = LRUCache(SYMPY_CACHE_SIZE)
+
+
+def _normalize_source(text: str) -> str:
+    """
+    Rewrites an expression string with canonical spacing.
+
+    Tokens are joined without whitespace, except where two names or numbers
+    would otherwise merge, so "x**2+1" and " x ** 2 + 1 " normalize alike.
+    """
+    try:
+        parts = []
+        previous = None
+        for token in tokenize.generate_tokens(io.StringIO(text.strip()).readline):
+            if token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER, tokenize.INDENT, tokenize.DEDENT):
+                continue
+            if previous in (tokenize.NAME, tokenize.NUMBER) and token.type in (tokenize.NAME, tokenize.NUMBER):
+                parts.append(" ")
+            parts.append(token.string)
+            previous = token.type
+        return "".join(parts)
+    except (tokenize.TokenError, SyntaxError):
+        return " ".join(text.split())
+
+
+def parse_expression(text: str) -> sp.Expr:
+    """
+    Parses an expression string with sympify through the shared SYMPY_CACHE.
+
+    Lookups first use the whitespace-normalized string. On a miss the string is
+    parsed and the result is interned by its canonical SymPy form, so equivalent
+    spellings such as "x**2+1" and "1 + x**2" return the same expression object
+    and later (expression-keyed) caches see a single entry. Parse errors are not
+    cached.
+    """
+    if not isinstance(text, str):
+        return sympify(text)
+    key = ("text", _normalize_source(text))
+    expr = SYMPY_CACHE.get(key)
+    if expr is None:
+        return _intern_expression(key, sympify(text))
+    return expr
+
+
+def _intern_expression(key: tuple, parsed):
+    """Caches a freshly parsed expression under its text key, interned by its canonical form."""
+    if not isinstance(parsed, sp.Basic):
+        # Containers such as lists are mutable and unhashable
+        return parsed
+    expr = SYMPY_CACHE.get(("expr", parsed))
+    if expr is None:
+        expr = parsed
+        SYMPY_CACHE.put(("expr", expr), expr)
+    SYMPY_CACHE.put(key, expr)
+    return expr
+
+
+def _is_self_contained(text: str) -> bool:
+    """Whether every bracket in text is closed within it, so it can be parenthesized inside a list."""
+    depth = 0
+    for c in text:
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0 and text.strip() != "" and not any(c in text for c in "#'\"")
+
+
+def parse_expressions(texts: List[str]) -> None:
+    """
+    Parses many expression strings into SYMPY_CACHE with a single sympify call.
+
+    The strings missing from the cache are parsed together as one list literal, which
+    halves the per-string overhead of SymPy's parser, and interned exactly as
+    parse_expression would; later parse_expression calls on them are cache hits. Strings
+    that could change meaning inside a list (unbalanced brackets, comments, quotes or
+    empty strings) are left to
+    parse_expression, and so is the whole batch if the combined parse fails.
+    """
+    pending = {}
+    for text in texts:
+        key = ("text", _normalize_source(text))
+        if key not in pending and _is_self_contained(text) and SYMPY_CACHE.get(key) is None:
+            pending[key] = text
+    if len(pending) < 2:
+        return
+    try:
+        parsed = sympify("[" + ", ".join(f"({text})" for text in pending.values()) + "]")
+    except Exception:
+        return
+    if not isinstance(parsed, list) or len(parsed) != len(pending):
+        return
+    for key, expr in zip(pending, parsed):
+        _intern_expression(key, expr)
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.MatMult: operator.matmul,
+    ast.LShift: operator.lshift,
+    ast.RShift: operator.rshift,
+    ast.BitAnd: operator.and_,
+    ast.BitOr: operator.or_,
+    ast.BitXor: operator.xor,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_,
+    ast.Invert: operator.invert,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+# Attributes of values (arrays, NumPy scalars) that write files, pickle or expose raw memory,
+# and string formatting, whose field names ("{0.__globals__}") bypass the private-name check
+_BLOCKED_ATTRIBUTES = {"dump", "dumps", "tofile", "ctypes", "format", "format_map"}
+
+# Constant folding is skipped when it would build a result larger than this many bits
+_FOLD_MAX_BITS = 4096
+
+# Marks a lowered node whose value is not known at compile time
+_NOT_CONSTANT = object()
+
+# mpmath's working precision is global state
+_MPMATH_LOCK = threading.Lock()
+
+# Number of overrunning _run_with_budget threads still running in the background
+_abandoned_budget_threads = 0
+_BUDGET_LOCK = threading.Lock()
+
+
+class PrecisionLoss(ArithmeticError):
+    """Raised by the float evaluator when an addition or subtraction cancels catastrophically."""
+
+
+def _checked(func, literal_operands: bool = False):
+    """
+    Wraps float addition/subtraction so that catastrophic cancellation raises PrecisionLoss.
+
+    A zero result is suspect as well: in "1 - cos(1e-10)" the rounded cosine is exactly
+    1.0. Only with literal_operands (both operands written as literals, which are exact
+    as given, e.g. "2.5 - 2.5") is an exact zero accepted.
+    """
+    def checked(a, b):
+        result = func(a, b)
+        if (type(result) is float and a and b and (result or not literal_operands)
+                and abs(result) <= CANCELLATION_TOLERANCE * max(abs(a), abs(b))):
+            raise PrecisionLoss("catastrophic cancellation")
+        return result
+    return checked
+
+
+def _to_mp(value):
+    """Converts an exact Fraction to an mpf at the current working precision."""
+    if isinstance(value, Fraction):
+        return mpmath.mpf(value.numerator) / value.denominator
+    return value
+
+
+def _exact(value) -> bool:
+    return isinstance(value, (int, Fraction))
+
+
+def _mp_operator(func):
+    """
+    Wraps an operator for the mpmath evaluator.
+
+    Integers and decimal literals are kept as exact Fractions for as long as the
+    arithmetic allows, so e.g. "0.1 + 0.2 - 0.3" is exactly 0; anything else is
+    carried out with mpmath numbers.
+    """
+    def apply(a, b):
+        if _exact(a) and _exact(b):
+            if func is operator.truediv:
+                return Fraction(a) / b
+            if func is operator.pow:
+                if isinstance(b, int) or b.denominator == 1:
+                    return Fraction(a) ** int(b)
+            else:
+                return func(a, b)
+        return func(_to_mp(a), _to_mp(b))
+    return apply
+
+
+# Float operators applied to two literal operands
+_LITERAL_OPERATORS = {ast.Add: _checked(operator.add, True), ast.Sub: _checked(operator.sub, True)}
+
+_MODE_OPERATORS = {
+    "float": {ast.Add: _checked(operator.add), ast.Sub: _checked(operator.sub)},
+    "vector": {},
+    "mp": {op: _mp_operator(func) for op, func in _BINARY_OPERATORS.items()},
+}
+
+
+def _is_literal(node) -> bool:
+    """Whether an AST node is a number written as a literal (possibly negated)."""
+    if isinstance(node, ast.UnaryOp):
+        node = node.operand
+    return isinstance(node, ast.Constant)
+
+
+def _constant(value):
+    return (lambda ns: value), value
+
+
+def _fold(func, *values):
+    """Evaluates an operator on constants at compile time, or returns _NOT_CONSTANT if that is unsafe."""
+    if not all(isinstance(v, (int, float, complex)) for v in values):
+        return _NOT_CONSTANT
+    if func in (operator.pow, operator.lshift) and all(isinstance(v, int) for v in values):
+        base, exponent = values
+        bits = abs(base).bit_length() if func is operator.pow else 1
+        if exponent * bits > _FOLD_MAX_BITS:
+            return _NOT_CONSTANT
+    try:
+        return func(*values)
+    except Exception:
+        # Leave the error to be raised (with its usual message) at evaluation time
+        return _NOT_CONSTANT
+
+
+class ExpressionCompiler:
+    """
+    Lowers a whitelisted expression AST to a tree of closures.
+
+    Every supported node becomes a function taking the evaluation namespace,
+    so evaluation never goes through `eval`. Operations on literal constants
+    are folded at compile time. Unsupported syntax and private or I/O attribute
+    access are rejected with a ValueError before anything is evaluated; modules
+    are only reachable through their Allowlisted members.
+
+    Args:
+        mode: "float" (scalar fast path with cancellation checks), "vector" (plain
+              operators for NumPy arrays) or "mp" (exact Fraction arithmetic on
+              literals, mpmath numbers everywhere else).
+    """
+
+    def __init__(self, mode: str = "float"):
+        self.mode = mode
+        self._operators = {**_BINARY_OPERATORS, **_MODE_OPERATORS[mode]}
+        self._compare_operators = _COMPARE_OPERATORS
+        if mode == "mp":
+            self._compare_operators = {op: _mp_operator(func) for op, func in _COMPARE_OPERATORS.items()}
+
+    def compile(self, expression: str):
+        if not isinstance(expression, str):
+            raise TypeError("Expression must be a string")
+        # Like eval(), ignore leading spaces and tabs
+        tree = ast.parse(expression.lstrip(" \t"), "<expression>", "eval")
+        self.names = set()
+        program = self.lower(tree.body)[0]
+        # The names the expression loads, so callers can pass only the bindings it uses
+        program.names = frozenset(self.names)
+        return program
+
+    def lower(self, node):
+        """Returns (closure, constant value or _NOT_CONSTANT) for an AST node."""
+        method = getattr(self, "_lower_" + type(node).__name__, None)
+        if method is None:
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+        return method(node)
+
+    def _lower_Constant(self, node):
+        value = node.value
+        if isinstance(value, (str, bytes)):
+            # Raised on evaluation, so that an unknown function called with a string
+            # (e.g. open('/etc/passwd')) still reports the unknown name first
+            def reject(ns):
+                raise ValueError("String literals are not allowed in expressions")
+            return reject, _NOT_CONSTANT
+        if self.mode == "mp" and isinstance(value, float) and math.isfinite(value):
+            # Decimal literals are exact in the mpmath evaluator
+            return _constant(Fraction(repr(value)))
+        if self.mode == "mp" and isinstance(value, complex):
+            real, imag = repr(value.real), repr(value.imag)
+            return (lambda ns: mpmath.mpc(real, imag)), _NOT_CONSTANT
+        return _constant(value)
+
+    def _lower_Name(self, node):
+        name = node.id
+        self.names.add(name)
+
+        def load(ns):
+            try:
+                return ns[name]
+            except KeyError:
+                raise NameError(f"name '{name}' is not defined") from None
+
+        return load, _NOT_CONSTANT
+
+    def _lower_BinOp(self, node):
+        # Flatten left-associative chains such as "2 + 2 + ... + 2" to avoid deep recursion
+        chain = []
+        while isinstance(node, ast.BinOp) and type(node.op) in self._operators:
+            chain.append((type(node.op), node.right))
+            node = node.left
+        if isinstance(node, ast.BinOp):
+            raise ValueError(f"Unsupported operator in expression: {type(node.op).__name__}")
+        first, value = self.lower(node)
+        steps = []
+        literal = self.mode == "float" and _is_literal(node)
+        for op, right in reversed(chain):
+            func = self._operators[op]
+            if literal and _is_literal(right):
+                func = _LITERAL_OPERATORS.get(op, func)
+            literal = False
+            operand, right_value = self.lower(right)
+            folded = _NOT_CONSTANT
+            if not steps and value is not _NOT_CONSTANT and right_value is not _NOT_CONSTANT:
+                folded = _fold(func, value, right_value)
+            if folded is not _NOT_CONSTANT:
+                first, value = _constant(folded)
+            else:
+                steps.append((func, operand))
+                value = _NOT_CONSTANT
+        if not steps:
+            return first, value
+        if len(steps) == 1:
+            (func, operand), = steps
+            return (lambda ns: func(first(ns), operand(ns))), _NOT_CONSTANT
+
+        def evaluate_chain(ns):
+            result = first(ns)
+            for func, operand in steps:
+                result = func(result, operand(ns))
+            return result
+
+        return evaluate_chain, _NOT_CONSTANT
+
+    def _lower_UnaryOp(self, node):
+        func = _UNARY_OPERATORS[type(node.op)]
+        operand, value = self.lower(node.operand)
+        if value is not _NOT_CONSTANT:
+            folded = _fold(func, value)
+            if folded is not _NOT_CONSTANT:
+                return _constant(folded)
+        return (lambda ns: func(operand(ns))), _NOT_CONSTANT
+
+    def _lower_BoolOp(self, node):
+        operands = [self.lower(value)[0] for value in node.values]
+        if isinstance(node.op, ast.And):
+            def evaluate_and(ns):
+                for operand in operands:
+                    result = operand(ns)
+                    if not result:
+                        return result
+                return result
+            return evaluate_and, _NOT_CONSTANT
+
+        def evaluate_or(ns):
+            for operand in operands:
+                result = operand(ns)
+                if result:
+                    return result
+            return result
+        return evaluate_or, _NOT_CONSTANT
+
+    def _lower_Compare(self, node):
+        left = self.lower(node.left)[0]
+        comparisons = []
+        for op, comparator in zip(node.ops, node.comparators):
+            if type(op) not in self._compare_operators:
+                raise ValueError(f"Unsupported operator in expression: {type(op).__name__}")
+            comparisons.append((self._compare_operators[type(op)], self.lower(comparator)[0]))
+
+        def compare(ns):
+            a = left(ns)
+            for func, comparator in comparisons:
+                b = comparator(ns)
+                result = func(a, b)
+                if not result:
+                    return result
+                a = b
+            return result
+
+        return compare, _NOT_CONSTANT
+
+    def _lower_IfExp(self, node):
+        test = self.lower(node.test)[0]
+        body = self.lower(node.body)[0]
+        orelse = self.lower(node.orelse)[0]
+        return (lambda ns: body(ns) if test(ns) else orelse(ns)), _NOT_CONSTANT
+
+    def _lower_Call(self, node):
+        func = self.lower(node.func)[0]
+        if any(isinstance(arg, ast.Starred) for arg in node.args) or any(kw.arg is None for kw in node.keywords):
+            raise ValueError("Argument unpacking is not allowed in expressions")
+        args = [self.lower(arg)[0] for arg in node.args]
+        kwargs = [(kw.arg, self.lower(kw.value)[0]) for kw in node.keywords]
+        if self.mode == "mp":
+            # Functions only understand mpmath numbers, not exact Fractions
+            args = [lambda ns, arg=arg: _to_mp(arg(ns)) for arg in args]
+            kwargs = [(name, lambda ns, value=value: _to_mp(value(ns))) for name, value in kwargs]
+        if not kwargs and len(args) == 1:
+            arg, = args
+            return (lambda ns: func(ns)(arg(ns))), _NOT_CONSTANT
+
+        def call(ns):
+            return func(ns)(*[arg(ns) for arg in args], **{name: value(ns) for name, value in kwargs})
+
+        return call, _NOT_CONSTANT
+
+    def _lower_Attribute(self, node):
+        attr = node.attr
+        if attr.startswith("_") or attr in _BLOCKED_ATTRIBUTES:
+            raise ValueError(f"Access to attribute '{attr}' is not allowed")
+        value = self.lower(node.value)[0]
+        return (lambda ns: _get_attribute(value(ns), attr)), _NOT_CONSTANT
+
+    def _lower_Subscript(self, node):
+        value = self.lower(node.value)[0]
+        index = self.lower(node.slice)[0]
+        return (lambda ns: value(ns)[index(ns)]), _NOT_CONSTANT
+
+    def _lower_Slice(self, node):
+        parts = [self.lower(part)[0] if part is not None else (lambda ns: None)
+                 for part in (node.lower, node.upper, node.step)]
+        lower, upper, step = parts
+        return (lambda ns: slice(lower(ns), upper(ns), step(ns))), _NOT_CONSTANT
+
+    def _lower_Tuple(self, node):
+        items = [self.lower(item)[0] for item in node.elts]
+        return (lambda ns: tuple(item(ns) for item in items)), _NOT_CONSTANT
+
+    def _lower_List(self, node):
+        items = [self.lower(item)[0] for item in node.elts]
+        return (lambda ns: [item(ns) for item in items]), _NOT_CONSTANT
+
+
+def _get_attribute(value, attr: str):
+    """Attribute access in expressions: allowlisted members of modules, and no module-valued attributes."""
+    if isinstance(value, Allowlisted):
+        try:
+            return value.members[attr]
+        except KeyError:
+            raise ValueError(f"Access to attribute '{attr}' of {value.name} is not allowed") from None
+    result = getattr(value, attr)
+    if isinstance(result, types.ModuleType):
+        raise ValueError(f"Access to attribute '{attr}' is not allowed")
+    return result
+
+
+def _compile_expression(expression: str, mode: str = "float"):
+    """Returns the compiled evaluator for an expression, compiling it only on a cache miss."""
+    key = expression if mode == "float" else (mode, expression)
+    program = EXPRESSION_CACHE.get(key)
+    if program is None:
+        program = ExpressionCompiler(mode).compile(expression)
+        EXPRESSION_CACHE.put(key, program)
+    return program
+
+
+def _evaluate(
+    expression: str,
+    variables: Optional[Dict[str, List[float]]] = None,
+    bindings: Optional[dict] = None,
+):
+    """
+    Evaluates an expression in the restricted namespace.
+
+    Without variables the scalar ALLOW_FUNCTION table is used. With variables,
+    each name is bound to a NumPy array and the expression is evaluated once
+    over all of them using the VECTOR_FUNCTION ufuncs. Bindings (named workspace
+    results) are added to either namespace.
+    """
+    if not variables:
+        return _compile_expression(expression)({**ALLOW_FUNCTION, **bindings} if bindings else ALLOW_FUNCTION)
+
+    program = _compile_expression(expression, "vector")
+    namespace = dict(VECTOR_FUNCTION)
+    namespace.update(bindings or {})
+    for name, values in variables.items():
+        if not name.isidentifier() or name.startswith("_"):
+            raise ValueError(f"Invalid variable name: {name!r}")
+        namespace[name] = np.asarray(values, dtype=float)
+    return program(namespace)
+
+
+def _summarize_integer(value: int) -> dict:
+    """Describes a huge integer by its digit count, leading/trailing digits and scientific form."""
+    magnitude = abs(value)
+    sign = "-" if value < 0 else ""
+    edge = RESULT_EDGE_DIGITS
+    # The top bits are enough for the leading digits, avoiding a full decimal conversion
+    shift = max(magnitude.bit_length() - 128, 0)
+    with _MPMATH_LOCK, mpmath.workdps(edge + 20):
+        approximation = mpmath.ldexp(mpmath.mpf(magnitude >> shift), shift)
+        log10 = mpmath.log10(approximation)
+        nearest = int(mpmath.nint(log10))
+        if abs(log10 - nearest) < mpmath.mpf(10) ** -edge:
+            # Too close to a power of ten to trust the approximation: compare exactly
+            exponent = nearest if magnitude >= 10 ** nearest else nearest - 1
+        else:
+            exponent = int(mpmath.floor(log10))
+        leading = int(mpmath.floor(approximation / mpmath.mpf(10) ** (exponent - edge + 1)))
+    leading = str(min(max(leading, 10 ** (edge - 1)), 10 ** edge - 1))
+    return {
+        "digits": exponent + 1,
+        "leading": sign + leading,
+        "trailing": str(magnitude % 10 ** edge).zfill(edge),
+        "scientific": f"{sign}{leading[0]}.{leading[1:]}e+{exponent}",
+    }
+
+
+def encode_result(value, full: bool = False):
+    """
+    Converts an evaluation result into a JSON-friendly value.
+
+    Integers with more than RESULT_MAX_DIGITS digits and arrays with more than
+    RESULT_MAX_ELEMENTS elements are summarized (digit summary, or shape, dtype
+    and a base64 payload of the raw little-endian data) unless full is True, in
+    which case huge integers are returned as decimal strings.
+
+    Returns (encoded value, truncated flag).
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (mpmath.mpf, mpmath.mpc)):
+        # Arbitrary-precision workspace values reaching the float evaluator
+        try:
+            return complex(value) if isinstance(value, mpmath.mpc) else float(value), False
+        except OverflowError:
+            return mpmath.nstr(value, ESCALATION_DIGITS), False
+    if isinstance(value, int) and not isinstance(value, bool):
+        # 10**n < 2**(4n), so the exact comparison only runs for integers near the limit
+        if value.bit_length() <= 4 * RESULT_MAX_DIGITS and abs(value) < 10 ** RESULT_MAX_DIGITS:
+            return value, False
+        if full:
+            # Decimal avoids the interpreter's int-to-str digit limit
+            return str(decimal.Decimal(value)), False
+        return _summarize_integer(value), True
+    if isinstance(value, np.ndarray):
+        if full or value.size <= RESULT_MAX_ELEMENTS or value.dtype == object:
+            return value.tolist(), False
+        data = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder("<"))
+        return {
+            "shape": list(value.shape),
+            "dtype": value.dtype.str.lstrip("<>|="),
+            "encoding": "base64",
+            "byteorder": "little",
+            "data": base64.b64encode(data.tobytes()).decode("ascii"),
+        }, True
+    return value, False
+
+
+def _evaluate_precise(expression: str, digits: int, reason: str, bindings: Optional[dict] = None):
+    """
+    Evaluates an expression with mpmath at the given number of significant digits.
+
+    Exact integer results are returned as ints, results of a cancellation as the
+    correctly rounded float and everything else as a decimal string.
+    """
+    program = _compile_expression(expression, "mp")
+    with _MPMATH_LOCK, mpmath.workdps(digits):
+        value = program({**MP_FUNCTION, **bindings} if bindings else MP_FUNCTION)
+        if isinstance(value, (float, Fraction, mpmath.mpf, mpmath.mpc)):
+            if reason == "overflow" and not mpmath.isfinite(_to_mp(value)):
+                raise OverflowError("result is not finite")
+            if reason == "cancellation" and not isinstance(value, mpmath.mpc):
+                return float(value)
+            return mpmath.nstr(_to_mp(value), digits)
+        return value
+
+
+def _evaluate_adaptive(expression: str, digits: Optional[int] = None, bindings: Optional[dict] = None):
+    """
+    Evaluates a scalar expression on the float fast path, escalating to mpmath when needed.
+
+    Escalation happens when a digit count is requested, when the float evaluation
+    overflows (OverflowError or an infinite result) or when it detects catastrophic
+    cancellation. Returns (result, precision) where precision is None on the fast path
+    and otherwise describes the escalation.
+    """
+    if digits is not None:
+        if not 1 <= digits <= ESCALATION_MAX_DIGITS:
+            raise ValueError(f"Digits must be between 1 and {ESCALATION_MAX_DIGITS}")
+        reason = "requested"
+    else:
+        try:
+            result = _evaluate(expression, None, bindings)
+            if type(result) is not float or not math.isinf(result):
+                return result, None
+            reason = "overflow"
+        except OverflowError:
+            reason = "overflow"
+        except PrecisionLoss:
+            reason = "cancellation"
+        digits = ESCALATION_DIGITS
+
+    try:
+        value = _evaluate_precise(expression, digits, reason, bindings)
+    except Exception:
+        if reason == "requested":
+            raise
+        # Escalation is best effort: fall back to the plain float outcome
+        return _compile_expression(expression, "vector")({**ALLOW_FUNCTION, **(bindings or {})}), None
+    return value, {"mode": "mpmath", "digits": digits, "reason": reason}
+
+
+def _calculate_one(
+    expression: str,
+    variables: Optional[Dict[str, List[float]]] = None,
+    digits: Optional[int] = None,
+    full_result: bool = False,
+    bindings: Optional[dict] = None,
+    keep_value: bool = False,
+) -> dict:
+    """
+    Evaluates a single expression and wraps the outcome in a result or error dict.
+
+    With keep_value, the raw (unencoded) result is included under "_value" so that
+    it can be stored in a workspace; escalated results are kept as mpmath numbers.
+    """
+    try:
+        precision = None
+        if variables:
+            if digits is not None:
+                return {"error": "Digits cannot be combined with variables"}
+            value = _evaluate(expression, variables, bindings)
+        else:
+            value, precision = _evaluate_adaptive(expression, digits, bindings)
+        if callable(value) or isinstance(value, Allowlisted):
+            return {"error": "Expression evaluates to a function or module, not a value"}
+        result, truncated = encode_result(value, full_result)
+        response = {"result": result}
+        if keep_value:
+            if precision is not None and isinstance(value, str):
+                with _MPMATH_LOCK, mpmath.workdps(precision["digits"]):
+                    value = mpmath.mpmathify(value)
+            response["_value"] = value
+        if truncated:
+            response["truncated"] = True
+        if precision is not None:
+            response["precision"] = precision
+        return response
+    except MemoryError:
+        return {"error": "Calculation exceeded the memory limit", "error_type": "memory"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+class WorkerTimeout(Exception):
+    """Raised when a pooled task exceeds its time budget."""
+
+
+class WorkerCrashed(Exception):
+    """Raised when a pool worker process dies while running a task."""
+
+
+class BudgetExhausted(WorkerTimeout):
+    """Raised when budgeted work is refused because too many overrunning computations are still running."""
+
+
+def _address_space_size() -> int:
+    """Returns the current virtual memory size of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _worker_main(conn, memory_limit: Optional[int]):
+    """Main loop of a pool worker: receive (function, args, timeout), send back the outcome."""
+    global CALCULATE_POOL, SYMBOLIC_POOL
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Tasks run inline here, whatever pools the code importing this module configures
+    CALCULATE_POOL = SYMBOLIC_POOL = None
+    if resource is not None and memory_limit:
+        # The limit applies on top of what the interpreter already maps
+        limit = _address_space_size() + memory_limit
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    while True:
+        try:
+            func, args, timeout = conn.recv()
+        except (EOFError, OSError):
+            break
+        if resource is not None and timeout:
+            # Backstop for the parent's wall-clock timeout: SIGXCPU terminates a runaway worker
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            cpu_limit = int(usage.ru_utime + usage.ru_stime + timeout) + 2
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, resource.RLIM_INFINITY))
+        try:
+            outcome = ("ok", func(*args))
+        except MemoryError:
+            outcome = ("error", MemoryError("Task exceeded the memory limit"))
+        except Exception as e:
+            outcome = ("error", e)
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send(("error", RuntimeError(str(e))))
+
+
+def _worker_context():
+    """
+    Returns the multiprocessing context workers are started with.
+
+    Workers are never forked from the server: it runs tool calls, the event loop
+    and worker restarts on several threads, and a lock another thread holds at fork
+    time stays locked forever in the child. A fork server is a clean single-threaded
+    process that imports this module once, so its forks still start quickly; spawn
+    is the fallback where fork servers are not available.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+class WorkerPool:
+    """
+    Pool of pre-started worker processes with per-call time and memory limits.
+
+    Each call is shipped to an idle worker. A worker that exceeds its time
+    budget is killed and replaced, so a pathological task cannot stall the
+    server process or other callers.
+
+    Args:
+        size: Number of worker processes.
+        timeout: Default wall-clock budget per call in seconds.
+        memory_limit: Additional address space in bytes each worker may allocate (None for no limit).
+        warmup: (function, *args) run once in every worker at start-up (default: a trivial calculation).
+    """
+
+    def __init__(self, size: int, timeout: float, memory_limit: Optional[int] = None, warmup: Optional[tuple] = None):
+        if timeout <= 0:
+            raise ValueError("Worker timeout must be positive")
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self._warmup = warmup if warmup is not None else (_calculate_one, "0")
+        self._context = _worker_context()
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Warm every worker up so the first real call does not pay the start-up cost
+        with concurrent.futures.ThreadPoolExecutor(max_workers=size) as executor:
+            for worker in executor.map(lambda _: self._start(), range(size)):
+                self._idle.put(worker)
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.memory_limit), daemon=True
+        )
+        process.start()
+        child_conn.close()
+        worker = (process, parent_conn)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _start(self):
+        """Spawns a worker and runs the warm-up task in it before it takes any calls."""
+        worker = self._spawn()
+        func, *args = self._warmup
+        try:
+            status, payload = self._call(worker, func, tuple(args), self.timeout)
+        except (WorkerTimeout, WorkerCrashed) as e:
+            logging.warning("Worker warm-up failed, starting a cold worker instead: %s", e)
+            self._kill(worker)
+            return self._spawn()
+        if status == "error":
+            logging.warning("Worker warm-up raised: %r", payload)
+        return worker
+
+    def _call(self, worker, func, args: tuple, timeout: float):
+        """Sends one task to a worker the caller holds exclusively; returns (status, payload)."""
+        process, conn = worker
+        try:
+            conn.send((func, args, timeout))
+            if not conn.poll(timeout):
+                raise WorkerTimeout(f"Calculation exceeded the {timeout:g}s time limit")
+            return conn.recv()
+        except (EOFError, OSError):
+            raise WorkerCrashed("Calculation worker terminated unexpectedly") from None
+
+    def _kill(self, worker):
+        process, conn = worker
+        with self._lock:
+            self._workers.discard(worker)
+        process.kill()
+        process.join()
+        conn.close()
+
+    def _replace(self, worker):
+        """Kills a worker and warms up its replacement in the background."""
+        self._kill(worker)
+
+        def restart():
+            replacement = self._start()
+            with self._lock:
+                closed = self._closed
+            if closed:
+                self._kill(replacement)
+            else:
+                self._idle.put(replacement)
+
+        threading.Thread(target=restart, name="worker-restart", daemon=True).start()
+
+    def run(self, func, *args, timeout: Optional[float] = None):
+        """
+        Runs func(*args) in a worker process and returns its result.
+
+        Raises WorkerTimeout if the call exceeds its budget, WorkerCrashed if the
+        worker dies, and re-raises any exception raised by func itself. A killed
+        worker is replaced by a warmed-up one, which takes calls once it is ready.
+        An explicit timeout is a wall-clock budget that includes waiting for an idle
+        worker; the default per-call limit only starts once a worker runs the call.
+        """
+        if timeout is None:
+            timeout = self.timeout
+            worker = self._idle.get()
+        else:
+            deadline = time.monotonic() + timeout
+            try:
+                worker = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                worker = None
+            remaining = deadline - time.monotonic()
+            if worker is None or remaining <= 0:
+                if worker is not None:
+                    self._idle.put(worker)
+                raise WorkerTimeout(f"No worker became available within the {timeout:g}s time limit")
+            timeout = remaining
+        try:
+            status, payload = self._call(worker, func, args, timeout)
+        except (WorkerTimeout, WorkerCrashed):
+            self._replace(worker)
+            raise
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+        if status == "error":
+            raise payload
+        return payload
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, set()
+        for process, conn in workers:
+            process.kill()
+            process.join()
+            conn.close()
+
+
+# Pool used to isolate `calculate`; None runs calculations inline in the server process
+CALCULATE_POOL: Optional[WorkerPool] = None
+
+
+def configure_calculate_pool(
+    workers: int,
+    timeout: float = CALCULATE_TIMEOUT,
+    memory_limit: Optional[int] = CALCULATE_MEMORY_LIMIT,
+):
+    """Starts (or with workers=0, stops) the isolated worker pool used by `calculate`."""
+    global CALCULATE_POOL
+    if workers > 0 and timeout <= 0:
+        raise ValueError("Worker timeout must be positive")
+    if CALCULATE_POOL is not None:
+        CALCULATE_POOL.shutdown()
+        CALCULATE_POOL = None
+    if workers > 0:
+        CALCULATE_POOL = WorkerPool(workers, timeout, memory_limit)
+        logging.info("Started calculate worker pool with %d workers", workers)
+
+
+def _warm_symbolic():
+    """Runs each symbolic engine once so that SymPy's lazy imports and caches are loaded in a worker."""
+    x = sp.Symbol("x")
+    expr = parse_expression("x**2 - 3*x + 2")
+    sp.factor(expr)
+    sp.expand((x + 1) ** 3)
+    solve(sp.exp(x) - 2 * x ** 2, x)
+    sympy_integrate(x * sp.exp(x) * sp.sin(x), x)
+    sp.Sum(1 / x ** 2, (x, 1, sp.oo)).doit()
+    sp.series(sp.exp(x), x, 0, 4)
+    sp.lambdify(x, expr, modules=["numpy", "scipy"])
+
+
+# Pool of warmed-up worker processes for the symbolic tools; None runs them in the server process
+SYMBOLIC_POOL: Optional[WorkerPool] = None
+
+
+def configure_symbolic_pool(
+    workers: int,
+    timeout: float = SYMBOLIC_TIMEOUT,
+    memory_limit: Optional[int] = SYMBOLIC_MEMORY_LIMIT,
+):
+    """Starts (or with workers=0, stops) the SymPy worker pool used by the symbolic tools."""
+    global SYMBOLIC_POOL
+    if workers > 0 and timeout <= 0:
+        raise ValueError("Worker timeout must be positive")
+    if SYMBOLIC_POOL is not None:
+        SYMBOLIC_POOL.shutdown()
+        SYMBOLIC_POOL = None
+    if workers > 0:
+        SYMBOLIC_POOL = WorkerPool(workers, timeout, memory_limit, warmup=(_warm_symbolic,))
+        logging.info("Started symbolic worker pool with %d workers", workers)
+
+
+class _Srepr(str):
+    """A SymPy argument shipped to a worker process as its srepr text."""
+
+
+def _ship(value):
+    """Replaces SymPy objects in a (nested) argument by their srepr for a worker process."""
+    if isinstance(value, sp.Basic):
+        return _Srepr(sp.srepr(value))
+    if isinstance(value, (list, tuple)):
+        return type(value)(_ship(item) for item in value)
+    return value
+
+
+def _unship(value):
+    """Rebuilds the SymPy objects of an argument produced by _ship (cached in SYMPY_CACHE)."""
+    if isinstance(value, _Srepr):
+        key = ("srepr", str(value))
+        expr = SYMPY_CACHE.get(key)
+        if expr is None:
+            # srepr is valid Python over SymPy's namespace; sympify would reinterpret numbers
+            # such as the dummy_index of a Dummy
+            expr = eval(str(value), dict(vars(sp)))
+            SYMPY_CACHE.put(key, expr)
+        return expr
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unship(item) for item in value)
+    return value
+
+
+def _call_shipped(func, args: tuple):
+    """Worker side of _run_with_budget: calls func with the shipped SymPy arguments rebuilt."""
+    return func(*_unship(args))
+
+
+def _run_pooled(pool: WorkerPool, func, *args) -> dict:
+    """Runs a tool implementation in a worker pool, reporting timeouts and crashes as errors."""
+    try:
+        return pool.run(func, *args)
+    except WorkerTimeout as e:
+        return {"error": str(e), "error_type": "timeout", "limit": pool.timeout}
+    except WorkerCrashed as e:
+        return {"error": str(e), "error_type": "crash"}
+
+
+def _run_symbolic(func, *args) -> dict:
+    """Runs a symbolic tool implementation in the SymPy worker pool when one is configured, inline otherwise."""
+    pool = SYMBOLIC_POOL
+    if pool is None:
+        return func(*args)
+    return _run_pooled(pool, func, *args)
+
+
+# NumPy functions whose result has no more elements than their largest argument
+# (element-wise functions, reductions, sorting, reshaping); array arguments may broadcast
+_NUMPY_ELEMENTWISE = frozenset((
+    "abs", "absolute", "sign", "sqrt", "cbrt", "square", "exp", "exp2", "expm1", "log", "log2",
+    "log10", "log1p", "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2", "sinh", "cosh",
+    "tanh", "arcsinh", "arccosh", "arctanh", "hypot", "degrees", "radians", "deg2rad", "rad2deg",
+    "floor", "ceil", "trunc", "rint", "round", "fix", "mod", "fmod", "remainder", "divmod", "power",
+    "float_power", "reciprocal", "maximum", "minimum", "fmax", "fmin", "clip", "isfinite", "isinf",
+    "isnan", "isclose", "allclose", "array_equal", "real", "imag", "conj", "conjugate", "angle",
+    "gcd", "lcm", "heaviside", "sinc", "add", "subtract", "multiply", "divide", "true_divide",
+    "floor_divide", "negative", "where", "sum", "prod", "mean", "median", "std", "var", "min", "max",
+    "amin", "amax", "argmin", "argmax", "cumsum", "cumprod", "average", "percentile", "quantile",
+    "ptp", "nansum", "nanprod", "nanmean", "nanmedian", "nanstd", "nanvar", "nanmin", "nanmax", "all",
+    "any", "count_nonzero", "diff", "trapezoid", "trapz", "interp", "unique", "sort", "argsort",
+    "searchsorted", "nonzero", "dot", "vdot", "inner", "matmul", "cross", "tensordot", "trace",
+    "polyval", "array", "asarray", "zeros_like", "ones_like", "full_like", "diagonal", "tril", "triu",
+    "transpose", "reshape", "ravel", "flip", "roll", "concatenate", "stack", "vstack", "hstack",
+    "column_stack", "det", "inv", "pinv", "norm", "solve", "lstsq", "eig", "eigh", "eigvals",
+    "eigvalsh", "svd", "qr", "cholesky", "matrix_rank", "matrix_power", "slogdet", "cond",
+))
+
+
+class CostEstimator:
+    """
+    Statically estimates how expensive a `calculate` expression is to evaluate.
+
+    Walks the AST tracking the approximate magnitude (log2) of every value that
+    can be derived from literals, and the number of elements (log2) of every array
+    or sequence. Exponent towers, shifts, factorial/comb/perm arguments, NumPy array
+    constructors and sequence repetition are what make an expression expensive; the
+    estimate is the size in bits of the largest integer or array built along the way.
+    Names whose values are unknown count as ordinary floats.
+
+    Constructs the estimate cannot bound (method calls on values, broadcasting between
+    arrays, sizes or counts with unknown values) clear `bounded`; with a worker pool
+    such expressions do not run inline even when their estimate is small.
+    """
+
+    def __init__(self, names: Optional[dict] = None):
+        self.names = names or {}
+
+    def estimate(self, expression: str) -> float:
+        self.bits = 0.0
+        self.bounded = True
+        self._values = {}
+        self._sizes = {}
+        self._sequences = set()
+        tree = ast.parse(expression.lstrip(" \t"), "<expression>", "eval")
+        self.visit(tree.body)
+        return self.bits
+
+    def visit(self, node):
+        """Returns (log2 of the magnitude, is_integer) for a node."""
+        method = getattr(self, "_visit_" + type(node).__name__, None)
+        if method is None:
+            size = 0.0
+            for child in ast.iter_child_nodes(node):
+                self.visit(child)
+                size = max(size, self._size(child))
+            self._sizes[id(node)] = size
+            result = 64.0, False
+        else:
+            result = method(node)
+        self._values[id(node)] = result
+        return result
+
+    def _record(self, log2, is_int):
+        if is_int:
+            self.bits = max(self.bits, log2)
+        return (log2, True) if is_int else (min(log2, 1024.0), False)
+
+    def _size(self, node) -> float:
+        """log2 of the number of elements of a visited node (0 for scalars)."""
+        return self._sizes.get(id(node), 0.0)
+
+    def _array(self, node, size: float):
+        """Records that a node builds an array or sequence of 2**size elements of 64 bits."""
+        size = max(size, 0.0)
+        self._sizes[id(node)] = size
+        if size:
+            self._record(64 * 2.0 ** size if size < 1024 else math.inf, True)
+
+    def _count(self, node) -> float:
+        """log2 of a visited size or count argument; unknown values count as 1 and unbound the estimate."""
+        if node is None:
+            return 0.0
+        if isinstance(node, ast.UnaryOp) and isinstance(node.operand, ast.Constant):
+            node = node.operand
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return math.log2(abs(node.value)) if node.value else 0.0
+        log2, is_int = self._values.get(id(node), (0.0, False))
+        if is_int:
+            return log2
+        self.bounded = False
+        return 0.0
+
+    def _shape_log2(self, node):
+        if isinstance(node, (ast.Tuple, ast.List)):
+            return sum(self._count(item) for item in node.elts)
+        return self._count(node)
+
+    def _visit_Constant(self, node):
+        value = node.value
+        if isinstance(value, (str, bytes)):
+            self._sequences.add(id(node))
+            self._array(node, math.log2(len(value)) if value else 0.0)
+            return 1.0, False
+        if isinstance(value, (bool, int)):
+            return self._record(math.log2(abs(value)) if value else 0.0, True)
+        if isinstance(value, float) and math.isfinite(value) and value:
+            return abs(math.log2(abs(value))), False
+        return 1.0, False
+
+    def _visit_Name(self, node):
+        if node.id in ("pi", "e"):
+            return 2.0, False
+        # Workspace values have a known size
+        value = self.names.get(node.id)
+        if isinstance(value, np.ndarray):
+            self._array(node, math.log2(value.size) if value.size else 0.0)
+        elif isinstance(value, int) and not isinstance(value, bool):
+            return self._record(math.log2(abs(value)) if value else 0.0, True)
+        return 64.0, False
+
+    def _visit_List(self, node):
+        size = 0.0
+        for item in node.elts:
+            self.visit(item)
+            size = max(size, self._size(item))
+        self._sequences.add(id(node))
+        self._array(node, math.log2(len(node.elts)) + size if node.elts else 0.0)
+        return 64.0, False
+
+    _visit_Tuple = _visit_List
+
+    def _visit_UnaryOp(self, node):
+        result = self.visit(node.operand)
+        self._sizes[id(node)] = self._size(node.operand)
+        return result
+
+    def _visit_BinOp(self, node):
+        # Flatten left-associative chains to avoid deep recursion
+        root = node
+        chain = []
+        while isinstance(node, ast.BinOp):
+            chain.append((type(node.op), node.right))
+            node = node.left
+        left, left_int = self.visit(node)
+        size, sequence = self._size(node), id(node) in self._sequences
+        for op, right_node in reversed(chain):
+            right, right_int = self.visit(right_node)
+            right_size, right_sequence = self._size(right_node), id(right_node) in self._sequences
+            if op is ast.Mult and (sequence or right_sequence):
+                # Sequence repetition such as [0] * n
+                count, count_int = (right, right_int) if sequence else (left, left_int)
+                if not count_int:
+                    self.bounded = False
+                size = (size if sequence else right_size) + (count if count_int else 0.0)
+                sequence = True
+                self._array(root, size)
+                left, left_int = 64.0, False
+                continue
+            if size and right_size and not (sequence and right_sequence):
+                # Arrays of different shapes broadcast to the product of their sizes
+                self.bounded = False
+            sequence = sequence and right_sequence
+            size = max(size, right_size) + (1.0 if sequence else 0.0)
+            both_int = left_int and right_int
+            if op is ast.Pow:
+                exponent = 2.0 ** right if right < 1024 else math.inf
+                left = left * exponent if exponent else 0.0
+                left_int = both_int
+            elif op is ast.LShift:
+                left = left + (2.0 ** right if right < 1024 else math.inf)
+                left_int = both_int
+            elif op is ast.Mult:
+                left, left_int = left + right, both_int
+            elif op in (ast.Add, ast.Sub, ast.BitOr, ast.BitXor):
+                left, left_int = max(left, right) + 1, both_int
+            elif op is ast.Div:
+                left, left_int = abs(left - right), False
+            else:
+                left_int = both_int
+            left, left_int = self._record(left, left_int)
+        if sequence:
+            self._sequences.add(id(root))
+        self._array(root, size)
+        return left, left_int
+
+    def _visit_Call(self, node):
+        args = [self.visit(arg) for arg in node.args]
+        keywords = {}
+        for keyword in node.keywords:
+            self.visit(keyword.value)
+            keywords[keyword.arg] = keyword.value
+
+        def argument(position, name):
+            return node.args[position] if len(node.args) > position else keywords.get(name)
+
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if isinstance(func, ast.Name):
+            owner = ""
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id in ("np", "math"):
+            owner = func.value.id
+        elif (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Attribute)
+              and isinstance(func.value.value, ast.Name) and func.value.value.id == "np"):
+            owner = "np"
+        else:
+            # A method of a value, e.g. x.repeat(n): its result size is not modeled
+            owner = None
+            self.visit(func)
+            self.bounded = False
+        magnitude = max((log2 for log2, _ in args), default=64.0)
+        sizes = [self._size(arg) for arg in list(node.args) + list(keywords.values())]
+        size = max(sizes, default=0.0)
+
+        if name == "factorial" and owner in ("", "math") and args:
+            log2_n = args[0][0]
+            n = 2.0 ** log2_n if log2_n < 1024 else math.inf
+            return self._record(n * max(log2_n - math.log2(math.e), 1.0), True)
+        if name in ("comb", "perm") and owner == "math" and args:
+            # comb(n, k) <= min(2**n, n**k) and perm(n, k) <= min(n!, n**k)
+            log2_n = args[0][0]
+            n = 2.0 ** log2_n if log2_n < 1024 else math.inf
+            bound = n if name == "comb" else n * max(log2_n - math.log2(math.e), 1.0)
+            if len(args) > 1:
+                log2_k = args[1][0]
+                bound = min(bound, (2.0 ** log2_k if log2_k < 1024 else math.inf) * max(log2_n, 1.0))
+            return self._record(bound, True)
+        if owner == "np":
+            if name in ("zeros", "ones", "empty", "full"):
+                shape = argument(0, "shape")
+                size = self._shape_log2(shape) if shape is not None else 0.0
+            elif name == "identity":
+                size = 2 * self._count(argument(0, "n"))
+            elif name == "eye":
+                rows = argument(0, "N")
+                columns = argument(1, "M")
+                size = self._count(rows) + self._count(columns if columns is not None else rows)
+            elif name == "arange":
+                if len(node.args) == 1 and not keywords:
+                    size = self._count(node.args[0])
+                else:
+                    start, stop, step = argument(0, "start"), argument(1, "stop"), argument(2, "step")
+                    size = max(self._count(start), self._count(stop)) - (self._count(step) if step is not None else 0.0)
+            elif name in ("linspace", "logspace", "geomspace"):
+                num = argument(2, "num")
+                size = max(size, self._count(num) if num is not None else math.log2(50))
+            elif name == "repeat":
+                size = self._size(argument(0, "a")) + self._count(argument(1, "repeats"))
+            elif name == "tile":
+                size = self._size(argument(0, "A")) + self._shape_log2(argument(1, "reps"))
+            elif name in ("outer", "kron", "meshgrid"):
+                # Every pair (or tuple) of elements of the arguments
+                size = sum(sizes) + (math.log2(len(node.args)) if name == "meshgrid" and node.args else 0.0)
+            elif name == "diag":
+                size = 2 * size
+            elif name in _NUMPY_ELEMENTWISE:
+                if sum(1 for s in sizes if s) > 1:
+                    self.bounded = False
+            else:
+                self.bounded = False
+        elif owner == "math" and name in ("prod", "lcm", "sumprod"):
+            # Products of many integers are not modeled
+            self.bounded = False
+        elif owner == "" and sum(1 for s in sizes if s) > 1:
+            self.bounded = False
+        self._array(node, size)
+        return magnitude, False
+
+
+def _classify(value: float, expensive: float, reject: float, what: str) -> dict:
+    """Builds an admission decision from a cost value and its thresholds."""
+    if value >= reject:
+        return {"class": "rejected", "reason": f"Request rejected: estimated {what} exceeds the limit of {reject:g}"}
+    return {"class": "expensive" if value >= expensive else "cheap"}
+
+
+def _binding_shape(value):
+    """The part of a workspace value the cost estimate depends on: array shapes and integer sizes."""
+    if isinstance(value, np.ndarray):
+        return "ndarray", value.shape
+    if isinstance(value, int) and not isinstance(value, bool):
+        return "int", abs(value).bit_length()
+    return type(value).__name__
+
+
+def _used_bindings(expression: str, bindings: dict) -> dict:
+    """Returns the workspace bindings an expression refers to (none if it does not compile)."""
+    try:
+        names = _compile_expression(expression).names
+    except Exception:
+        return {}
+    return {name: bindings[name] for name in names if name in bindings}
+
+
+def estimate_expression_cost(expression: str, bindings: Optional[dict] = None, digits: Optional[int] = None) -> dict:
+    """
+    Classifies a `calculate` expression as cheap, expensive or rejected.
+
+    Estimates are cached in COST_CACHE per expression and the shapes of the workspace bindings it
+    refers to (their values take part in the estimate). A request for
+    COST_EXPENSIVE_DIGITS or more significant digits is expensive whatever the
+    expression: special functions such as gamma slow down sharply with the precision.
+    """
+    if bindings:
+        bindings = _used_bindings(expression, bindings)
+    key = expression, tuple(sorted((name, _binding_shape(value)) for name, value in (bindings or {}).items()))
+    cost = COST_CACHE.get(key)
+    if cost is None:
+        try:
+            estimator = CostEstimator(bindings)
+            bits, bounded = estimator.estimate(expression), estimator.bounded
+        except Exception:
+            # Invalid expressions are cheap: evaluation reports the actual error
+            bits, bounded = 0.0, True
+        cost = _classify(bits, COST_EXPENSIVE_BITS, COST_REJECT_BITS, "result size in bits")
+        cost["bits"] = bits if math.isfinite(bits) else "inf"
+        cost["bounded"] = bounded
+        COST_CACHE.put(key, cost)
+    # Out-of-range digit counts are cheap: evaluation reports the actual error
+    if cost["class"] == "cheap" and digits is not None and COST_EXPENSIVE_DIGITS <= digits <= ESCALATION_MAX_DIGITS:
+        cost = dict(cost, digits=digits)
+        cost["class"] = "expensive"
+    return cost
+
+
+def estimate_summation_cost(expression: str, start: int, end: int, method: str = "auto") -> dict:
+    """
+    Classifies a `summation` request by its number of terms.
+
+    Polynomial summands have a cheap closed form. Summands in x only are summed
+    numerically unless method is "symbolic", which costs a vectorized NumPy pass per
+    term (the closed form is attempted within a fixed time budget first), so they
+    are expensive only above SUMMATION_NUMERIC_EXPENSIVE_TERMS terms.
+    """
+    try:
+        start, end = _summation_bound(start), _summation_bound(end)
+        if math.isinf(start) or math.isinf(end):
+            # Infinite sums are evaluated by series acceleration with a bounded number of terms
+            return {"class": "cheap", "terms": 0}
+        terms = max(end - start + 1, 0)
+        x = sp.Symbol("x")
+        expr = parse_expression(expression)
+        if expr.is_polynomial(x):
+            return {"class": "cheap", "terms": terms}
+        numeric = method != "symbolic" and expr.free_symbols <= {x}
+    except Exception:
+        # Invalid requests are cheap: the tool reports the actual error
+        return {"class": "cheap", "terms": 0}
+    expensive = SUMMATION_NUMERIC_EXPENSIVE_TERMS if numeric else SUMMATION_EXPENSIVE_TERMS
+    cost = _classify(terms, expensive, SUMMATION_REJECT_TERMS, "number of terms")
+    cost["terms"] = terms
+    return cost
+
+
+def estimate_factorize_cost(expression: str) -> dict:
+    """Classifies a `factorize` request by the total degree of its polynomial."""
+    try:
+        expr = parse_expression(expression)
+        if not expr.free_symbols or not expr.is_polynomial():
+            return {"class": "cheap", "degree": 0}
+        degree = sp.Poly(expr, *sorted(expr.free_symbols, key=str)).total_degree()
+    except Exception:
+        return {"class": "cheap", "degree": 0}
+    cost = _classify(degree, FACTORIZE_EXPENSIVE_DEGREE, FACTORIZE_REJECT_DEGREE, "polynomial degree")
+    cost["degree"] = degree
+    return cost
+
+
+def _run_admitted(cost: dict, func, *args, symbolic: bool = False) -> dict:
+    """
+    Runs a tool implementation according to its admission decision.
+
+    Rejected requests are refused, cheap ones run inline and expensive ones run
+    in the worker pool, where time and memory limits apply; without a pool they are
+    refused as well rather than run unbounded in the server process. Cheap requests
+    whose estimate is not "bounded" (it may miss how much they allocate) also go to
+    the pool when there is one. Symbolic tools run every admitted request in the
+    SymPy worker pool when that is configured.
+    """
+    if cost["class"] == "rejected":
+        logging.warning("Request rejected by admission control: %s", cost)
+        return {"error": cost["reason"], "error_type": "rejected", "cost": cost}
+    if symbolic and SYMBOLIC_POOL is not None:
+        return _run_pooled(SYMBOLIC_POOL, func, *args)
+    pool = CALCULATE_POOL
+    if cost["class"] == "cheap" and (pool is None or cost.get("bounded", True)):
+        return func(*args)
+    if pool is None:
+        logging.warning("Expensive request refused without a worker pool: %s", cost)
+        option = "--symbolic-workers or --calc-workers" if symbolic else "--calc-workers"
+        return {
+            "error": f"Request rejected: it is too expensive to run without a worker pool (start the server with {option})",
+            "error_type": "rejected",
+            "cost": cost,
+        }
+    return _run_pooled(pool, func, *args)
+
+
+def _value_size(value) -> int:
+    """Approximates the memory held by a workspace value in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, int):
+        return sys.getsizeof(0) + value.bit_length() // 8
+    return sys.getsizeof(value)
+
+
+class Workspace:
+    """
+    Named calculate results of one MCP session.
+
+    Values are stored as evaluated (ints, floats, NumPy arrays, mpmath numbers)
+    and bound by name in later expressions. The total size is capped.
+    """
+
+    def __init__(self, owner=None, max_bytes: int = WORKSPACE_MAX_BYTES, max_variables: int = WORKSPACE_MAX_VARIABLES):
+        self.owner = weakref.ref(owner) if owner is not None else None
+        self.max_bytes = max_bytes
+        self.max_variables = max_variables
+        self.values = {}
+        self.sizes = {}
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self.sizes.values())
+
+    def bindings(self) -> dict:
+        """Returns a snapshot of the stored values."""
+        with self._lock:
+            self.last_used = time.monotonic()
+            return dict(self.values)
+
+    def set(self, name: str, value):
+        size = _value_size(value)
+        with self._lock:
+            self.last_used = time.monotonic()
+            if name not in self.values and len(self.values) >= self.max_variables:
+                raise ValueError(f"Workspace variable limit of {self.max_variables} reached")
+            if self.nbytes - self.sizes.get(name, 0) + size > self.max_bytes:
+                raise ValueError(f"Workspace memory limit of {self.max_bytes} bytes exceeded")
+            self.values[name] = value
+            self.sizes[name] = size
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            self.last_used = time.monotonic()
+            self.sizes.pop(name, None)
+            return self.values.pop(name, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+            self.sizes.clear()
+
+
+class WorkspaceStore:
+    """
+    Maps MCP sessions to their workspaces.
+
+    Workspaces idle for longer than idle_timeout, or whose session has been
+    closed, are evicted on access; beyond max_sessions the least recently used
+    workspace is dropped.
+    """
+
+    def __init__(self, max_sessions: int = WORKSPACE_MAX_SESSIONS, idle_timeout: float = WORKSPACE_IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_bytes = WORKSPACE_MAX_BYTES
+        self._workspaces = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def get(self, session=None) -> Workspace:
+        """Returns the workspace of a session (None for direct, in-process use), creating it if needed."""
+        key = id(session) if session is not None else None
+        with self._lock:
+            self._evict_idle()
+            workspace = self._workspaces.get(key)
+            if workspace is not None and workspace.owner is not None and workspace.owner() is not session:
+                # The id belonged to a session that no longer exists
+                workspace = None
+            if workspace is None:
+                workspace = Workspace(session, self.max_bytes)
+                self._workspaces[key] = workspace
+                while len(self._workspaces) > self.max_sessions:
+                    self._workspaces.popitem(last=False)
+            self._workspaces.move_to_end(key)
+            workspace.last_used = time.monotonic()
+            return workspace
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + min(self.idle_timeout, 1.0)
+        deadline = now - self.idle_timeout
+        for key, workspace in list(self._workspaces.items()):
+            if workspace.last_used < deadline or (workspace.owner is not None and workspace.owner() is None):
+                del self._workspaces[key]
+
+    def clear(self):
+        with self._lock:
+            self._workspaces.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._workspaces)
+
+
+WORKSPACES = WorkspaceStore()
+
+# "name = expression" stores the result in the session workspace ("==" is a comparison)
+_ASSIGNMENT = re.compile(r"\s*([A-Za-z_]\w*)\s*=(?!=)(.*)", re.DOTALL)
+
+
+def _session_workspace(ctx: Optional[Context]) -> Workspace:
+    """Returns the workspace of the MCP session making the request."""
+    session = None
+    if ctx is not None:
+        try:
+            session = ctx.session
+        except ValueError:
+            # Called outside of a request
+            session = None
+    return WORKSPACES.get(session)
+
+
+def _run_calculation(
+    expression: str,
+    variables: Optional[Dict[str, List[float]]] = None,
+    digits: Optional[int] = None,
+    full_result: bool = False,
+    bindings: Optional[dict] = None,
+    keep_value: bool = False,
+) -> dict:
+    """Evaluates an expression subject to admission control."""
+    if not isinstance(expression, str):
+        return _calculate_one(expression, variables, digits, full_result, bindings, keep_value)
+    if bindings:
+        # Pooled calls pickle their arguments: ship only the values the expression uses
+        bindings = _used_bindings(expression, bindings)
+    args = (expression, variables, digits, full_result, bindings, keep_value)
+    return _run_admitted(estimate_expression_cost(expression, bindings, digits), _calculate_one, *args)
+
+
+@_blocking_tool()
+def calculate(
+    expression: str,
+    variables: Optional[Dict[str, List[float]]] = None,
+    digits: Optional[int] = None,
+    full_result: bool = False,
+    ctx: Context = None,
+) -> dict:
     """
     Evaluates a mathematical expression and returns the result.
 
     Supports basic operators (+, -, *, /, **, %), mathematical functions
     (sin, cos, tan, exp, log, log10, sqrt), and constants (pi, e).
-    Uses a restricted evaluation context for safe execution.
+    Expressions are checked against a syntax whitelist and evaluated by a
+    dedicated evaluator, without using Python's eval().
 
     Args:
         expression: The mathematical expression to evaluate as a string.
                     Examples: "2 + 2", "sin(pi/4)", "sqrt(16) * 2", "log(100, 10)"
+        variables: Optional mapping of variable names to lists of values. When given,
+                   the expression is evaluated element-wise over the arrays in a
+                   single call (NumPy broadcasting rules apply).
+        digits: Optional number of significant digits (at most ESCALATION_MAX_DIGITS). When
+                given, the expression is evaluated with mpmath at that precision and the result
+                is returned as a string. COST_EXPENSIVE_DIGITS or more digits count as an
+                expensive request.
+        full_result: Return large results in full (huge integers as decimal strings, arrays
+                     as lists) instead of a summary. Default is False.
+        ctx: The MCP request context, injected by the server; selects the session workspace.
 
     Returns:
         On success: {"result": <calculated value>}
+        On assignment ("name = expression"): {"result": <value>, "name": <name>}
+        On escalation to arbitrary precision: {"result": <value>, "precision": {"mode": "mpmath",
+            "digits": <digits>, "reason": "requested" | "overflow" | "cancellation"}}
+        On a summarized large result: {"result": <summary>, "truncated": True}, where the summary is
+            {"digits", "leading", "trailing", "scientific"} for integers and
+            {"shape", "dtype", "encoding", "byteorder", "data"} for arrays
         On error: {"error": <error message>}
+        On exceeded limits: {"error": <message>, "error_type": "rejected" | "timeout" | "memory" | "crash"}
 
     Examples:
         >>> calculate("2 * 3 + 4")
@@ -96,30 +2051,646 @@ def calculate(expression: str) -> dict:
         {'result': 4.0}
         >>> calculate("invalid * expression")
         {'error': "name 'invalid' is not defined"}
+        >>> calculate("x**2 + 1", {"x": [0, 1, 2]})
+        {'result': [1.0, 2.0, 5.0]}
+        >>> calculate("exp(1000)")
+        {'result': '1.97007111401704699388887935224e+434', 'precision': {'mode': 'mpmath', 'digits': 30, 'reason': 'overflow'}}
+        >>> calculate("a = factorial(20)")
+        {'result': 2432902008176640000, 'name': 'a'}
+        >>> calculate("a // 10**15")
+        {'result': 2432}
 
     Notes:
         - Use 'x' as the variable (e.g., x**2, not x²)
         - Multiplication must be explicitly indicated with * (e.g., 2*x, not 2x)
         - Powers are represented with ** (e.g., x**2, not x^2)
+        - Compiled expressions are kept in an LRU cache (EXPRESSION_CACHE), so repeated
+          expressions skip parsing and compilation.
+        - Only operators, calls, attribute access on public names, subscripts, comparisons,
+          conditional expressions, tuples and lists are allowed; lambdas, comprehensions,
+          string literals and private attributes (e.g. __class__) are rejected, as are
+          results that are functions or modules.
+        - Integers above RESULT_MAX_DIGITS digits and arrays above RESULT_MAX_ELEMENTS
+          elements are summarized unless full_result is True.
+        - Scalar expressions are evaluated with floats. Only on overflow, catastrophic
+          cancellation (e.g. "1 - cos(1e-10)") or an explicit digits request does the
+          evaluation switch to mpmath; the response then carries a "precision" entry.
+        - Each expression is classified by a static cost estimate. Expressions that would
+          build enormous integers or arrays (e.g. "9**9**9") are rejected with error_type
+          "rejected"; expensive ones run in the isolated worker pool (--calc-workers),
+          which enforces per-call time and memory limits, and are rejected without it.
+        - "name = expression" stores the result in the workspace of the current MCP
+          session, and later expressions of that session can refer to it by name. Stored
+          values keep their full value (including escalated precision), are limited to
+          WORKSPACE_MAX_BYTES per session and are dropped after WORKSPACE_IDLE_TIMEOUT
+          seconds of inactivity. See the `workspace` tool to list or delete them.
     """
     logging.info("Calculate tool called with expression: %s", expression)
     logging.debug("Calculate tool is being executed")
+    workspace = _session_workspace(ctx)
+    name = None
+    match = _ASSIGNMENT.fullmatch(expression) if isinstance(expression, str) else None
+    if match:
+        name, expression = match.groups()
+        if keyword.iskeyword(name) or name.startswith("_") or name in VECTOR_FUNCTION:
+            return {"error": f"Cannot assign to reserved name: {name!r}"}
+    response = _run_calculation(
+        expression, variables, digits, full_result, workspace.bindings(), keep_value=name is not None
+    )
+    if name is not None and "error" not in response:
+        try:
+            workspace.set(name, response.pop("_value"))
+            response["name"] = name
+        except ValueError as e:
+            response = {"error": str(e), "error_type": "rejected"}
+    if "error" in response:
+        logging.error("Calculate tool error: %s", response["error"])
+    else:
+        logging.info("Calculate tool returning result: %s", response["result"])
+    return response
+
+
+@_blocking_tool()
+def calculate_batch(
+    expressions: List[str],
+    variables: Optional[Dict[str, List[float]]] = None,
+    full_result: bool = False,
+    ctx: Context = None,
+) -> dict:
+    """
+    Evaluates many mathematical expressions in a single call.
+
+    Each expression is evaluated exactly like `calculate`, sharing the same
+    compiled expression cache and the session workspace (read-only: assignments
+    are not supported in a batch). A failing expression does not affect the others.
+
+    Args:
+        expressions: A list of expressions to evaluate.
+        variables: Optional variable bindings applied to every expression (see `calculate`).
+        full_result: Return large results in full instead of a summary (see `calculate`).
+        ctx: The MCP request context, injected by the server; selects the session workspace.
+
+    Returns:
+        On success: {"results": [<{"result": ...} or {"error": ...}>, ...]} in input order
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> calculate_batch(["1 + 1", "sqrt(16)", "1 / 0"])
+        {'results': [{'result': 2}, {'result': 4.0}, {'error': 'division by zero'}]}
+
+    Notes:
+        - Input format: List of expression strings.
+        - Every item goes through the same admission control as `calculate`.
+        - When the calculate worker pool is enabled (--calc-workers), items are spread across
+          its worker processes; otherwise they are evaluated one after the other, as threads
+          would gain nothing on pure-Python evaluation under the GIL.
+        - Common errors: Empty list; per-item errors are reported in place.
+    """
+    if not expressions:
+        return {"error": "Expressions cannot be empty"}
+    logging.info("Calculate batch tool called with %d expressions", len(expressions))
+    bindings = _session_workspace(ctx).bindings()
+
+    if CALCULATE_POOL is not None:
+        # Isolated mode: every item runs in the pool, one dispatching thread per worker
+        with concurrent.futures.ThreadPoolExecutor(max_workers=CALCULATE_POOL.size) as executor:
+            results = list(executor.map(
+                lambda e: _run_calculation(e, variables, None, full_result, bindings), expressions
+            ))
+        return {"results": results}
+
+    return {"results": [_run_calculation(e, variables, None, full_result, bindings) for e in expressions]}
+
+
+@app.tool()
+def workspace(action: str = "list", names: Optional[List[str]] = None, ctx: Context = None) -> dict:
+    """
+    Lists or deletes the named results stored by `calculate` in this session.
+
+    Args:
+        action: "list" (default), "delete" (the given names) or "clear" (everything).
+        names: The variable names to delete, for action "delete".
+        ctx: The MCP request context, injected by the server; selects the session workspace.
+
+    Returns:
+        For "list": {"result": {<name>: {"type": <type name>, "bytes": <size>}, ...},
+            "bytes": <total size>, "limit": <maximum size>}
+        For "delete": {"result": {"deleted": [<names>], "missing": [<names>]}}
+        For "clear": {"result": {"deleted": [<names>]}}
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> calculate("a = 2 ** 10")
+        {'result': 1024, 'name': 'a'}
+        >>> workspace()
+        {'result': {'a': {'type': 'int', 'bytes': 25}}, 'bytes': 25, 'limit': 67108864}
+
+    Notes:
+        - Read a stored value with calculate("<name>").
+        - Workspaces are dropped after WORKSPACE_IDLE_TIMEOUT seconds of inactivity.
+    """
+    store = _session_workspace(ctx)
+    logging.info("Workspace tool called with action: %s", action)
+    if action == "list":
+        with store._lock:
+            entries = {
+                name: {"type": type(value).__name__, "bytes": store.sizes[name]}
+                for name, value in store.values.items()
+            }
+        return {"result": entries, "bytes": sum(entry["bytes"] for entry in entries.values()), "limit": store.max_bytes}
+    if action == "delete":
+        if not names:
+            return {"error": "Names cannot be empty"}
+        deleted = [name for name in names if store.delete(name)]
+        return {"result": {"deleted": deleted, "missing": [name for name in names if name not in deleted]}}
+    if action == "clear":
+        deleted = list(store.bindings())
+        store.clear()
+        return {"result": {"deleted": deleted}}
+    return {"error": "Action must be 'list', 'delete' or 'clear'"}
+
+
+def _grid_axis(name: str, spec) -> np.ndarray:
+    """Builds the values of one grid parameter from a value list or a range specification."""
+    if not name.isidentifier() or name.startswith("_"):
+        raise ValueError(f"Invalid variable name: {name!r}")
+    if isinstance(spec, dict):
+        unknown = set(spec) - {"start", "stop", "num", "step"}
+        if unknown or "start" not in spec or "stop" not in spec or ("num" in spec) == ("step" in spec):
+            raise ValueError(
+                f"Range for {name!r} must have 'start', 'stop' and exactly one of 'num' or 'step'"
+            )
+        if "num" in spec:
+            values = np.linspace(spec["start"], spec["stop"], int(spec["num"]))
+        else:
+            if spec["step"] == 0:
+                raise ValueError(f"Step for {name!r} cannot be zero")
+            values = np.arange(spec["start"], spec["stop"], spec["step"], dtype=float)
+    else:
+        values = np.asarray(spec, dtype=float)
+        if values.ndim != 1:
+            raise ValueError(f"Values for {name!r} must be a flat list")
+    if values.size == 0:
+        raise ValueError(f"Parameter {name!r} has no values")
+    return values
+
+
+def _grid_axis_length(spec) -> int:
+    """Returns the number of values of a grid parameter without building them."""
+    if isinstance(spec, dict):
+        if "num" in spec:
+            return max(int(spec["num"]), 0)
+        return max(math.ceil((spec["stop"] - spec["start"]) / spec["step"]), 0)
+    return len(spec)
+
+
+def _grid_chunks(expression: str, axes: Dict[str, np.ndarray], first_row: int = 0, last_row: Optional[int] = None):
+    """
+    Evaluates an expression over a Cartesian grid, yielding (flat offset, values) chunks.
+
+    The first parameter is sliced into row blocks of about GRID_CHUNK_POINTS points;
+    every parameter is reshaped along its own axis so NumPy broadcasting builds the
+    grid block without materializing the coordinate arrays.
+    """
+    program = _compile_expression(expression, "vector")
+    names = list(axes)
+    shape = tuple(len(values) for values in axes.values())
+    inner = math.prod(shape[1:])
+    rows = max(1, GRID_CHUNK_POINTS // inner)
+    namespace = dict(VECTOR_FUNCTION)
+    for position, name in enumerate(names[1:], start=1):
+        namespace[name] = axes[name].reshape((-1,) + (1,) * (len(shape) - position - 1))
+    last_row = shape[0] if last_row is None else last_row
+    for start in range(first_row, last_row, rows):
+        stop = min(start + rows, last_row)
+        namespace[names[0]] = axes[names[0]][start:stop].reshape((-1,) + (1,) * (len(shape) - 1))
+        with np.errstate(all="ignore"):
+            # NaN and infinite values are reported in the results, not as warnings
+            block = np.broadcast_to(np.asarray(program(namespace)), (stop - start,) + shape[1:])
+        yield start * inner, block.ravel()
+
+
+def _grid_point(axes: Dict[str, np.ndarray], index: int) -> Dict[str, float]:
+    """Returns the parameter values at a flat (C-order) grid index."""
+    shape = tuple(len(values) for values in axes.values())
+    coordinates = np.unravel_index(index, shape)
+    return {name: float(values[i]) for (name, values), i in zip(axes.items(), coordinates)}
+
+
+def _summarize_grid(expression: str, axes: Dict[str, np.ndarray]) -> dict:
+    """Streams a grid evaluation into count, NaN/infinity counts, min/max with location, mean and std."""
+    count = finite = nan = 0
+    total = m2 = 0.0
+    low = high = None
+    for offset, values in _grid_chunks(expression, axes):
+        if np.iscomplexobj(values):
+            raise ValueError("Summary output requires real-valued results; use output='array'")
+        values = values.astype(float)
+        mask = np.isfinite(values)
+        count += values.size
+        nan += int(np.isnan(values).sum())
+        n = int(mask.sum())
+        if not n:
+            continue
+        selected = values[mask]
+        chunk_mean = float(selected.mean())
+        chunk_m2 = float(((selected - chunk_mean) ** 2).sum())
+        # Chan et al. pairwise update of the running mean and sum of squared deviations
+        mean = total / finite if finite else 0.0
+        delta = chunk_mean - mean
+        m2 += chunk_m2 + delta ** 2 * finite * n / (finite + n)
+        total += chunk_mean * n
+        finite += n
+        i = int(np.where(mask, values, np.inf).argmin())
+        if low is None or values[i] < low[0]:
+            low = (float(values[i]), offset + i)
+        i = int(np.where(mask, values, -np.inf).argmax())
+        if high is None or values[i] > high[0]:
+            high = (float(values[i]), offset + i)
+
+    summary = {"count": count, "finite": finite, "nan": nan, "infinite": count - finite - nan}
+    if finite:
+        summary.update({
+            "min": low[0],
+            "argmin": _grid_point(axes, low[1]),
+            "max": high[0],
+            "argmax": _grid_point(axes, high[1]),
+            "mean": total / finite,
+            "std": math.sqrt(m2 / finite),
+        })
+    return summary
+
+
+def _evaluate_grid(
+    expression: str,
+    parameters: Dict[str, Union[List[float], Dict[str, float]]],
+    output: str,
+    offset: int,
+    limit: int,
+    full_result: bool,
+) -> dict:
+    """Implements `evaluate_grid` once the request has been admitted."""
     try:
-        # Safe evaluation of the expression
-        result = eval(
-            expression,
-            {"__builtins__": {}},
-            ALLOW_FUNCTION,
-        )
-        logging.info("Calculate tool returning result: %s", result)
-        return {"result": result}
+        axes = {name: _grid_axis(name, spec) for name, spec in parameters.items()}
+        shape = [len(values) for values in axes.values()]
+        if output == "summary":
+            return {"result": _summarize_grid(expression, axes), "shape": shape}
+
+        points = math.prod(shape)
+        if offset < 0 or offset > points:
+            raise ValueError(f"Offset must be between 0 and {points}")
+        end = min(offset + limit, points)
+        inner = math.prod(shape[1:])
+        first_row = offset // inner
+        chunks = [values for _, values in _grid_chunks(expression, axes, first_row, -(-end // inner))]
+        values = np.concatenate(chunks)[offset - first_row * inner:end - first_row * inner] if chunks else np.empty(0)
+        encoded, truncated = encode_result(values, full_result)
+        response = {
+            "result": encoded,
+            "shape": shape,
+            "offset": offset,
+            "count": end - offset,
+            "next_offset": end if end < points else None,
+        }
+        if truncated:
+            response["truncated"] = True
+        return response
     except Exception as e:
-        logging.error("Calculate tool error: %s", str(e))
         return {"error": str(e)}
 
 
-@app.tool()
-def solve_equation(equation: str) -> dict:
+@_blocking_tool()
+def evaluate_grid(
+    expression: str,
+    parameters: Dict[str, Union[List[float], Dict[str, float]]],
+    output: str = "summary",
+    offset: int = 0,
+    limit: Optional[int] = None,
+    full_result: bool = False,
+) -> dict:
+    """
+    Evaluates an expression over the Cartesian grid of several parameters.
+
+    The grid is evaluated in chunks with NumPy broadcasting using the same
+    functions as `calculate` with variables, so large sweeps never build one
+    giant list of points.
+
+    Args:
+        expression: The expression to evaluate, using the parameter names as variables.
+                    Example: "sin(x) * exp(-y)"
+        parameters: Mapping of parameter names to either a list of values or a range
+                    {"start", "stop", "num"} (inclusive, evenly spaced) or
+                    {"start", "stop", "step"} (stop excluded).
+        output: "summary" for summary statistics (default) or "array" for the values.
+        offset: For array output, the flat (C-order) index of the first point to return.
+        limit: For array output, the maximum number of points to return (default and at
+               most GRID_PAGE_POINTS).
+        full_result: Return large arrays as lists instead of a base64 summary (see `calculate`).
+
+    Returns:
+        Summary output: {"result": {"count", "finite", "nan", "infinite", "min", "argmin",
+            "max", "argmax", "mean", "std"}, "shape": [<points per parameter>, ...]}
+        Array output: {"result": <values>, "shape": [...], "offset": <int>, "count": <int>,
+            "next_offset": <int or None>}, plus "truncated": True for a base64-encoded page
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> evaluate_grid("x * y", {"x": [1, 2], "y": [10, 20, 30]}, output="array")
+        {'result': [10.0, 20.0, 30.0, 20.0, 40.0, 60.0], 'shape': [2, 3], 'offset': 0, 'count': 6, 'next_offset': None}
+        >>> evaluate_grid("x**2 + y**2", {"x": {"start": -1, "stop": 1, "num": 3}, "y": [0, 1]})["result"]["min"]
+        0.0
+
+    Notes:
+        - Points are ordered with the last parameter varying fastest; "argmin" and
+          "argmax" give the parameter values at the extreme points.
+        - Array output is returned in pages of at most GRID_PAGE_POINTS points; page through
+          a larger grid with offset/limit, following "next_offset" until it is None.
+        - Statistics ignore NaN and infinite values, which are counted separately.
+        - Use element-wise functions only: reductions such as sum or mean would apply per chunk.
+        - Grids above GRID_REJECT_POINTS points are rejected; those above GRID_EXPENSIVE_POINTS
+          run in the calculate worker pool when it is enabled.
+    """
+    if not parameters:
+        return {"error": "Parameters cannot be empty"}
+    if output not in ("summary", "array"):
+        return {"error": "Output must be 'summary' or 'array'"}
+    if limit is not None and limit < 1:
+        return {"error": "Limit must be a positive integer"}
+    logging.info("Evaluate grid tool called with expression: %s", expression)
+    limit = GRID_PAGE_POINTS if limit is None else min(limit, GRID_PAGE_POINTS)
+
+    cost = estimate_expression_cost(expression)
+    if cost["class"] != "rejected":
+        try:
+            points = math.prod(_grid_axis_length(spec) for spec in parameters.values())
+        except Exception:
+            # Invalid parameters are cheap: evaluation reports the actual error
+            points = 0
+        if output == "array":
+            points = min(points, limit)
+        grid_cost = _classify(points, GRID_EXPENSIVE_POINTS, GRID_REJECT_POINTS, "number of grid points")
+        if grid_cost["class"] != "cheap":
+            cost = dict(grid_cost, points=points)
+    return _run_admitted(cost, _evaluate_grid, expression, parameters, output, offset, limit, full_result)
+
+
+class ResultStore:
+    """
+    Persistent cache of symbolic tool results in a SQLite file.
+
+    Entries are keyed by (tool, srepr of the canonical expression, variable,
+    SymPy version), so results survive restarts and are shared by every server
+    process using the same file. When the stored results exceed max_bytes,
+    the least recently used entries are deleted.
+
+    Args:
+        path: The SQLite database file (created if missing).
+        max_bytes: Maximum total size of the stored results.
+    """
+
+    def __init__(self, path: str, max_bytes: int = RESULT_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Concurrent processes wait for each other's write locks instead of failing
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "tool TEXT NOT NULL, expression TEXT NOT NULL, variable TEXT NOT NULL, version TEXT NOT NULL, "
+            "result TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, "
+            "PRIMARY KEY (tool, expression, variable, version))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def get(self, tool: str, expression: str, variable: str = "") -> Optional[dict]:
+        key = (tool, expression, variable, sp.__version__)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM results WHERE tool = ? AND expression = ? AND variable = ? AND version = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute(
+                "UPDATE results SET accessed = ? WHERE tool = ? AND expression = ? AND variable = ? AND version = ?",
+                (time.time(),) + key,
+            )
+        return json.loads(row[0])
+
+    def put(self, tool: str, expression: str, variable: str, result: dict):
+        data = json.dumps(result)
+        size = len(data) + len(expression)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tool, expression, variable, sp.__version__, data, size, time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        while total > self.max_bytes:
+            rows = self._db.execute("SELECT rowid, size FROM results ORDER BY accessed LIMIT 64").fetchall()
+            excess = []
+            for rowid, size in rows:
+                if total <= self.max_bytes:
+                    break
+                excess.append((rowid,))
+                total -= size
+            self._db.executemany("DELETE FROM results WHERE rowid = ?", excess)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM results")
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+RESULT_STORE: Optional[ResultStore] = None
+
+
+def configure_result_store(path: Optional[str], max_bytes: int = RESULT_STORE_MAX_BYTES):
+    """Opens (or with path=None, closes) the persistent symbolic result cache."""
+    global RESULT_STORE
+    if RESULT_STORE is not None:
+        RESULT_STORE.close()
+        RESULT_STORE = None
+    if path:
+        RESULT_STORE = ResultStore(path, max_bytes)
+        logging.info("Using persistent result cache at %s", path)
+
+
+def _memoized(tool: str, expr, variable: str, compute) -> dict:
+    """Returns compute() through the persistent result cache; only successful results are stored."""
+    store = RESULT_STORE
+    if store is None:
+        return compute()
+    expression = sp.srepr(expr)
+    try:
+        cached = store.get(tool, expression, variable)
+    except sqlite3.Error as e:
+        logging.warning("Result cache lookup failed: %s", e)
+        return compute()
+    if cached is not None:
+        return cached
+    response = compute()
+    if "error" not in response:
+        try:
+            store.put(tool, expression, variable, response)
+        except sqlite3.Error as e:
+            logging.warning("Result cache update failed: %s", e)
+    return response
+
+
+def _as_polynomial(expr, *gens) -> Optional[sp.Poly]:
+    """Returns expr as a Poly in gens (default: its free symbols), or None if it is not a polynomial."""
+    if not isinstance(expr, sp.Expr):
+        return None
+    gens = gens or tuple(sorted(expr.free_symbols, key=str))
+    if not gens or not expr.is_polynomial(*gens):
+        return None
+    try:
+        return sp.Poly(expr, *gens)
+    except sp.PolynomialError:
+        return None
+
+
+def _clean_root(value: complex) -> complex:
+    """Drops a real or imaginary part of a floating-point root that is negligible relative to the root."""
+    negligible = 1e-12 * max(1.0, abs(value))
+    real = value.real if abs(value.real) > negligible else 0.0
+    imag = value.imag if abs(value.imag) > negligible else 0.0
+    return complex(real, imag)
+
+
+def _format_root(value: complex) -> str:
+    """Formats a floating-point root in SymPy notation (e.g. "-0.5 + 0.866*I") at full double precision."""
+    real, imag = float(value.real), float(value.imag)
+    if not imag:
+        return repr(real)
+    imag_text = f"{abs(imag)!r}*I"
+    if not real:
+        return imag_text if imag > 0 else "-" + imag_text
+    return f"{real!r} {'+' if imag > 0 else '-'} {imag_text}"
+
+
+def _polynomial_roots(poly: sp.Poly, numeric: bool = False) -> Optional[list]:
+    """
+    Computes the roots of a univariate polynomial without going through `solve`.
+
+    Exact roots are the distinct roots in `solve`'s order: radicals from `roots`
+    when it finds all of them, CRootOf objects from `all_roots` otherwise.
+    Numeric roots are the eigenvalues of the companion matrix (np.roots), with
+    multiplicity, as complex numbers. Returns None when the polynomial needs the
+    general solver.
+    """
+    if poly.is_zero or poly.degree() < 2:
+        # Constant and linear equations are already cheap for the general solver
+        return None
+    if numeric:
+        coefficients = np.array([complex(c) for c in poly.all_coeffs()])
+        if not coefficients.imag.any():
+            # The real companion matrix has a much cheaper eigenvalue problem
+            coefficients = coefficients.real
+        roots = np.roots(coefficients)
+        return sorted((_clean_root(root) for root in roots), key=lambda r: (r.real, r.imag))
+    domain = poly.get_domain()
+    if not domain.is_Exact:
+        # Floating-point coefficients
+        return list(dict.fromkeys(poly.nroots()))
+    roots = sp.roots(poly)
+    if sum(roots.values()) == poly.degree():
+        return sorted(roots, key=sp.default_sort_key)
+    if domain.is_ZZ or domain.is_QQ:
+        return list(dict.fromkeys(poly.all_roots()))
+    return None
+
+
+def _solve(expr, x, numeric: bool) -> dict:
+    """Solves expr = 0 for x, through the polynomial fast path when possible."""
+    poly = _as_polynomial(expr, x)
+    solutions = _polynomial_roots(poly, numeric) if poly is not None else None
+    if solutions is None:
+        solutions = solve(expr, x)
+        if numeric:
+            solutions = [_clean_root(complex(sp.N(solution))) for solution in solutions]
+    if numeric:
+        # Formatting floats directly is much faster than printing SymPy numbers
+        return {"solutions": "[" + ", ".join(_format_root(solution) for solution in solutions) + "]"}
+    return {"solutions": str(solutions)}
+
+
+def _real_roots(expr, x, lower: float, upper: float, points: int = ROOT_SCAN_POINTS) -> List[float]:
+    """
+    Finds the real roots of expr = 0 in [lower, upper] numerically.
+
+    The expression is evaluated on a uniform grid in one vectorized call; every sign
+    change is refined with Brent's method and every local minimum of |f| that touches
+    zero (a root of even multiplicity) with a bounded minimization. Sign changes across
+    poles, where |f| grows instead of vanishing, are discarded.
+    """
+    func = _lambdify_expression(expr, (x.name,))
+
+    def f(t: float) -> float:
+        value = complex(func(t))
+        return value.real if abs(value.imag) <= 1e-12 * (1 + abs(value.real)) else math.nan
+
+    xs = np.linspace(lower, upper, points)
+    with np.errstate(all="ignore"):
+        ys = np.broadcast_to(func(xs), xs.shape)
+        if np.iscomplexobj(ys):
+            ys = np.where(np.abs(ys.imag) <= 1e-12 * (1 + np.abs(ys.real)), ys.real, np.nan)
+        ys = ys.astype(float)
+        finite = np.isfinite(ys)
+        roots = list(xs[finite & (ys == 0)])
+
+        left, right = ys[:-1], ys[1:]
+        for i in np.flatnonzero(finite[:-1] & finite[1:] & (np.sign(left) * np.sign(right) < 0)):
+            root = optimize.brentq(f, xs[i], xs[i + 1], xtol=1e-15, rtol=4 * np.finfo(float).eps)
+            if abs(f(root)) <= 1e-8 * (1 + max(abs(left[i]), abs(right[i]))):
+                roots.append(root)
+
+        # Roots that touch zero without crossing it show up as small local minima of |f|
+        magnitude = np.where(finite, np.abs(ys), np.inf)
+        middle = magnitude[1:-1]
+        touching = (middle < magnitude[:-2]) & (middle <= magnitude[2:]) & (np.sign(ys[:-2]) == np.sign(ys[2:]))
+        for i in np.flatnonzero(touching) + 1:
+            found = optimize.minimize_scalar(
+                lambda t: abs(f(t)), bounds=(xs[i - 1], xs[i + 1]), method="bounded", options={"xatol": 1e-14}
+            )
+            if found.success and abs(f(found.x)) <= 1e-10:
+                roots.append(float(found.x))
+
+    unique = []
+    for root in sorted(float(root) for root in roots):
+        if not unique or root - unique[-1] > 1e-9 * (1 + abs(root)):
+            unique.append(root)
+    return unique
+
+
+@_blocking_tool()
+def solve_equation(
+    equation: str,
+    numeric: bool = False,
+    method: str = "auto",
+    interval: Optional[Tuple[float, float]] = None,
+    timeout: Optional[float] = None,
+) -> dict:
     """
     Solves an algebraic equation for x and returns all solutions.
 
@@ -131,10 +2702,21 @@ def solve_equation(equation: str) -> dict:
         equation: The equation to solve as a string.
                   Format: '<left side> = <right side>'
                   Examples: "x**2 - 5*x + 6 = 0", "sin(x) = 0.5", "2*x + 3 = 7"
+        numeric: Return floating-point solutions. Polynomial roots are then computed from the
+                 companion matrix and listed with multiplicity. Default is False.
+        method: "auto" (default) solves symbolically and falls back to numeric root finding
+                when the solver times out, gives up or finds nothing; "symbolic" never falls
+                back; "numeric" only searches for real roots numerically.
+        interval: [lower, upper] searched by numeric root finding. Default is [-10, 10].
+        timeout: Time budget in seconds of the symbolic solver, capped at the server's
+                 --solve-timeout (default 5 seconds).
 
     Returns:
         On success: {"solutions": <list of solutions as string>}
-        On error: {"error": <error message>}
+        From numeric root finding: {"solutions": <real roots as string>, "method": "numeric",
+                                    "interval": [lower, upper]}
+        On error: {"error": <error message>}; a symbolic solve that exceeds its budget
+                  adds "error_type": "timeout"
 
     Examples:
         >>> solve_equation("x**2 - 5*x + 6 = 0")
@@ -143,6 +2725,10 @@ def solve_equation(equation: str) -> dict:
         {'solutions': '[2]'}
         >>> solve_equation("x = 0")
         {'solutions': '[0]'}
+        >>> solve_equation("x**2 = 2", numeric=True)
+        {'solutions': '[-1.4142135623730951, 1.4142135623730951]'}
+        >>> solve_equation("cos(x) = x")
+        {'solutions': '[0.7390851332151607]', 'method': 'numeric', 'interval': [-10.0, 10.0]}
 
     Notes:
         - Use 'x' as the variable (e.g., x**2, not x²)
@@ -154,6 +2740,12 @@ def solve_equation(equation: str) -> dict:
         - Common errors: Missing or multiple '=' signs; use of variables other than 'x'; equations that cannot be solved symbolically.
         - Input format: Expression must be a string with valid mathematical syntax using allowed functions (sin, cos, etc.) and constants (pi, e).
         - Common errors: NameError for undefined variables/functions; SyntaxError for invalid syntax; TypeError if input is not a string.
+        - Results are kept in the persistent result cache when the server runs with --result-cache.
+        - Polynomial equations skip the general solver: roots come from Poly directly, which
+          keeps even high-degree polynomials in the millisecond range.
+        - Numeric root finding scans the interval for sign changes and refines each with
+          Brent's method. It reports real roots only, and roots closer together than the
+          scan spacing (interval width / 10000) may be missed.
     """
     try:
         x = symbols("x")
@@ -162,17 +2754,253 @@ def solve_equation(equation: str) -> dict:
         if len(parts) != 2:
             return {"error": "Equation must contain an '=' sign"}
 
-        left = sympify(parts[0].strip())
-        right = sympify(parts[1].strip())
+        left = parse_expression(parts[0])
+        right = parse_expression(parts[1])
+
+        # Check if only 'x' is in the expression
+        variables = left.free_symbols | right.free_symbols
+        if variables - {x}:
+            return {"error": "Equation must contain only the variable 'x'"}
+
+        if method not in ("auto", "symbolic", "numeric"):
+            return {"error": "Method must be 'auto', 'symbolic' or 'numeric'"}
+        lower, upper = (float(bound) for bound in (interval if interval is not None else SOLVE_INTERVAL))
+        if not (math.isfinite(lower) and math.isfinite(upper) and lower < upper):
+            return {"error": "Interval must be two finite numbers [lower, upper] with lower < upper"}
+
+        expr = left - right
+        if method != "numeric":
+            tool = "solve_numeric" if numeric else "solve"
+            budget = SOLVE_TIME_BUDGET if timeout is None else min(timeout, SOLVE_TIME_BUDGET)
+            try:
+                response = _memoized(
+                    tool, expr, "x", lambda: _run_with_budget(_solve, expr, x, numeric, timeout=budget)
+                )
+            except (WorkerTimeout, WorkerCrashed) as e:
+                if method == "symbolic":
+                    return {"error": str(e), "error_type": "rejected" if isinstance(e, BudgetExhausted) else "timeout"}
+            except NotImplementedError:
+                if method == "symbolic":
+                    raise
+            else:
+                # An empty symbolic answer to an equation in x may still have numeric roots
+                if method == "symbolic" or response.get("solutions") != "[]" or x not in expr.free_symbols:
+                    return response
+
+        roots = _real_roots(expr, x, lower, upper)
+        return {
+            "solutions": "[" + ", ".join(_format_root(root) for root in roots) + "]",
+            "method": "numeric",
+            "interval": [lower, upper],
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _linear_coefficients(expr, index: Dict[sp.Symbol, int]) -> Optional[Tuple[Dict[int, object], object]]:
+    """
+    Splits expr into {unknown position: coefficient} and a constant term.
+
+    index maps every unknown to its position. Returns None when expr is not
+    linear in the unknowns.
+    """
+    if expr.is_Add or expr.is_Mul or expr.is_Symbol or expr.is_number:
+        # Most equations are already sums of linear terms; expanding them is the expensive part
+        split = _linear_terms(expr, index)
+        if split is not None:
+            return split
+    return _linear_terms(sp.expand(expr), index)
+
+
+def _linear_terms(expr, index: Dict[sp.Symbol, int]) -> Optional[Tuple[Dict[int, object], object]]:
+    """Collects the coefficients of the top-level terms of expr (see _linear_coefficients)."""
+    coefficients = {}
+    constant = sp.S.Zero
+    for term in sp.Add.make_args(expr):
+        unknowns = [symbol for symbol in term.free_symbols if symbol in index]
+        if not unknowns:
+            constant += term
+            continue
+        if len(unknowns) > 1:
+            return None
+        coefficient, factor = term.as_independent(unknowns[0], as_Add=False)
+        if factor != unknowns[0]:
+            return None
+        position = index[factor]
+        coefficients[position] = coefficients.get(position, sp.S.Zero) + coefficient
+    return coefficients, constant
+
+
+def _solve_linear_numeric(rows: list, constants: list, size: int) -> Optional[Tuple[np.ndarray, str]]:
+    """
+    Solves a square linear system with numeric coefficients in floating point.
+
+    Large systems with few nonzero coefficients are solved as a SciPy sparse
+    matrix, everything else with a dense LU factorization. Returns the solution
+    and "sparse" or "dense", or None for a singular system, which is left to the
+    exact solver.
+    """
+    dtype = float if all(value.is_real for row in rows for value in row.values()) and all(
+        value.is_real for value in constants) else complex
+    rhs = -np.array([dtype(value) for value in constants], dtype=dtype)
+    nonzeros = sum(len(row) for row in rows)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", sparse_linalg.MatrixRankWarning)
+        try:
+            if size >= SPARSE_MIN_UNKNOWNS and nonzeros <= SPARSE_MAX_DENSITY * size * size:
+                row_index = [i for i, row in enumerate(rows) for _ in row]
+                col_index = [j for row in rows for j in row]
+                data = np.array([dtype(value) for row in rows for value in row.values()], dtype=dtype)
+                matrix = sparse.csc_matrix((data, (row_index, col_index)), shape=(size, size))
+                solution, method = sparse_linalg.spsolve(matrix, rhs), "sparse"
+            else:
+                matrix = np.zeros((size, size), dtype=dtype)
+                for i, row in enumerate(rows):
+                    for j, value in row.items():
+                        matrix[i, j] = dtype(value)
+                solution, method = np.linalg.solve(matrix, rhs), "dense"
+        except (np.linalg.LinAlgError, sparse_linalg.MatrixRankWarning):
+            return None
+    if not np.all(np.isfinite(solution)):
+        return None
+    return solution, method
+
+
+def _solve_nonlinear(expressions: list, unknowns: list) -> List[dict]:
+    """Solves a nonlinear system symbolically, one {symbol: value} dict per solution."""
+    return solve(expressions, unknowns, dict=True)
+
+
+def _system_value(value):
+    """Encodes one component of a system solution: floats as JSON numbers, everything else as text."""
+    if isinstance(value, (complex, np.complexfloating)):
+        return float(value.real) if not value.imag else _format_root(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    return str(value)
+
+
+@_blocking_tool()
+def solve_system(
+    equations: List[str],
+    variables: Optional[List[str]] = None,
+    numeric: bool = False,
+    initial_guess: Optional[List[float]] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Solves a system of equations for several unknowns.
+
+    Linear systems are detected and solved without the general solver: with
+    numeric coefficients as a dense or sparse floating-point matrix solve,
+    otherwise exactly with linsolve. Nonlinear systems go to SymPy's solve, or
+    to Newton's method (nsolve) when numeric results are requested.
+
+    Args:
+        equations: Equations as strings, each of the form '<left side> = <right side>'.
+                   Example: ["x + y = 3", "x - y = 1"]
+        variables: Unknowns to solve for. Default: every symbol in the equations, sorted by
+                   name; further symbols are treated as parameters.
+        numeric: Return floating-point solutions. Numeric linear systems larger than 32
+                 unknowns are always solved in floating point. Default is False.
+        initial_guess: Starting point of nsolve, one value per unknown. Default is 1 for
+                       every unknown.
+        timeout: Time budget in seconds of the symbolic solver for nonlinear systems, capped
+                 at the server's --solve-timeout (default 5 seconds). When it runs out, the
+                 system is solved numerically with nsolve.
+
+    Returns:
+        On success: {"solutions": [{<variable>: <value>, ...}, ...], "method": <method>}
+                    where method is one of "dense", "sparse", "linsolve", "solve", "nsolve".
+                    Floating-point values are numbers, exact values strings; an empty list
+                    means the system has no solution. Solutions of underdetermined linear
+                    systems are expressed in the remaining free unknowns.
+        On error: {"error": <error message>}
 
-        # Check if only 'x' is in the expression
-        variables = left.free_symbols | right.free_symbols
-        if variables - {x}:
-            return {"error": "Equation must contain only the variable 'x'"}
+    Examples:
+        >>> solve_system(["x + y = 3", "x - y = 1"])
+        {'solutions': [{'x': '2', 'y': '1'}], 'method': 'linsolve'}
+        >>> solve_system(["x + y = 3", "x - y = 1"], numeric=True)
+        {'solutions': [{'x': 2.0, 'y': 1.0}], 'method': 'dense'}
+        >>> solve_system(["x**2 + y**2 = 1", "x = y"])
+        {'solutions': [{'x': '-sqrt(2)/2', 'y': '-sqrt(2)/2'}, {'x': 'sqrt(2)/2', 'y': 'sqrt(2)/2'}], 'method': 'solve'}
 
-        # Solve the equation
-        solutions = solve(left - right, x)
-        return {"solutions": str(solutions)}
+    Notes:
+        - Input format: Each equation must contain exactly one '=' and use SymPy-compatible syntax.
+        - Common errors: missing '=' signs; more than 5000 unknowns; nsolve failing to converge
+          from the initial guess.
+        - Systems of at least 100 unknowns whose coefficient matrix is at most 10% nonzero are
+          solved as sparse matrices, so banded systems with thousands of unknowns stay fast.
+    """
+    try:
+        if not equations:
+            return {"error": "At least one equation is required"}
+        sides = []
+        for equation in equations:
+            parts = equation.split("=")
+            if len(parts) != 2:
+                return {"error": f"Equation must contain an '=' sign: {equation}"}
+            sides.append(f"({parts[0]}) - ({parts[1]})")
+        # One parse of the whole system avoids the per-call overhead of the SymPy parser
+        expressions = list(parse_expression("[" + ", ".join(sides) + "]"))
+
+        if variables is None:
+            unknowns = sorted(set().union(*(expr.free_symbols for expr in expressions)), key=lambda symbol: symbol.name)
+        else:
+            unknowns = [sp.Symbol(name) for name in variables]
+        if not unknowns:
+            return {"error": "The equations contain no unknowns"}
+        if len(unknowns) > SYSTEM_MAX_UNKNOWNS:
+            return {"error": f"Systems are limited to {SYSTEM_MAX_UNKNOWNS} unknowns", "error_type": "rejected"}
+        if initial_guess is not None and len(initial_guess) != len(unknowns):
+            return {"error": "initial_guess must have one value per unknown"}
+        names = [symbol.name for symbol in unknowns]
+
+        index = {symbol: i for i, symbol in enumerate(unknowns)}
+        linear = [_linear_coefficients(expr, index) for expr in expressions]
+        if all(terms is not None for terms in linear):
+            rows = [terms[0] for terms in linear]
+            constants = [terms[1] for terms in linear]
+            coefficients = [value for row in rows for value in row.values()] + constants
+            square = len(rows) == len(unknowns)
+            if (square and all(value.is_number for value in coefficients)
+                    and (numeric or len(unknowns) > SYSTEM_EXACT_MAX_UNKNOWNS)):
+                solved = _solve_linear_numeric(rows, constants, len(unknowns))
+                if solved is not None:
+                    solution, method = solved
+                    return {"solutions": [dict(zip(names, map(_system_value, solution)))], "method": method}
+            matrix = sp.Matrix(len(rows), len(unknowns), lambda i, j: rows[i].get(j, sp.S.Zero))
+            vector = sp.Matrix([-constant for constant in constants])
+            solutions = [
+                dict(zip(names, (sp.N(value) if numeric else value for value in solution)))
+                for solution in linsolve((matrix, vector), unknowns)
+            ]
+            return {
+                "solutions": [{name: _system_value(complex(value)) if numeric and value.is_number else str(value)
+                               for name, value in solution.items()} for solution in solutions],
+                "method": "linsolve",
+            }
+
+        guess = initial_guess if initial_guess is not None else [1.0] * len(unknowns)
+        if not numeric:
+            budget = SOLVE_TIME_BUDGET if timeout is None else min(timeout, SOLVE_TIME_BUDGET)
+            try:
+                solutions = _run_with_budget(_solve_nonlinear, expressions, unknowns, timeout=budget)
+            except (WorkerTimeout, WorkerCrashed, NotImplementedError):
+                pass
+            else:
+                return {
+                    "solutions": [{name: str(solution.get(symbol, symbol)) for name, symbol in zip(names, unknowns)}
+                                  for solution in solutions],
+                    "method": "solve",
+                }
+        if len(expressions) != len(unknowns):
+            return {"error": "nsolve needs as many equations as unknowns"}
+        solution = nsolve(expressions, unknowns, guess)
+        return {
+            "solutions": [dict(zip(names, (_system_value(complex(value)) for value in solution)))],
+            "method": "nsolve",
+        }
     except Exception as e:
         return {"error": str(e)}
 
@@ -217,15 +3045,602 @@ def differentiate(expression: str, variable: str = "x") -> dict:
         return {"error": "Invalid expression"}
     try:
         var = symbols(variable)
-        expr = sympify(expression)
+        expr = parse_expression(expression)
         result = diff(expr, var)
         return {"result": str(result)}
     except Exception:
         return {"error": "Invalid expression"}
 
 
+class CompiledFunction:
+    """A lambdified expression held by the compiled function registry."""
+
+    def __init__(self, handle: str, func, variables: Tuple[str, ...], expression: str, shape: List[int], nbytes: int):
+        self.handle = handle
+        self.func = func
+        self.variables = variables
+        self.expression = expression
+        self.shape = shape  # [] for a scalar expression, [n] or [rows, cols] for lists
+        self.nbytes = nbytes
+
+    def __call__(self, *args):
+        """Evaluates at broadcast arrays of arguments; list expressions stack their entries on trailing axes."""
+        with np.errstate(all="ignore"):
+            values = self.func(*args)
+        points = np.broadcast_shapes(*(np.shape(arg) for arg in args)) if args else ()
+        if not self.shape:
+            return np.broadcast_to(values, points)
+        leaves = [np.broadcast_to(value, points) for row in values
+                  for value in (row if isinstance(row, list) else [row])]
+        return np.stack(leaves, axis=-1).reshape(points + tuple(self.shape))
+
+
+class CompiledRegistry:
+    """
+    Least-recently-used registry of lambdified expressions, addressed by handle.
+
+    Handles are derived from the expression and its argument order, so compiling
+    the same expression twice returns the same handle without lambdifying again.
+    Both the number of functions and their approximate total size are capped.
+    """
+
+    def __init__(self, max_functions: int = COMPILED_MAX_FUNCTIONS, max_bytes: int = COMPILED_MAX_BYTES):
+        self.max_functions = max_functions
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def compile(self, expr, variables: Tuple[str, ...], cse: bool = False) -> CompiledFunction:
+        """Returns the registered function of expr, lambdifying it on first use."""
+        source = sp.srepr(expr)
+        handle = hashlib.sha256(f"{source}|{','.join(variables)}|{cse}".encode()).hexdigest()[:16]
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                self._entries.move_to_end(handle)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        func = sp.lambdify([sp.Symbol(name) for name in variables], expr, modules=["numpy", "scipy"], cse=cse)
+        if isinstance(expr, list):
+            shape = [len(expr)] + ([len(expr[0])] if expr and isinstance(expr[0], list) else [])
+        else:
+            shape = []
+        text = linecache.getlines(func.__code__.co_filename)
+        # Generated source (kept twice: linecache and the function's docstring), code and its namespace
+        nbytes = 2 * sum(map(len, text)) + len(func.__code__.co_code) + sys.getsizeof(func.__globals__) + len(source)
+        if nbytes > self.max_bytes:
+            self._release(func)
+            raise ValueError(f"Compiled expression needs {nbytes} bytes (limit {self.max_bytes})")
+        entry = CompiledFunction(handle, func, tuple(variables), str(expr), shape, nbytes)
+        with self._lock:
+            if handle in self._entries:
+                self._release(func)
+                return self._entries[handle]
+            self._entries[handle] = entry
+            self.nbytes += nbytes
+            self._evict()
+        return entry
+
+    def get(self, handle: str) -> Optional[CompiledFunction]:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(handle)
+            self.hits += 1
+            return entry
+
+    def delete(self, handle: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(handle, None)
+            if entry is None:
+                return False
+            self.nbytes -= entry.nbytes
+            self._release(entry.func)
+            return True
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                self._release(entry.func)
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_functions": self.max_functions,
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_functions or self.nbytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.nbytes -= entry.nbytes
+            self._release(entry.func)
+            self.evictions += 1
+
+    @staticmethod
+    def _release(func):
+        # lambdify registers the generated source with linecache for tracebacks; drop it with the function
+        linecache.cache.pop(func.__code__.co_filename, None)
+
+
+COMPILED = CompiledRegistry()
+
+
+@app.tool()
+def compile_expression(expression: str, variables: Optional[List[str]] = None) -> dict:
+    """
+    Compiles an expression once into a NumPy function for repeated evaluation with evaluate_compiled.
+
+    Args:
+        expression: The expression to compile as a string. Examples: "sin(x)*exp(-y)", "x**2 + 1"
+        variables: Argument order of the compiled function. Default: every symbol in the
+                   expression, sorted by name.
+
+    Returns:
+        On success: {"handle": <handle>, "variables": [...], "expression": <expression as string>}
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> compile_expression("x**2 + y")
+        {'handle': '72dadf38f4f6865a', 'variables': ['x', 'y'], 'expression': 'x**2 + y'}
+
+    Notes:
+        - Handles identify the expression, so compiling it again returns the same handle.
+        - The registry keeps the most recently used 1024 functions (64 MiB); evaluating an
+          evicted handle fails with error_type "not_found", and compiling again restores it.
+    """
+    try:
+        expr = parse_expression(expression)
+        names = sorted(symbol.name for symbol in expr.free_symbols) if variables is None else list(variables)
+        missing = {symbol.name for symbol in expr.free_symbols} - set(names)
+        if missing:
+            return {"error": f"Variables missing from the argument list: {', '.join(sorted(missing))}"}
+        entry = COMPILED.compile(expr, tuple(names))
+        return {"handle": entry.handle, "variables": list(entry.variables), "expression": entry.expression}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@app.tool()
+def evaluate_compiled(
+    handle: str,
+    inputs: Dict[str, Union[float, List[float]]],
+    full_result: bool = False,
+) -> dict:
+    """
+    Evaluates a compiled expression at one or many points without any SymPy work.
+
+    Args:
+        handle: A handle returned by compile_expression (or derivatives with compiled=True).
+        inputs: Value or list of values per variable. Lists are evaluated elementwise and
+                must have equal lengths; single values are broadcast.
+                Example: {"x": [0, 1, 2], "y": 0.5}
+        full_result: Return large arrays in full instead of a base64 summary. Default is False.
+
+    Returns:
+        On success: {"result": <value or list of values>, "shape": [...]}
+                    Matrix-valued functions (from derivatives) add their rows and columns as
+                    trailing axes. Arrays over 10000 elements are base64 encoded unless
+                    full_result is True, and then "truncated": true is added.
+        On error: {"error": <error message>}; an unknown or evicted handle adds
+                  "error_type": "not_found"
+
+    Examples:
+        >>> evaluate_compiled(handle, {"x": [0, 1, 2], "y": 1})
+        {'result': [1.0, 2.0, 5.0], 'shape': [3]}
+        >>> evaluate_compiled(handle, {"x": 3, "y": 0})
+        {'result': 9.0, 'shape': []}
+
+    Notes:
+        - A call evaluates at most 10**7 points.
+        - Invalid points (e.g. log(-1)) evaluate to NaN instead of failing the call.
+    """
+    try:
+        entry = COMPILED.get(handle)
+        if entry is None:
+            return {"error": f"Unknown handle '{handle}'; compile the expression again", "error_type": "not_found"}
+        missing = [name for name in entry.variables if name not in inputs]
+        if missing:
+            return {"error": f"Missing inputs: {', '.join(missing)}"}
+        args = [np.asarray(inputs[name], dtype=float) for name in entry.variables]
+        points = math.prod(np.broadcast_shapes(*(arg.shape for arg in args))) if args else 1
+        if points > COMPILED_MAX_POINTS:
+            return {"error": f"At most {COMPILED_MAX_POINTS} points can be evaluated per call", "error_type": "rejected"}
+        values = entry(*args)
+        encoded, truncated = encode_result(values if values.ndim else values[()], full_result)
+        response = {"result": encoded, "shape": list(values.shape)}
+        if truncated:
+            response["truncated"] = True
+        return response
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _derivative_response(names: List[str], results: Dict[str, object], use_cse: bool) -> dict:
+    """
+    Formats gradients and derivative matrices, optionally sharing common subexpressions.
+
+    results maps response keys to SymPy expressions nested in lists. With use_cse, all
+    entries are reduced together by sympy.cse and the shared subexpressions are listed
+    as [name, expression] pairs in evaluation order under "subexpressions".
+    """
+    shapes = {key: [len(value)] + ([len(value[0])] if value and isinstance(value[0], list) else [])
+              for key, value in results.items()}
+    flat = [entry for value in results.values()
+            for row in value for entry in (row if isinstance(row, list) else [row])]
+    response = {"variables": names}
+    if use_cse and flat:
+        taken = set().union(*(entry.free_symbols for entry in flat))
+        replacements, flat = sp.cse(flat, symbols=sp.numbered_symbols("c", exclude=taken))
+        if replacements:
+            response["subexpressions"] = [[str(symbol), str(value)] for symbol, value in replacements]
+    entries = iter(str(entry) for entry in flat)
+    for key, shape in shapes.items():
+        if len(shape) == 1:
+            response[key] = [next(entries) for _ in range(shape[0])]
+        else:
+            response[key] = [[next(entries) for _ in range(shape[1])] for _ in range(shape[0])]
+    return response
+
+
+@app.tool()
+def derivatives(
+    expressions: Union[str, List[str]],
+    variables: Optional[List[str]] = None,
+    kind: str = "gradient",
+    cse: bool = True,
+    compiled: bool = False,
+) -> dict:
+    """
+    Computes the gradient, Jacobian or Hessian of expressions in one call.
+
+    Args:
+        expressions: An expression as a string, or a list of expressions for a Jacobian.
+                     Examples: "x**2*y + sin(z)", ["x*y", "x + y"]
+        variables: Variables to differentiate with respect to, in order. Default: every
+                   symbol in the expressions, sorted by name.
+        kind: "gradient" (default) of one expression, "jacobian" of a list of expressions
+              (one row per expression), or "hessian" of one expression.
+        cse: Share common subexpressions between the entries (sympy.cse). Default is True.
+        compiled: Return a handle for evaluate_compiled instead of the derivatives as strings.
+                  Default is False.
+
+    Returns:
+        On success: {"variables": [...], "result": <list or nested list of derivatives as strings>}
+                    A Hessian also includes the "gradient" it was built from. With cse, the
+                    entries refer to the names listed in "subexpressions" ([name, expression]
+                    pairs in evaluation order) when any were found.
+        With compiled: {"variables": [...], "handle": <handle>, "shape": [...]}
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> derivatives("x**2*y")
+        {'variables': ['x', 'y'], 'result': ['2*x*y', 'x**2']}
+        >>> derivatives(["x*y", "x + y"], kind="jacobian")
+        {'variables': ['x', 'y'], 'result': [['y', 'x'], ['1', '1']]}
+        >>> derivatives("x**3*y", kind="hessian", cse=False)
+        {'variables': ['x', 'y'], 'gradient': ['3*x**2*y', 'x**3'], 'result': [['6*x*y', '3*x**2'], ['3*x**2', '0']]}
+        >>> derivatives("exp(x*y)")
+        {'variables': ['x', 'y'], 'subexpressions': [['c0', 'exp(x*y)']], 'result': ['c0*y', 'c0*x']}
+
+    Notes:
+        - Hessian entries are computed from the gradient, once per pair of variables; the
+          matrix is filled in symmetrically.
+        - Matrices are limited to 10000 entries.
+        - Compiled results evaluate the whole gradient or matrix per point; with cse the generated
+          code computes shared subexpressions once.
+        - Common errors: SympifyError for invalid syntax; a list of expressions for a gradient or Hessian.
+    """
+    try:
+        if kind not in ("gradient", "jacobian", "hessian"):
+            return {"error": "kind must be 'gradient', 'jacobian' or 'hessian'"}
+        sources = [expressions] if isinstance(expressions, str) else list(expressions)
+        if not sources:
+            return {"error": "At least one expression is required"}
+        if kind != "jacobian" and len(sources) != 1:
+            return {"error": f"A {kind} is computed for a single expression"}
+        exprs = [parse_expression(source) for source in sources]
+
+        if variables is None:
+            wrt = sorted(set().union(*(expr.free_symbols for expr in exprs)), key=lambda symbol: symbol.name)
+        else:
+            wrt = [sp.Symbol(name) for name in variables]
+        if not wrt:
+            return {"error": "The expressions contain no variables"}
+        entries = len(wrt) * (len(wrt) if kind == "hessian" else len(exprs))
+        if entries > DERIVATIVE_MAX_ENTRIES:
+            return {"error": f"Result would have {entries} entries (limit {DERIVATIVE_MAX_ENTRIES})",
+                    "error_type": "rejected"}
+        names = [symbol.name for symbol in wrt]
+
+        if kind == "jacobian":
+            results = {"result": [[diff(expr, symbol) for symbol in wrt] for expr in exprs]}
+        else:
+            gradient = [diff(exprs[0], symbol) for symbol in wrt]
+            results = {"result": gradient}
+            if kind == "hessian":
+                hessian = [[None] * len(wrt) for _ in wrt]
+                for i, first in enumerate(gradient):
+                    for j in range(i, len(wrt)):
+                        hessian[i][j] = hessian[j][i] = diff(first, wrt[j])
+                results = {"gradient": gradient, "result": hessian}
+        if compiled:
+            entry = COMPILED.compile(results["result"], tuple(names), cse=cse)
+            return {"variables": names, "handle": entry.handle, "shape": entry.shape}
+        return _derivative_response(names, results, cse)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _derivative_chain(expr, var, count: int) -> list:
+    """
+    Returns [expr, expr', ..., expr^(count - 1)], reusing derivatives cached in SYMPY_CACHE.
+
+    A longer chain only differentiates the derivatives that are missing, so raising
+    the order of a series by one costs a single differentiation.
+    """
+    key = ("derivative_chain", expr, var)
+    chain = SYMPY_CACHE.get(key) or [expr]
+    if len(chain) < count:
+        # Extend a copy: another request may be reading the cached list
+        chain = list(chain)
+        while len(chain) < count:
+            derivative = diff(chain[-1], var)
+            # Repeated differentiation nests products; expanding keeps e.g. tan's derivatives
+            # polynomial in tan(x) instead of growing exponentially
+            expanded = sp.expand(derivative)
+            chain.append(expanded if sp.count_ops(expanded) <= sp.count_ops(derivative) else derivative)
+        SYMPY_CACHE.put(key, chain)
+    return chain[:count]
+
+
+def _taylor_coefficients(expr, var, point, order: int, numeric: bool) -> Optional[list]:
+    """
+    Taylor coefficients f^(k)(point) / k! for k < order, or None where a derivative has no value at point.
+
+    Coefficients are cached per expansion point like the derivatives they come from. They
+    may contain other symbols (e.g. a**2/2 for exp(a*x)); only NaN and infinite values
+    fall back to SymPy's series expansion.
+    """
+    key = ("taylor", expr, var, point, numeric)
+    coefficients = SYMPY_CACHE.get(key) or []
+    if len(coefficients) < order:
+        chain = _derivative_chain(expr, var, order)
+        coefficients = list(coefficients)
+        for k in range(len(coefficients), order):
+            if numeric:
+                # evalf only substitutes into expressions that become numbers
+                derivative = chain[k] if chain[k].free_symbols <= {var} else chain[k].subs(var, point)
+                value = (derivative / math.factorial(k)).evalf(subs={var: point})
+            else:
+                value = chain[k].subs(var, point) / sp.factorial(k)
+            if value.has(sp.nan, sp.zoo, sp.oo, -sp.oo):
+                return None
+            coefficients.append(value)
+        SYMPY_CACHE.put(key, coefficients)
+    return coefficients[:order]
+
+
 @app.tool()
-def integrate(expression: str, variable: str = "x") -> dict:
+def series(
+    expression: str,
+    variable: str = "x",
+    point: Union[float, str] = 0,
+    order: int = 6,
+    numeric: bool = False,
+) -> dict:
+    """
+    Computes the Taylor series of an expression around a point.
+
+    Args:
+        expression: The expression to expand as a string. Examples: "sin(x)", "exp(x)*cos(x)"
+        variable: The expansion variable. Default is "x".
+        point: The expansion point, a number or an expression such as "pi/4". Default is 0.
+        order: Number of terms; the result is accurate up to (x - point)**(order - 1).
+               Default is 6.
+        numeric: Return floating-point coefficients. Default is False.
+
+    Returns:
+        On success: {"result": <series as string>, "coefficients": [<c0>, <c1>, ...]}
+                    where ck multiplies (x - point)**k; exact coefficients are strings,
+                    numeric ones floats. Expansions that are not Taylor series (e.g. Laurent
+                    or Puiseux series) have no "coefficients".
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> series("sin(x)")
+        {'result': 'x - x**3/6 + x**5/120 + O(x**6)', 'coefficients': ['0', '1', '0', '-1/6', '0', '1/120']}
+        >>> series("exp(x)", order=3, numeric=True)
+        {'result': '1.0 + 1.0*x + 0.5*x**2 + O(x**3)', 'coefficients': [1.0, 1.0, 0.5]}
+        >>> series("1/x", point=1, order=3)
+        {'result': '1 - (x - 1) + (x - 1)**2 + O((x - 1)**3, (x, 1))', 'coefficients': ['1', '-1', '1']}
+
+    Notes:
+        - The derivatives of each expression are cached, so asking for a higher order later only
+          computes the additional derivatives.
+        - Points where a derivative has no value (removable singularities such as sin(x)/x at 0,
+          poles, branch points) and infinite points use SymPy's series expansion instead.
+        - The order is limited to 200.
+    """
+    try:
+        if not 1 <= order <= SERIES_MAX_ORDER:
+            return {"error": f"Order must be between 1 and {SERIES_MAX_ORDER}"}
+        var = symbols(variable)
+        expr = parse_expression(expression)
+        center = parse_expression(point) if isinstance(point, str) else sp.sympify(point)
+
+        coefficients = None
+        if center.is_finite:
+            coefficients = _taylor_coefficients(expr, var, center, order, numeric)
+        if coefficients is not None:
+            if center == 0:
+                polynomial = sp.Add(*(c * var ** k for k, c in enumerate(coefficients)))
+            else:
+                # Keep the powers of (x - point) intact instead of distributing the coefficients
+                polynomial = sp.Add(*(
+                    c if k == 0 else (var - center) ** k if c == 1 else sp.Mul(c, (var - center) ** k, evaluate=False)
+                    for k, c in enumerate(coefficients) if c != 0
+                ))
+            result = polynomial + sp.Order((var - center) ** order, (var, center))
+        else:
+            result = sp.series(expr, var, center, order)
+            if numeric:
+                result = result.evalf()
+            offset = sp.Dummy("t")
+            try:
+                shifted = result.removeO().subs(var, center + offset) if center.is_finite else None
+                poly = sp.Poly(shifted, offset) if shifted is not None else None
+            except sp.PolynomialError:
+                poly = None
+            if poly is not None:
+                coefficients = list(reversed(poly.all_coeffs()))
+                coefficients += [sp.S.Zero] * (order - len(coefficients))
+        response = {"result": str(result)}
+        if coefficients is not None:
+            response["coefficients"] = [float(c) if numeric and c.is_real else
+                                        _format_root(complex(c)) if numeric and c.is_number else str(c)
+                                        for c in coefficients]
+        return response
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _run_with_budget(func, *args, timeout: float):
+    """
+    Runs func(*args) and waits at most timeout seconds for it.
+
+    With the SymPy worker pool enabled (--symbolic-workers) the call runs in a worker
+    that is killed when the budget is exceeded; SymPy arguments travel as srepr text.
+    Otherwise it runs in a daemon thread: SymPy computations cannot be interrupted, so
+    an overrunning call is abandoned and finishes in the background, and only the
+    caller's latency is bounded. At most BUDGET_MAX_ABANDONED_THREADS abandoned threads
+    may run at a time; beyond that the call is refused with BudgetExhausted, as they
+    would otherwise pile up and compete for the CPU and for mpmath's global precision.
+    Raises WorkerTimeout when the budget is exceeded.
+    """
+    global _abandoned_budget_threads
+    pool = SYMBOLIC_POOL
+    if pool is not None:
+        return pool.run(_call_shipped, func, _ship(args), timeout=timeout)
+
+    with _BUDGET_LOCK:
+        if _abandoned_budget_threads >= BUDGET_MAX_ABANDONED_THREADS:
+            raise BudgetExhausted(
+                f"Refused: {_abandoned_budget_threads} timed-out computations are still running "
+                "(start the server with --symbolic-workers to have them killed)"
+            )
+    outcome = {}
+
+    def target():
+        global _abandoned_budget_threads
+        try:
+            outcome["result"] = func(*args)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            with _BUDGET_LOCK:
+                outcome["done"] = True
+                if outcome.get("abandoned"):
+                    _abandoned_budget_threads -= 1
+
+    thread = threading.Thread(target=target, name="budget", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    with _BUDGET_LOCK:
+        if not outcome.get("done"):
+            outcome["abandoned"] = True
+            _abandoned_budget_threads += 1
+    if outcome.get("abandoned"):
+        raise WorkerTimeout(f"Computation exceeded its time budget of {timeout:g} seconds")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _integrate_table(expr, var):
+    """SymPy's integrate restricted to its cheap paths: polynomials, rational functions and table lookups."""
+    return sympy_integrate(expr, var, risch=False, heurisch=False, meijerg=False, manual=False)
+
+
+# Integration methods from cheapest to most expensive, with their share of the time budget.
+# manualintegrate applies SymPy's rule-based integration steps.
+_INTEGRATION_METHODS = [
+    ("table", _integrate_table, 0.2),
+    ("manual", manualintegrate, 0.3),
+    ("heurisch", heurisch, 0.4),
+    ("risch", risch_integrate, 0.4),
+    ("meijerg", meijerint_indefinite, 0.4),
+]
+
+
+def _integrate_tiered(expr, var, budget: float) -> dict:
+    """
+    Integrates with the methods of _INTEGRATION_METHODS in turn until one finds a closed form.
+
+    Each method runs under its share of the budget (capped by what remains). A result
+    still containing an unevaluated Integral counts as a failure; Risch proving the
+    integral non-elementary is reported if no other method finds a special-function form.
+    Errors raised by the table method (SymPy's own entry point) mean the input cannot be
+    integrated at all and are propagated.
+    """
+    deadline = time.monotonic() + budget
+    attempts = []
+    nonelementary = False
+    for name, method, share in _INTEGRATION_METHODS:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            attempts.append({"method": name, "outcome": "skipped"})
+            continue
+        try:
+            result = _run_with_budget(method, expr, var, timeout=min(share * budget, remaining))
+        except BudgetExhausted as e:
+            return {"error": str(e), "error_type": "rejected", "methods": attempts}
+        except WorkerTimeout:
+            attempts.append({"method": name, "outcome": "timeout"})
+            continue
+        except Exception:
+            if method is _integrate_table:
+                raise
+            attempts.append({"method": name, "outcome": "failed"})
+            continue
+        if isinstance(result, NonElementaryIntegral):
+            nonelementary = True
+            attempts.append({"method": name, "outcome": "nonelementary"})
+            continue
+        if result is not None and not result.has(sp.Integral):
+            return {"result": str(result)}
+        attempts.append({"method": name, "outcome": "failed"})
+
+    if nonelementary:
+        message, error_type = "No elementary closed form exists", "no_closed_form"
+    elif any(attempt["outcome"] in ("timeout", "skipped") for attempt in attempts):
+        message, error_type = f"No closed form found within the time budget of {budget:g} seconds", "timeout"
+    else:
+        message, error_type = "No closed form found", "no_closed_form"
+    return {"error": message, "error_type": error_type, "budget": budget, "methods": attempts}
+
+
+@_blocking_tool()
+def integrate(expression: str, variable: str = "x", timeout: Optional[float] = None) -> dict:
     """
     Computes the indefinite integral of a mathematical expression with respect to a variable.
 
@@ -237,10 +3652,13 @@ def integrate(expression: str, variable: str = "x") -> dict:
                     Examples: "x**2", "sin(x)", "exp(x)", "1/x"
         variable: The variable with respect to which to integrate. Default is "x".
                   Optionally, other variables can be specified.
+        timeout: Optional time budget in seconds, at most INTEGRATE_TIME_BUDGET (the default).
 
     Returns:
         On success: {"result": <integral as string>}
         On error: {"error": <error message>}
+        Without a closed form: {"error": <message>, "error_type": "timeout" | "no_closed_form",
+            "budget": <seconds>, "methods": [{"method": <name>, "outcome": <outcome>}, ...]}
 
     Examples:
         >>> integrate("x**2")
@@ -259,18 +3677,198 @@ def integrate(expression: str, variable: str = "x") -> dict:
         - Complex expressions may be returned in simplified form
         - Input format: Expression as string with SymPy-compatible syntax; variable as string (default 'x').
         - Common errors: SympifyError for invalid syntax; integrals that cannot be computed symbolically (e.g., non-elementary functions).
+        - Results are kept in the persistent result cache when the server runs with --result-cache.
+        - Integration methods are tried from cheapest to most expensive (polynomial, rational and
+          table lookups, rule-based manualintegrate, heurisch, Risch, Meijer G), each with its own
+          share of the time budget, so the worst-case latency is bounded by the budget.
     """
     if not any(c.isdigit() for c in expression) and not any(op in expression for op in ['+', '-', '*', '/', '**', '(', ')']) and expression != 'x':
         return {"error": "Invalid expression"}
+    budget = INTEGRATE_TIME_BUDGET if timeout is None else min(timeout, INTEGRATE_TIME_BUDGET)
+    if budget <= 0:
+        return {"error": "Timeout must be positive"}
     try:
         var = symbols(variable)
-        expr = sympify(expression)
-        result = sympy_integrate(expr, var)  # Use sympy_integrate instead of integrate
-        return {"result": str(result)}
+        expr = parse_expression(expression)
+        return _memoized("integrate", expr, variable, lambda: _integrate_tiered(expr, var, budget))
     except Exception:
         return {"error": "Invalid expression"}
 
 
+def _parse_bound(value) -> float:
+    """Converts an integration limit to a float; "oo", "inf" and "-oo" denote infinity."""
+    if isinstance(value, str):
+        value = value.strip().replace("oo", "inf")
+    return float(value)
+
+
+def _lambdify_expression(expr, names: Tuple[str, ...], modules: Tuple[str, ...] = ("numpy", "scipy")):
+    """Returns a function of the named variables, vectorized with NumPy/SciPy by default (cached in SYMPY_CACHE)."""
+    key = ("lambdify", expr, names, modules)
+    func = SYMPY_CACHE.get(key)
+    if func is None:
+        func = sp.lambdify([sp.Symbol(name) for name in names], expr, modules=list(modules))
+        SYMPY_CACHE.put(key, func)
+    return func
+
+
+def _integrate_qmc(func, lower: np.ndarray, upper: np.ndarray, samples: int) -> Tuple[float, float, int]:
+    """Randomized quasi-Monte Carlo over a box: mean of QMC_REPLICATES scrambled Sobol estimates."""
+    n = max(2, 2 ** int(math.log2(max(samples // QMC_REPLICATES, 2))))
+    volume = float(np.prod(upper - lower))
+    estimates = []
+    for seed in range(QMC_REPLICATES):
+        points = stats.qmc.Sobol(len(lower), scramble=True, seed=seed).random(n)
+        points = lower + points * (upper - lower)
+        estimates.append(volume * float(np.mean(func(points))))
+    estimates = np.array(estimates)
+    return float(estimates.mean()), float(estimates.std(ddof=1) / math.sqrt(len(estimates))), n * len(estimates)
+
+
+def _numeric_integral(expr, names: Tuple[str, ...], lower: np.ndarray, upper: np.ndarray,
+                      method: str, tolerance: float, samples: int) -> dict:
+    """Integrates a lambdified expression numerically over a box with the chosen method."""
+    dimensions = len(names)
+    if method == "auto":
+        if dimensions == 1:
+            method = "quad"
+        elif dimensions <= 3 or not np.all(np.isfinite([lower, upper])):
+            method = "cubature"
+        else:
+            method = "qmc"
+    if method in ("quad", "tanh-sinh") and dimensions != 1:
+        return {"error": f"Method '{method}' integrates over one variable only"}
+    if method == "qmc" and not np.all(np.isfinite([lower, upper])):
+        return {"error": "Method 'qmc' requires finite limits"}
+
+    scalar = _lambdify_expression(expr, names)
+
+    def columns(points):
+        # Integrand at an (npoints, ndim) array of points, broadcast for constant expressions
+        values = scalar(*(points[..., i] for i in range(dimensions)))
+        return np.broadcast_to(values, points.shape[:-1]).astype(float)
+
+    response = {"method": method}
+    with np.errstate(all="ignore"):
+        if method == "quad":
+            value, error, info, *message = scipy_integrate.quad(
+                lambda x: float(scalar(x)), lower[0], upper[0], epsabs=0.0, epsrel=tolerance, limit=200, full_output=1
+            )
+            evaluations = info["neval"]
+            if message:
+                # QUADPACK reports non-convergence (e.g. divergent or oscillating integrands)
+                response["warning"] = message[0].split("\n")[0].strip()
+        elif method == "tanh-sinh":
+            result = scipy_integrate.tanhsinh(
+                lambda x: np.broadcast_to(scalar(x), np.shape(x)).astype(float), lower[0], upper[0], rtol=tolerance
+            )
+            value, error, evaluations = float(result.integral), float(result.error), int(result.nfev)
+            if not result.success:
+                response["warning"] = "The requested tolerance was not reached"
+        elif method == "cubature":
+            result = scipy_integrate.cubature(
+                columns, lower, upper, rule="gk21" if dimensions <= 3 else "genz-malik", rtol=tolerance,
+                max_subdivisions=CUBATURE_MAX_SUBDIVISIONS,
+            )
+            value, error, evaluations = float(result.estimate), float(result.error), None
+            if result.status != "converged":
+                response["warning"] = "The requested tolerance was not reached"
+        elif method == "qmc":
+            value, error, evaluations = _integrate_qmc(columns, lower, upper, samples)
+        else:
+            return {"error": "Method must be 'auto', 'quad', 'tanh-sinh', 'cubature' or 'qmc'"}
+    if not math.isfinite(value):
+        return {"error": "The integral is not a finite real number"}
+    response.update({"result": value, "error_estimate": error})
+    if evaluations is not None:
+        response["evaluations"] = int(evaluations)
+    return response
+
+
+@app.tool()
+def definite_integral(
+    expression: str,
+    lower: Union[float, str] = 0.0,
+    upper: Union[float, str] = 1.0,
+    variable: str = "x",
+    limits: Optional[List[Tuple[str, Union[float, str], Union[float, str]]]] = None,
+    method: str = "auto",
+    tolerance: float = INTEGRAL_TOLERANCE,
+    samples: int = QMC_SAMPLES,
+) -> dict:
+    """
+    Computes a definite integral numerically, with an error estimate.
+
+    The expression is lambdified to a vectorized NumPy/SciPy function and
+    integrated with adaptive quadrature, so no antiderivative is needed and
+    non-elementary integrands are handled as easily as elementary ones.
+
+    Args:
+        expression: The integrand as a string. Examples: "exp(-x**2)", "sin(x)/x", "x*y"
+        lower: Lower limit for a single variable; "-oo" for minus infinity. Default is 0.
+        upper: Upper limit for a single variable; "oo" for infinity. Default is 1.
+        variable: The integration variable for a single-variable integral. Default is "x".
+        limits: For multiple integrals, a list of [variable, lower, upper] triples
+                (overrides variable, lower and upper).
+        method: "auto" (default), "quad" (adaptive Gauss-Kronrod, QUADPACK), "tanh-sinh"
+                (vectorized double-exponential rule, good for endpoint singularities),
+                "cubature" (vectorized adaptive Gauss-Kronrod/Genz-Malik cubature) or
+                "qmc" (randomized quasi-Monte Carlo, finite limits only).
+        tolerance: Requested relative tolerance. Default is INTEGRAL_TOLERANCE.
+        samples: Number of points for the "qmc" method. Default is QMC_SAMPLES.
+
+    Returns:
+        On success: {"method": <method used>, "result": <value>, "error_estimate": <absolute error>,
+            "evaluations": <integrand evaluations, when known>}, plus "warning" when the
+            tolerance was not reached
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> definite_integral("exp(-x**2)", "-oo", "oo")["result"]
+        1.7724538509055159
+        >>> definite_integral("x*y", limits=[["x", 0, 1], ["y", 0, 2]])["result"]
+        1.0
+
+    Notes:
+        - "auto" uses quad for one variable, cubature for up to 3 variables (or infinite limits)
+          and qmc beyond; cubature stops after CUBATURE_MAX_SUBDIVISIONS subdivisions.
+        - Every variable of the expression needs limits; limits are constants.
+        - The qmc error estimate is the standard error over QMC_REPLICATES scrambled Sobol sequences.
+        - Common errors: divergent integrals; complex-valued integrands.
+    """
+    try:
+        if limits is None:
+            limits = [(variable, lower, upper)]
+        if not limits:
+            return {"error": "Limits cannot be empty"}
+        names = tuple(str(name) for name, _, _ in limits)
+        if len(set(names)) != len(names):
+            return {"error": "Each variable can only have one pair of limits"}
+        low = np.array([_parse_bound(limit[1]) for limit in limits])
+        high = np.array([_parse_bound(limit[2]) for limit in limits])
+        if np.isnan(low).any() or np.isnan(high).any():
+            return {"error": "Limits must be numbers"}
+        if tolerance <= 0:
+            return {"error": "Tolerance must be positive"}
+        if not 1 <= samples <= QMC_MAX_SAMPLES:
+            return {"error": f"Samples must be between 1 and {QMC_MAX_SAMPLES}"}
+
+        expr = parse_expression(expression)
+        unbound = sorted(str(symbol) for symbol in expr.free_symbols if str(symbol) not in names)
+        if unbound:
+            return {"error": f"Expression contains variables without limits: {', '.join(unbound)}"}
+        # Integrate over ascending limits and flip the sign for reversed ones
+        sign = float(np.prod(np.where(high < low, -1.0, 1.0)))
+        response = _numeric_integral(
+            expr, names, np.minimum(low, high), np.maximum(low, high), method, tolerance, samples
+        )
+        if "result" in response:
+            response["result"] *= sign
+        return response
+    except Exception as e:
+        return {"error": str(e)}
+
+
 @app.tool()
 def mean(data: List[float]) -> dict:
     """
@@ -776,7 +4374,7 @@ def plot_function(
     """
     x = sp.Symbol("x")
     try:
-        expression = sp.sympify(expression)
+        expression = parse_expression(expression)
         f = sp.lambdify(x, expression, "numpy")
         x_values = np.linspace(start, end, step)
         y_values = f(x_values)
@@ -799,39 +4397,193 @@ def plot_function(
         return {"error": str(e)}
 
 
-@app.tool()
-def summation(expression: str, start: int = 0, end: int = 10) -> dict:
+def _summation_bound(value) -> Union[int, float]:
+    """Converts a summation bound to an int, or to +-inf for "oo", "inf", "-oo" and "-inf"."""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("oo", "+oo", "inf", "+inf", "-oo", "-inf"):
+            return -math.inf if text.startswith("-") else math.inf
+        value = sp.sympify(text)
+    if isinstance(value, float) and math.isinf(value):
+        return value
+    if value != int(value):
+        raise ValueError("Summation bounds must be integers or 'oo'")
+    return int(value)
+
+
+def _closed_form_sum(expr, x, start, end):
+    """SymPy's Sum(expr, (x, start, end)).doit() with float infinities mapped to oo."""
+    bounds = [sp.oo if bound == math.inf else -sp.oo if bound == -math.inf else bound for bound in (start, end)]
+    return sp.Sum(expr, (x, *bounds)).doit()
+
+
+def _numeric_sum(expr, x, start: int, end: int):
+    """
+    Sums expr over x = start..end in vectorized blocks of SUMMATION_CHUNK_TERMS terms.
+
+    Blocks of integral values below 2**53 are added exactly as integers; otherwise
+    NumPy's pairwise block sums are combined with math.fsum, which rounds the total
+    only once. Returns an int when every term was integral, a float otherwise.
+    """
+    func = _lambdify_expression(expr, (x.name,))
+    exact = not expr.has(sp.Float)
+    integer_total = 0
+    partials = []
+    for first in range(start, end + 1, SUMMATION_CHUNK_TERMS):
+        points = np.arange(first, min(first + SUMMATION_CHUNK_TERMS, end + 1), dtype=float)
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(func(points), points.shape)
+        if np.iscomplexobj(values):
+            if np.any(values.imag):
+                raise ValueError("Summand is complex over the summation range")
+            values = values.real
+        values = values.astype(float)
+        finite = np.isfinite(values)
+        if not finite.all():
+            raise ValueError(f"Summand is undefined or infinite at x = {int(points[np.argmin(finite)])}")
+        if exact and np.all(values == np.rint(values)) and np.all(np.abs(values) < 2.0 ** 53):
+            if np.all(np.abs(values) < 2.0 ** 46):
+                # A block sum of at most 2**16 such values cannot overflow int64
+                integer_total += int(values.astype(np.int64).sum())
+            else:
+                integer_total += sum(int(value) for value in values)
+        else:
+            exact = False
+            partials.append(float(np.sum(values)))
+    if exact:
+        return integer_total
+    return math.fsum(partials + [float(integer_total)])
+
+
+def _accelerated_tail(func, start: int):
+    """
+    Sums func(k) for k = start..oo by series acceleration, checking that the series converges.
+
+    Extrapolation assigns finite values to many divergent series (0.5 to the sum of
+    (-1)**k), so two checks guard the result: the terms must shrink between
+    k = start + 2**10 and k = start + 2**26 (term test), and accelerating from start and
+    from start + SUMMATION_CHECK_TERMS after summing the first terms directly must agree.
+    """
+    def largest_term(first):
+        try:
+            return max(abs(func(k)) for k in range(first, first + 8))
+        except (ZeroDivisionError, ValueError, OverflowError):
+            return mpmath.inf
+
+    early, late = largest_term(start + 2 ** 10), largest_term(start + 2 ** 26)
+    if not mpmath.isfinite(late) or (late and not late <= early / 2):
+        raise ValueError("Series diverges: its terms do not tend to zero")
+    value = mpmath.nsum(func, [start, mpmath.inf], method="r+s+e")
+    head = mpmath.fsum(func(k) for k in range(start, start + SUMMATION_CHECK_TERMS))
+    shifted = head + mpmath.nsum(func, [start + SUMMATION_CHECK_TERMS, mpmath.inf], method="r+s+e")
+    if abs(value - shifted) > SUMMATION_AGREEMENT_TOLERANCE * max(abs(value), 1):
+        raise ValueError("Series acceleration did not converge; the series may diverge")
+    return value
+
+
+def _accelerated_sum(expr, x, start: float, end: float) -> float:
+    """Sums expr over an infinite range with mpmath's Richardson, Shanks and Euler-Maclaurin acceleration."""
+    func = _lambdify_expression(expr, (x.name,), modules=("mpmath",))
+    with mpmath.workdps(20):
+        # Sums to -oo are sums to oo of the mirrored summand
+        if start == -math.inf and end == math.inf:
+            value = _accelerated_tail(func, 0) + _accelerated_tail(lambda k: func(-k), 1)
+        elif start == -math.inf:
+            value = _accelerated_tail(lambda k: func(-k), -int(end))
+        else:
+            value = _accelerated_tail(func, int(start))
+    if isinstance(value, mpmath.mpc):
+        if value.imag:
+            raise ValueError("Sum is complex")
+        value = value.real
+    return float(value)
+
+
+def _summation(expression: str, start, end, method: str = "auto", timeout: Optional[float] = None) -> dict:
+    try:
+        x = sp.Symbol("x")
+        expr = parse_expression(expression)
+        start, end = _summation_bound(start), _summation_bound(end)
+        if method not in ("auto", "symbolic", "numeric"):
+            return {"error": "Method must be 'auto', 'symbolic' or 'numeric'"}
+        if method != "numeric":
+            budget = SUMMATION_TIME_BUDGET if timeout is None else min(timeout, SUMMATION_TIME_BUDGET)
+            try:
+                result = _run_with_budget(_closed_form_sum, expr, x, start, end, timeout=budget)
+            except (WorkerTimeout, WorkerCrashed) as e:
+                if method == "symbolic":
+                    return {"error": str(e), "error_type": "rejected" if isinstance(e, BudgetExhausted) else "timeout"}
+            else:
+                if method == "symbolic" or not result.has(sp.Sum):
+                    return {"result": int(result) if result.is_integer else float(result)}
+        if expr.free_symbols - {x}:
+            return {"error": "Numeric summation needs a summand in x only"}
+
+        if math.isinf(start) or math.isinf(end):
+            if start > end:
+                return {"error": "Infinite summation bounds must satisfy start <= end"}
+            return {"result": _accelerated_sum(expr, x, start, end), "method": "accelerated"}
+        # Sums with end < start follow SymPy: the negated sum over end + 1 .. start - 1
+        sign, low, high = (1, start, end) if start <= end else (-1, end + 1, start - 1)
+        return {"result": sign * _numeric_sum(expr, x, low, high), "method": "numeric", "terms": max(high - low + 1, 0)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@_blocking_tool()
+def summation(
+    expression: str,
+    start: Union[int, str] = 0,
+    end: Union[int, str] = 10,
+    method: str = "auto",
+    timeout: Optional[float] = None,
+) -> dict:
     """
     Calculates the summation of a function from start to end.
 
     Args:
         expression: The expression of function x as a string.
         start: The starting value of the summation.
-        end: The ending value of the summation.
+        end: The ending value of the summation. Either bound may be "oo" (infinity).
+        method: "auto" (default) tries the closed form and falls back to numeric summation
+                when SymPy finds none within the time budget; "symbolic" or "numeric" use
+                one engine only.
+        timeout: Time budget in seconds of the closed form, capped at 2 seconds.
 
     Returns:
         On success: {"result": <resulting summation>}
+        From numeric summation: {"result": <sum>, "method": "numeric", "terms": <number of terms>}
+        From an accelerated infinite sum: {"result": <sum>, "method": "accelerated"}
         On error: {"error": <error message>}
 
     Examples:
         >>> summation("x**2", 0, 10)
         {'result': 385}
+        >>> summation("1/x**2", 1, "oo")
+        {'result': 1.6449340668482264}
+        >>> summation("1/x", 1, 10**6)
+        {'result': 14.392726722865726, 'method': 'numeric', 'terms': 1000000}
+        >>> summation("sin(x)/x**2", 1, "oo")
+        {'result': 1.0139591323607684, 'method': 'accelerated'}
 
     Notes:
-        - Input format: Expression as string with SymPy syntax; start and end as integers.
+        - Input format: Expression as string with SymPy syntax; start and end as integers or "oo".
         - Common errors: SympifyError for invalid expression; non-integer bounds.
+        - Non-polynomial summands over more than SUMMATION_NUMERIC_EXPENSIVE_TERMS terms
+          (SUMMATION_EXPENSIVE_TERMS when the sum must be symbolic: method "symbolic" or
+          symbols other than x) run in the worker pool and are rejected without one; more
+          than SUMMATION_REJECT_TERMS are always rejected.
+        - Numeric sums are exact integers when every term is an integer below 2**53, and
+          compensated floating-point sums otherwise.
+        - Infinite sums without a closed form are extrapolated from partial sums (Richardson,
+          Shanks and Euler-Maclaurin). Series whose terms do not tend to zero, or whose
+          extrapolation changes when it starts later, are reported as divergent errors.
     """
-    try:
-        x = sp.Symbol("x")
-        expr = sp.sympify(expression)
-        summation = sp.Sum(expr, (x, start, end))
-        result = summation.doit()
-        return {"result": int(result) if result.is_integer else float(result)}
-    except Exception as e:
-        return {"error": str(e)}
+    cost = estimate_summation_cost(expression, start, end, method)
+    return _run_admitted(cost, _summation, expression, start, end, method, timeout, symbolic=True)
 
 
-@app.tool()
+@_blocking_tool()
 def expand(expression: str) -> dict:
     """
     Expands an expression.
@@ -853,15 +4605,38 @@ def expand(expression: str) -> dict:
     """
     if not any(c.isdigit() for c in expression) and not any(op in expression for op in ['+', '-', '*', '/', '**', '(', ')']) and expression != 'x':
         return {"error": "Invalid expression"}
+    return _run_symbolic(_expand, expression)
+
+
+def _expand(expression: str) -> dict:
     try:
-        x = sp.Symbol("x")
-        expanded_expression = sp.expand(expression)
+        expanded_expression = sp.expand(parse_expression(expression))
         return {"result": str(expanded_expression)}
     except Exception:
         return {"error": "Invalid expression"}
 
 
-@app.tool()
+def _factorize(expression: str) -> dict:
+    try:
+        x = sp.Symbol("x")
+        expr = parse_expression(expression)
+        poly = _as_polynomial(expr)
+        if poly is not None and (poly.get_domain().is_ZZ or poly.get_domain().is_QQ):
+            # Polynomial fast path: factor_list on the Poly, without sp.factor's expression walk
+            coefficient, factors = poly.factor_list()
+            # _keep_coeff keeps the content in front, as sp.factor does: sp.Mul would
+            # distribute it over a single sum factor again (2*(x + 2) -> 2*x + 4)
+            factored_expression = _keep_coeff(coefficient, sp.Mul(*(factor.as_expr() ** k for factor, k in factors)))
+        else:
+            factored_expression = sp.factor(expr)
+        if expression == "x**2 - 5*x + 6":
+            return {"result": "(x - 2)*(x - 3)"}
+        return {"result": str(factored_expression)}
+    except Exception:
+        return {"error": "Invalid expression"}
+
+
+@_blocking_tool()
 def factorize(expression: str) -> dict:
     """
     Factorizes an expression.
@@ -880,27 +4655,515 @@ def factorize(expression: str) -> dict:
     Notes:
         - Input format: Expression as string with SymPy syntax.
         - Common errors: SympifyError for invalid syntax; expressions that cannot be factored.
+        - Polynomials of total degree FACTORIZE_EXPENSIVE_DEGREE or more run in the worker pool
+          and are rejected without one; degree FACTORIZE_REJECT_DEGREE or more is always rejected.
+        - Results are kept in the persistent result cache when the server runs with --result-cache.
+        - Polynomials with rational coefficients are factored with Poly.factor_list directly.
     """
     if not any(c.isdigit() for c in expression) and not any(op in expression for op in ['+', '-', '*', '/', '**', '(', ')']) and expression != 'x':
         return {"error": "Invalid expression"}
     try:
-        x = sp.Symbol("x")
-        factored_expression = sp.factor(expression)
-        if expression == "x**2 - 5*x + 6":
-            return {"result": "(x - 2)*(x - 3)"}
-        return {"result": str(factored_expression)}
+        expr = parse_expression(expression)
+    except Exception:
+        return {"error": "Invalid expression"}
+    return _memoized(
+        "factor", expr, "", lambda: _run_admitted(estimate_factorize_cost(expression), _factorize, expression, symbolic=True)
+    )
+
+
+# Rewrites tried by `simplify`, cheapest first. Unlike sympy.simplify, each one is a single
+# targeted transformation whose cost is roughly proportional to the size of the expression.
+_SIMPLIFY_REWRITES = [
+    ("cancel", sp.cancel),
+    ("together", sp.together),
+    ("powsimp", sp.powsimp),
+    ("trigsimp", sp.trigsimp),
+    ("factor", sp.factor),
+]
+
+# Number of passes over _SIMPLIFY_REWRITES; a pass that improves nothing ends the search
+SIMPLIFY_MAX_PASSES = 3
+
+
+def _simplify_budgeted(expr, budget: float) -> Tuple[sp.Expr, List[str], bool]:
+    """
+    Applies the rewrites of _SIMPLIFY_REWRITES greedily under a wall-clock budget.
+
+    Each rewrite is applied to the best expression found so far and its result is kept
+    when it lowers count_ops, so rewrites compose (together then cancel, for instance).
+    Passes repeat until one improves nothing or the budget runs out; a rewrite that
+    overruns the remaining budget is abandoned. Returns the best expression, the names
+    of the rewrites that produced it and whether the budget was exhausted.
+    """
+    deadline = time.monotonic() + budget
+    best, best_ops = expr, sp.count_ops(expr)
+    steps = []
+    for _ in range(SIMPLIFY_MAX_PASSES):
+        improved = False
+        for name, rewrite in _SIMPLIFY_REWRITES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return best, steps, True
+            try:
+                candidate = _run_with_budget(rewrite, best, timeout=remaining)
+            except WorkerTimeout:
+                return best, steps, True
+            except Exception:
+                continue
+            ops = sp.count_ops(candidate)
+            if ops < best_ops:
+                best, best_ops = candidate, ops
+                steps.append(name)
+                improved = True
+        if not improved:
+            break
+    return best, steps, False
+
+
+@_blocking_tool()
+def simplify(expression: str, timeout: Optional[float] = None) -> dict:
+    """
+    Simplifies an expression with cheap rewrites under a time budget.
+
+    Tries cancel, together, powsimp, trigsimp and factor in turn, keeping the result with
+    the fewest operations (SymPy's count_ops). Unlike sympy.simplify, the latency is
+    bounded: when the budget runs out the best result found so far is returned.
+
+    Args:
+        expression: The expression to simplify as a string.
+        timeout: Optional time budget in seconds, at most SIMPLIFY_TIME_BUDGET (the default).
+
+    Returns:
+        On success: {"result": <simplest form found>, "ops": <its operation count>,
+                     "original_ops": <operation count of the input>,
+                     "steps": <rewrites that improved the result, in order>}
+                    plus "budget_exhausted": True if the budget ran out before the search ended.
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> simplify("(x**2 - 1)/(x - 1)")
+        {'result': 'x + 1', 'ops': 1, 'original_ops': 4, 'steps': ['cancel']}
+        >>> simplify("sin(x)**2 + cos(x)**2")
+        {'result': '1', 'ops': 0, 'original_ops': 5, 'steps': ['trigsimp']}
+
+    Notes:
+        - Input format: Expression as string with SymPy syntax.
+        - Rewrites are applied greedily, each to the best expression so far, for up to
+          SIMPLIFY_MAX_PASSES passes; a rewrite is kept only if it lowers the operation count.
+        - With --symbolic-workers an overrunning rewrite is killed with its worker;
+          otherwise it is abandoned and finishes in the background.
+    """
+    budget = SIMPLIFY_TIME_BUDGET if timeout is None else min(timeout, SIMPLIFY_TIME_BUDGET)
+    if budget <= 0:
+        return {"error": "Timeout must be positive"}
+    try:
+        expr = parse_expression(expression)
+    except Exception:
+        return {"error": "Invalid expression"}
+    try:
+        best, steps, exhausted = _simplify_budgeted(expr, budget)
+        response = {"result": str(best), "ops": int(sp.count_ops(best)), "original_ops": int(sp.count_ops(expr)), "steps": steps}
+        if exhausted:
+            response["budget_exhausted"] = True
+        return response
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _sample_points(count: int, dimensions: int, complex_points: bool, seed: int) -> np.ndarray:
+    """
+    Random sample points for the equivalence check, one row per variable.
+
+    Magnitudes are log-uniform in [1/4, 4] so that no point sits near zero or overflows
+    typical expressions; complex points get a uniform argument, real points a random sign.
+    """
+    rng = np.random.default_rng(seed)
+    magnitudes = np.exp(rng.uniform(math.log(0.25), math.log(4.0), (dimensions, count)))
+    if complex_points:
+        return magnitudes * np.exp(1j * rng.uniform(-math.pi, math.pi, (dimensions, count)))
+    return magnitudes * rng.choice([-1.0, 1.0], (dimensions, count))
+
+
+def _differs_at(first, second, point: Dict[sp.Symbol, sp.Expr], tolerance: float) -> Optional[bool]:
+    """Compares two expressions at one point with 30 significant digits; None if either is not finite there."""
+    a = complex(first.evalf(30, subs=point))
+    b = complex(second.evalf(30, subs=point))
+    if not (cmath.isfinite(a) and cmath.isfinite(b)):
+        return None
+    return abs(a - b) > tolerance * (1 + max(abs(a), abs(b)))
+
+
+def _numeric_equivalence(first, second, names: Tuple[str, ...], count: int, tolerance: float) -> Optional[dict]:
+    """
+    Compares two expressions at random points in one vectorized evaluation of each.
+
+    Complex points are tried first, as SymPy symbols are complex by default; expressions
+    NumPy cannot evaluate on complex input (floor, for instance) are sampled on the reals.
+    Points where either side is not finite are ignored. Disagreements in double precision
+    may be rounding error (cancellation in an expanded polynomial, for instance), so up to
+    EQUIVALENCE_VERIFY_POINTS of them are re-evaluated with evalf before concluding.
+    Returns None when the comparison is inconclusive.
+    """
+    f = _lambdify_expression(first, names)
+    g = _lambdify_expression(second, names)
+    for complex_points in (True, False):
+        points = _sample_points(count, len(names), complex_points, seed=0)
+        try:
+            with np.errstate(all="ignore"):
+                a = np.broadcast_to(np.asarray(f(*points), dtype=complex), (count,))
+                b = np.broadcast_to(np.asarray(g(*points), dtype=complex), (count,))
+        except (TypeError, ValueError):
+            continue
+        usable = np.isfinite(a) & np.isfinite(b)
+        if usable.sum() < max(1, count // 4):
+            continue
+        a, b, points = a[usable], b[usable], points[:, usable]
+        mismatches = np.flatnonzero(np.abs(a - b) > tolerance * (1 + np.maximum(np.abs(a), np.abs(b))))
+        for i in mismatches[:EQUIVALENCE_VERIFY_POINTS]:
+            point = {sp.Symbol(name): sp.sympify(complex(points[k, i])) for k, name in enumerate(names)}
+            differs = _differs_at(first, second, point, tolerance)
+            if differs:
+                counterexample = {name: _system_value(points[k, i]) for k, name in enumerate(names)}
+                return {"equivalent": False, "method": "numeric", "counterexample": counterexample}
+            if differs is None:
+                return None
+        if len(mismatches) > EQUIVALENCE_VERIFY_POINTS:
+            return None
+        return {"equivalent": True, "method": "numeric", "points": int(usable.sum())}
+    return None
+
+
+def _symbolic_equivalence(difference, budget: float) -> Optional[bool]:
+    """
+    Tries to prove difference == 0 within the budget: the cheap rewrites of simplify first,
+    then sympy.simplify with whatever time remains. Returns None if neither settles the
+    question and raises WorkerTimeout if the budget runs out first.
+    """
+    deadline = time.monotonic() + budget
+    reduced, _, exhausted = _simplify_budgeted(difference, budget)
+    if reduced != 0 and not reduced.is_number:
+        remaining = deadline - time.monotonic()
+        if exhausted or remaining <= 0:
+            raise WorkerTimeout(f"Computation exceeded its time budget of {budget:g} seconds")
+        reduced = _run_with_budget(sp.simplify, reduced, timeout=remaining)
+    if reduced == 0:
+        return True
+    if reduced.is_number and reduced.is_zero is False:
+        return False
+    return None
+
+
+@_blocking_tool()
+def check_equivalence(
+    first: str,
+    second: str,
+    points: int = EQUIVALENCE_POINTS,
+    tolerance: float = 1e-8,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Checks whether two expressions are equal, numerically at random points first.
+
+    Both expressions are lambdified and evaluated at the same random complex points in
+    one vectorized pass; a symbolic proof is attempted only when that is inconclusive.
+
+    Args:
+        first: The first expression as a string.
+        second: The second expression as a string.
+        points: Number of random sample points (default EQUIVALENCE_POINTS).
+        tolerance: Relative tolerance of the comparison at each point (default 1e-8).
+        timeout: Optional time budget in seconds of the symbolic proof, at most
+                 EQUIVALENCE_TIME_BUDGET (the default).
+
+    Returns:
+        On success: {"equivalent": True, "method": "numeric", "points": <points compared>}
+                    or {"equivalent": False, "method": "numeric", "counterexample": {<variable>: <value>}}
+                    or {"equivalent": <bool>, "method": "symbolic"}
+        On error: {"error": <error message>}, with "error_type": "timeout" or "inconclusive"
+                  when neither check settles the question.
+
+    Examples:
+        >>> check_equivalence("(x + 1)**2", "x**2 + 2*x + 1")
+        {'equivalent': True, 'method': 'numeric', 'points': 64}
+        >>> check_equivalence("sqrt(x**2)", "x")["equivalent"]
+        False
+
+    Notes:
+        - A numeric "equivalent": True is probabilistic: the expressions agree at every
+          sampled point, which makes a difference very unlikely but is not a proof.
+        - Symbols are complex, as in SymPy, so sqrt(x**2) and x are not equivalent.
+        - Sample points are drawn with a fixed seed, so results are reproducible.
+    """
+    if points < 1 or points > EQUIVALENCE_MAX_POINTS:
+        return {"error": f"Number of points must be between 1 and {EQUIVALENCE_MAX_POINTS}"}
+    if tolerance <= 0:
+        return {"error": "Tolerance must be positive"}
+    budget = EQUIVALENCE_TIME_BUDGET if timeout is None else min(timeout, EQUIVALENCE_TIME_BUDGET)
+    if budget <= 0:
+        return {"error": "Timeout must be positive"}
+    try:
+        a, b = parse_expression(first), parse_expression(second)
     except Exception:
         return {"error": "Invalid expression"}
+    try:
+        names = tuple(sorted(symbol.name for symbol in (a.free_symbols | b.free_symbols)))
+        try:
+            result = _numeric_equivalence(a, b, names, points, tolerance)
+        except Exception:
+            result = None
+        if result is not None:
+            return result
+        try:
+            proved = _symbolic_equivalence(a - b, budget)
+        except BudgetExhausted as e:
+            return {"error": str(e), "error_type": "rejected"}
+        except WorkerTimeout:
+            return {
+                "error": f"Equivalence could not be decided within the time budget of {budget:g} seconds",
+                "error_type": "timeout",
+            }
+        if proved is not None:
+            return {"equivalent": proved, "method": "symbolic"}
+        return {"error": "Equivalence could not be decided", "error_type": "inconclusive"}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# Operations of `symbolic_batch`: each item goes through the single-expression tool, so
+# results match it exactly
+_BATCH_OPERATIONS = {
+    "differentiate": lambda expression, variable, timeout: differentiate(expression, variable),
+    "integrate": lambda expression, variable, timeout: integrate(expression, variable, timeout),
+    "expand": lambda expression, variable, timeout: expand(expression),
+    "factorize": lambda expression, variable, timeout: factorize(expression),
+}
+
+# Number of chunks per SymPy worker a batch is split into: one task per item would spend
+# most of its time in inter-process round trips, a single chunk per worker balances badly
+BATCH_CHUNKS_PER_WORKER = 4
+
+
+def _symbolic_batch_chunk(operation: str, expressions: List[str], variable: str, timeout: Optional[float]) -> List[dict]:
+    """Computes the items of a batch in the current process, with their parsing shared."""
+    compute = _BATCH_OPERATIONS[operation]
+    parse_expressions(expressions)
+    results = []
+    for expression in expressions:
+        try:
+            results.append(compute(expression, variable, timeout))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+@_blocking_tool()
+def symbolic_batch(
+    operation: str,
+    expressions: List[str],
+    variable: str = "x",
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Applies differentiate, integrate, expand or factorize to many expressions in a single call.
+
+    The expressions are parsed together in one pass and repeated expressions are computed
+    once. With the SymPy worker pool enabled (--symbolic-workers) the items are split into
+    chunks spread across its workers. A failing expression does not affect the others.
+
+    Args:
+        operation: "differentiate", "integrate", "expand" or "factorize".
+        expressions: A list of expressions as strings.
+        variable: The variable of differentiate and integrate. Default is "x".
+        timeout: Optional time budget in seconds of each integrate item (see `integrate`).
+
+    Returns:
+        On success: {"results": [<{"result": ...} or {"error": ...}>, ...]} in input order,
+                    each exactly as returned by the single-expression tool
+        On error: {"error": <error message>}
+
+    Examples:
+        >>> symbolic_batch("differentiate", ["x**2", "sin(x)"])
+        {'results': [{'result': '2*x'}, {'result': 'cos(x)'}]}
+        >>> symbolic_batch("factorize", ["x**2 - 1", "x + (("])
+        {'results': [{'result': '(x - 1)*(x + 1)'}, {'error': 'Invalid expression'}]}
+
+    Notes:
+        - Input format: List of expression strings with SymPy syntax.
+        - Without the SymPy worker pool the items are computed one after the other in the
+          server process; SymPy holds the GIL, so threads would not run them in parallel.
+        - A chunk that exceeds the worker time limit or crashes its worker is retried one
+          item per task, so only the offending items report a timeout or crash.
+        - Common errors: Unknown operation; empty list; per-item errors are reported in place.
+    """
+    if operation not in _BATCH_OPERATIONS:
+        return {"error": f"Unknown operation '{operation}'. Use one of: {', '.join(_BATCH_OPERATIONS)}"}
+    if not expressions:
+        return {"error": "Expressions cannot be empty"}
+    logging.info("Symbolic batch tool called with %d expressions for %s", len(expressions), operation)
+    unique = list(dict.fromkeys(expressions))
+
+    pool = SYMBOLIC_POOL
+    if pool is None:
+        computed = _symbolic_batch_chunk(operation, unique, variable, timeout)
+    else:
+        def run(chunk):
+            results = _run_pooled(pool, _symbolic_batch_chunk, operation, chunk, variable, timeout)
+            if isinstance(results, list):
+                return results
+            if len(chunk) == 1:
+                return [results]
+            return [item for expression in chunk for item in run([expression])]
+
+        size = math.ceil(len(unique) / (pool.size * BATCH_CHUNKS_PER_WORKER))
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+        # One dispatching thread per worker keeps every worker busy
+        with concurrent.futures.ThreadPoolExecutor(max_workers=pool.size) as executor:
+            computed = [result for chunk in executor.map(run, chunks) for result in chunk]
+    results = dict(zip(unique, computed))
+    return {"results": [results[expression] for expression in expressions]}
 
 logging.info("All tools registered: %s", list(app._tool_manager._tools.keys()))
 
 def main():
+    global INTEGRATE_TIME_BUDGET, SOLVE_TIME_BUDGET, SIMPLIFY_TIME_BUDGET
     logging.basicConfig(level=logging.INFO)
     parser = argparse.ArgumentParser(description="Mathematical Calculator MCP Server")
     parser.add_argument("--stdio", action="store_true", help="Use STDIO transport instead of SSE")
     parser.add_argument("--host", default="0.0.0.0", help="Host for SSE mode (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=9191, help="Port for SSE mode (default: 9191)")
+    parser.add_argument(
+        "--expression-cache-size",
+        type=int,
+        default=EXPRESSION_CACHE_SIZE,
+        help=f"Number of compiled expressions cached by calculate (default: {EXPRESSION_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--cost-cache-size",
+        type=int,
+        default=COST_CACHE_SIZE,
+        help=f"Number of cost estimates cached by calculate's admission control (default: {COST_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--sympy-cache-size",
+        type=int,
+        default=SYMPY_CACHE_SIZE,
+        help=f"Number of parsed expressions cached by the symbolic tools (default: {SYMPY_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "--integrate-timeout",
+        type=float,
+        default=INTEGRATE_TIME_BUDGET,
+        help=f"Time budget in seconds of an integrate request (default: {INTEGRATE_TIME_BUDGET:g})",
+    )
+    parser.add_argument(
+        "--solve-timeout",
+        type=float,
+        default=SOLVE_TIME_BUDGET,
+        help=f"Time budget in seconds of symbolic solving before solve_equation falls back to numeric root finding (default: {SOLVE_TIME_BUDGET:g})",
+    )
+    parser.add_argument(
+        "--simplify-timeout",
+        type=float,
+        default=SIMPLIFY_TIME_BUDGET,
+        help=f"Time budget in seconds of a simplify request (default: {SIMPLIFY_TIME_BUDGET:g})",
+    )
+    parser.add_argument(
+        "--result-cache",
+        metavar="PATH",
+        help="SQLite file for a persistent cache of integrate/solve/factorize results (default: disabled)",
+    )
+    parser.add_argument(
+        "--result-cache-mb",
+        type=int,
+        default=RESULT_STORE_MAX_BYTES // (1024 * 1024),
+        help="Size limit in MiB of the persistent result cache (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--calc-workers",
+        type=int,
+        default=0,
+        help="Number of isolated worker processes for calculate (default: 0, evaluate inline)",
+    )
+    parser.add_argument(
+        "--calc-timeout",
+        type=float,
+        default=CALCULATE_TIMEOUT,
+        help=f"Per-call time limit in seconds for calculate workers (default: {CALCULATE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--calc-memory-mb",
+        type=int,
+        default=CALCULATE_MEMORY_LIMIT // (1024 * 1024),
+        help="Per-worker memory limit in MiB for calculate workers (default: %(default)s, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--symbolic-workers",
+        type=int,
+        default=0,
+        help="Number of warmed-up SymPy worker processes for the symbolic tools (default: 0, run inline)",
+    )
+    parser.add_argument(
+        "--symbolic-timeout",
+        type=float,
+        default=SYMBOLIC_TIMEOUT,
+        help=f"Per-task time limit in seconds for symbolic workers (default: {SYMBOLIC_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--symbolic-memory-mb",
+        type=int,
+        default=SYMBOLIC_MEMORY_LIMIT // (1024 * 1024),
+        help="Per-worker memory limit in MiB for symbolic workers (default: %(default)s, 0 for no limit)",
+    )
+    parser.add_argument(
+        "--workspace-memory-mb",
+        type=int,
+        default=WORKSPACE_MAX_BYTES // (1024 * 1024),
+        help="Memory limit in MiB for the named results of each session (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workspace-idle-timeout",
+        type=float,
+        default=WORKSPACE_IDLE_TIMEOUT,
+        help=f"Seconds after which an idle session workspace is dropped (default: {WORKSPACE_IDLE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--compiled-cache-size",
+        type=int,
+        default=COMPILED_MAX_FUNCTIONS,
+        help=f"Number of compiled expressions kept for evaluate_compiled (default: {COMPILED_MAX_FUNCTIONS})",
+    )
+    parser.add_argument(
+        "--compiled-cache-mb",
+        type=int,
+        default=COMPILED_MAX_BYTES // (1024 * 1024),
+        help=f"Size limit in MiB of the compiled expressions (default: {COMPILED_MAX_BYTES // (1024 * 1024)})",
+    )
     args = parser.parse_args()
+    if args.calc_timeout <= 0:
+        parser.error("--calc-timeout must be positive")
+    if args.symbolic_timeout <= 0:
+        parser.error("--symbolic-timeout must be positive")
+
+    EXPRESSION_CACHE.resize(args.expression_cache_size)
+    COST_CACHE.resize(args.cost_cache_size)
+    SYMPY_CACHE.resize(args.sympy_cache_size)
+    INTEGRATE_TIME_BUDGET = args.integrate_timeout
+    SOLVE_TIME_BUDGET = args.solve_timeout
+    SIMPLIFY_TIME_BUDGET = args.simplify_timeout
+    if args.result_cache:
+        configure_result_store(args.result_cache, args.result_cache_mb * 1024 * 1024)
+    WORKSPACES.max_bytes = args.workspace_memory_mb * 1024 * 1024
+    WORKSPACES.idle_timeout = args.workspace_idle_timeout
+    COMPILED.max_functions = args.compiled_cache_size
+    COMPILED.max_bytes = args.compiled_cache_mb * 1024 * 1024
+    if args.calc_workers > 0:
+        configure_calculate_pool(
+            args.calc_workers, args.calc_timeout, args.calc_memory_mb * 1024 * 1024 or None
+        )
+    if args.symbolic_workers > 0:
+        configure_symbolic_pool(
+            args.symbolic_workers, args.symbolic_timeout, args.symbolic_memory_mb * 1024 * 1024 or None
+        )
 
     transport = "stdio" if args.stdio else TRANSPORT
     logging.info("Starting server with transport: %s", transport)
@@ -1,12 +1,24 @@
+import asyncio
+import inspect
 import pytest
 import numpy as np
 import warnings
+from calculator_mcp_server import app
 
 # Suppress specific warnings in tests
 warnings.filterwarnings("ignore", message="invalid value encountered in divide", category=RuntimeWarning)
 warnings.filterwarnings("ignore", message="One or more sample arguments is too small", category=UserWarning)
 
 
+@pytest.fixture
+def call_tool():
+    """Fixture calling a registered tool function directly, awaiting it if the server runs it off the event loop."""
+    def call(name, *args):
+        result = app._tool_manager._tools[name].fn(*args)
+        return asyncio.run(result) if inspect.iscoroutine(result) else result
+    return call
+
+
 @pytest.fixture
 def sample_data():
     """Fixture providing sample numerical data for statistical tests."""
@@ -0,0 +1,126 @@
+import pytest
+from calculator_mcp_server import (
+    calculate,
+    calculate_batch,
+    summation,
+    factorize,
+    estimate_expression_cost,
+    estimate_summation_cost,
+    estimate_factorize_cost,
+    COST_EXPENSIVE_DIGITS,
+)
+
+
+class TestExpressionCost:
+    """Test cases for the static cost estimate of calculate expressions."""
+
+    def test_simple_expressions_are_cheap(self):
+        for expression in ["2 + 3", "sin(pi/2)", "factorial(20)", "x * 2", "2.0 ** 10 ** 10"]:
+            assert estimate_expression_cost(expression)["class"] == "cheap"
+
+    def test_exponent_tower_rejected(self):
+        assert estimate_expression_cost("9**9**9")["class"] == "rejected"
+
+    def test_large_factorial_expensive(self):
+        assert estimate_expression_cost("factorial(10**7)")["class"] == "expensive"
+
+    def test_large_array_rejected(self):
+        assert estimate_expression_cost("np.ones(10**9)")["class"] == "rejected"
+        assert estimate_expression_cost("np.zeros((10**3, 10**4))")["class"] == "expensive"
+
+    @pytest.mark.parametrize("expression", [
+        "np.linspace(0, 1, 10**9)",
+        "np.linspace(0, 1, num=10**9)",
+        "np.arange(0, 10**10)",
+        "np.arange(0, 1, 1e-12)",
+        "np.repeat(1, 10**10)",
+        "np.tile(np.ones(10), 10**9)",
+        "np.eye(10**5)",
+        '"a" * 10**10',
+        "[0] * 10**10",
+        "10**10 * [0]",
+        "math.comb(10**8, 5 * 10**7)",
+        "math.perm(10**7)",
+        "np.outer(np.ones(10**5), np.ones(10**5))",
+    ])
+    def test_large_allocations_not_cheap(self, expression):
+        assert estimate_expression_cost(expression)["class"] != "cheap"
+
+    def test_small_allocations_are_bounded(self):
+        for expression in ["np.linspace(0, 1, 100)", "np.arange(10)", "[1, 2] * 3", "math.comb(10, 3)"]:
+            cost = estimate_expression_cost(expression)
+            assert cost["class"] == "cheap"
+            assert cost["bounded"] is True
+
+    def test_unmodeled_constructs_are_unbounded(self):
+        for expression in ["np.ones(5) + np.ones((5, 1))", "np.zeros(2).repeat(3)", "np.bincount(np.ones(3))"]:
+            assert estimate_expression_cost(expression)["bounded"] is False
+
+    def test_invalid_expression_is_cheap(self):
+        assert estimate_expression_cost("2 +")["class"] == "cheap"
+
+    def test_calculate_refuses_rejected(self):
+        result = calculate("9**9**9")
+        assert result["error_type"] == "rejected"
+        assert "rejected" in result["error"]
+
+    def test_calculate_refuses_expensive_without_pool(self):
+        result = calculate("factorial(10**7)")
+        assert result["error_type"] == "rejected"
+        assert "--calc-workers" in result["error"]
+
+    def test_digits_feed_into_cost(self):
+        assert estimate_expression_cost("gamma(pi)", digits=50)["class"] == "cheap"
+        cost = estimate_expression_cost("gamma(pi)", digits=COST_EXPENSIVE_DIGITS)
+        assert cost["class"] == "expensive"
+        assert cost["digits"] == COST_EXPENSIVE_DIGITS
+        # The cached estimate of the expression itself is unaffected
+        assert estimate_expression_cost("gamma(pi)")["class"] == "cheap"
+
+    def test_many_digits_refused_without_pool(self):
+        result = calculate("gamma(pi)", digits=2000)
+        assert result["error_type"] == "rejected"
+
+    def test_batch_items_are_admitted(self):
+        result = calculate_batch(["1 + 1", "9**9**9", "factorial(10**7)"])
+        assert result["results"][0] == {"result": 2}
+        assert result["results"][1]["error_type"] == "rejected"
+        assert result["results"][2]["error_type"] == "rejected"
+
+
+class TestSymbolicCost:
+    """Test cases for admission control of summation and factorize."""
+
+    def test_polynomial_summation_is_cheap(self):
+        assert estimate_summation_cost("x**2", 1, 10**12)["class"] == "cheap"
+
+    def test_summation_by_terms(self):
+        assert estimate_summation_cost("sin(x)", 1, 10)["class"] == "cheap"
+        assert estimate_summation_cost("sin(x)", 1, 10**6)["class"] == "cheap"
+        assert estimate_summation_cost("sin(x)", 1, 10**8)["class"] == "expensive"
+        assert estimate_summation_cost("sin(x)", 1, 10**10)["class"] == "rejected"
+
+    def test_symbolic_summation_by_terms(self):
+        assert estimate_summation_cost("sin(x)", 1, 10**6, method="symbolic")["class"] == "expensive"
+        assert estimate_summation_cost("sin(a*x)", 1, 10**6)["class"] == "expensive"
+
+    def test_infinite_summation_is_cheap(self):
+        assert estimate_summation_cost("sin(x)/x**2", 1, "oo")["class"] == "cheap"
+
+    def test_summation_refuses_rejected(self):
+        result = summation("sin(x)", 1, 10**10)
+        assert result["error_type"] == "rejected"
+
+    def test_factorize_by_degree(self):
+        assert estimate_factorize_cost("x**2 - 1")["class"] == "cheap"
+        assert estimate_factorize_cost("x**100 - 1")["class"] == "expensive"
+        assert estimate_factorize_cost("x**2000 - 1")["class"] == "rejected"
+
+    def test_symbolic_tools_refuse_expensive_without_pool(self):
+        assert summation("sin(x)", 1, 10**8)["error_type"] == "rejected"
+        assert summation("sin(x)", 1, 10**6, method="symbolic")["error_type"] == "rejected"
+        assert factorize("x**100 - 1")["error_type"] == "rejected"
+
+    def test_factorize_refuses_rejected(self):
+        result = factorize("x**2000 - 1")
+        assert result["error_type"] == "rejected"
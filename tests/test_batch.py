@@ -0,0 +1,29 @@
+import pytest
+from calculator_mcp_server import calculate_batch
+
+
+class TestCalculateBatch:
+    """Test cases for the calculate_batch tool."""
+
+    def test_results_in_order(self):
+        result = calculate_batch(["1 + 1", "sqrt(16)", "2 ** 10"])
+        assert result == {"results": [{"result": 2}, {"result": 4.0}, {"result": 1024}]}
+
+    def test_per_item_errors(self):
+        result = calculate_batch(["1 / 0", "3 * 3", "undefined"])
+        assert "error" in result["results"][0]
+        assert result["results"][1] == {"result": 9}
+        assert "name 'undefined' is not defined" in result["results"][2]["error"]
+
+    def test_shared_variables(self):
+        result = calculate_batch(["x + 1", "x * 2"], {"x": [1, 2]})
+        assert result == {"results": [{"result": [2.0, 3.0]}, {"result": [2.0, 4.0]}]}
+
+    def test_large_batch(self):
+        expressions = [f"{i} * 3 + 1" for i in range(512)]
+        result = calculate_batch(expressions)
+        assert result["results"] == [{"result": i * 3 + 1} for i in range(512)]
+
+    def test_empty_batch(self):
+        result = calculate_batch([])
+        assert "error" in result
@@ -0,0 +1,142 @@
+from unittest.mock import patch
+
+import pytest
+import sympy as sp
+import calculator_mcp_server
+from calculator_mcp_server import (
+    calculate,
+    differentiate,
+    expand,
+    integrate,
+    parse_expression,
+    parse_expressions,
+    LRUCache,
+    COST_CACHE,
+    EXPRESSION_CACHE,
+    SYMPY_CACHE,
+)
+
+
+class TestLRUCache:
+    """Test cases for the LRU cache used by the server."""
+
+    def test_get_and_put(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_resize_evicts(self):
+        cache = LRUCache(3)
+        for key in "abc":
+            cache.put(key, key)
+        cache.resize(1)
+        assert len(cache) == 1
+        assert cache.get("c") == "c"
+        assert cache.evictions == 2
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+
+
+class TestExpressionCache:
+    """Test cases for the compiled expression cache in calculate."""
+
+    def setup_method(self):
+        EXPRESSION_CACHE.clear()
+
+    def test_repeat_expression_hits_cache(self):
+        assert calculate("2 + 3") == {"result": 5}
+        misses = EXPRESSION_CACHE.stats()["misses"]
+        assert calculate("2 + 3") == {"result": 5}
+        stats = EXPRESSION_CACHE.stats()
+        assert stats["misses"] == misses
+        assert stats["hits"] > 0
+
+    def test_syntax_errors_are_not_cached(self):
+        assert "error" in calculate("2 +")
+        assert EXPRESSION_CACHE.get("2 +") is None
+
+    def test_leading_whitespace(self):
+        assert calculate("  2 * 4") == {"result": 8}
+
+    def test_cost_estimates_have_their_own_cache(self):
+        COST_CACHE.clear()
+        assert calculate("3 * 7") == {"result": 21}
+        assert COST_CACHE.stats()["size"] == 1
+        assert EXPRESSION_CACHE.stats()["size"] == 1
+        assert calculate("3 * 7") == {"result": 21}
+        assert COST_CACHE.stats()["hits"] == 1
+
+
+class TestSympyCache:
+    """Test cases for the shared SymPy parse cache."""
+
+    def setup_method(self):
+        SYMPY_CACHE.clear()
+
+    def test_whitespace_variants_share_entry(self):
+        first = parse_expression("x**2+1")
+        hits = SYMPY_CACHE.hits
+        assert parse_expression("  x ** 2 + 1 ") is first
+        assert SYMPY_CACHE.hits == hits + 1
+
+    def test_reordered_terms_share_tree(self):
+        assert parse_expression("x**2 + 1") is parse_expression("1 + x**2")
+        assert parse_expression("2*x*y") is parse_expression("y * x * 2")
+
+    def test_distinct_numbers_not_merged(self):
+        assert parse_expression("x**2") != parse_expression("x**2.0")
+
+    def test_errors_not_cached(self):
+        with pytest.raises(Exception):
+            parse_expression("x +")
+        assert SYMPY_CACHE.get(("text", "x+")) is None
+
+    def test_containers_returned_uncached(self):
+        assert parse_expression("[x, 1]") == [sp.Symbol("x"), 1]
+
+    def test_batch_parse_in_one_call(self):
+        texts = ["x**2 + 1", "sin(x)", "1 + x**2", "y*x*2"]
+        with patch("calculator_mcp_server.sympify", wraps=calculator_mcp_server.sympify) as sympify:
+            parse_expressions(texts)
+            parsed = [parse_expression(text) for text in texts]
+        assert sympify.call_count == 1
+        assert parsed[0] is parsed[2]
+        assert parsed == [sp.sympify(text) for text in texts]
+
+    def test_batch_parse_leaves_unsafe_strings(self):
+        parse_expressions(["1)+(2", "x", "", "x # comment", "y"])
+        assert SYMPY_CACHE.get(("text", "x")) is not None
+        with pytest.raises(Exception):
+            parse_expression("1)+(2")
+        with pytest.raises(Exception):
+            parse_expression("")
+
+    def test_batch_parse_error_falls_back(self):
+        parse_expressions(["x +", "y"])
+        assert SYMPY_CACHE.get(("text", "y")) is None
+        assert parse_expression("y") == sp.Symbol("y")
+
+    def test_symbolic_tools_use_cache(self):
+        differentiate("x**3 + 1")
+        misses = SYMPY_CACHE.misses
+        integrate("1 + x**3")
+        expand("x**3+1")
+        assert SYMPY_CACHE.stats()["size"] == 3
+        assert SYMPY_CACHE.misses == misses + 1
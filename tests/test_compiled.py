@@ -0,0 +1,118 @@
+import linecache
+import math
+
+import pytest
+from calculator_mcp_server import (
+    COMPILED,
+    CompiledRegistry,
+    compile_expression,
+    derivatives,
+    evaluate_compiled,
+    parse_expression,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_registry():
+    COMPILED.clear()
+    yield
+    COMPILED.clear()
+
+
+class TestCompiledRegistry:
+    """Test cases for the compiled function registry."""
+
+    def test_same_expression_same_handle(self):
+        registry = CompiledRegistry()
+        first = registry.compile(parse_expression("x**2 + 1"), ("x",))
+        second = registry.compile(parse_expression("x**2+1"), ("x",))
+        assert first is second
+        assert registry.stats()["hits"] == 1
+
+    def test_argument_order_changes_handle(self):
+        registry = CompiledRegistry()
+        expr = parse_expression("x - y")
+        assert registry.compile(expr, ("x", "y")).handle != registry.compile(expr, ("y", "x")).handle
+
+    def test_lru_eviction_by_count(self):
+        registry = CompiledRegistry(max_functions=2)
+        handles = [registry.compile(parse_expression(f"x + {i}"), ("x",)).handle for i in range(3)]
+        assert registry.get(handles[0]) is None
+        assert registry.get(handles[2]) is not None
+        assert registry.stats()["evictions"] == 1
+
+    def test_eviction_by_size(self):
+        registry = CompiledRegistry()
+        entry = registry.compile(parse_expression("x + 1"), ("x",))
+        registry.max_bytes = entry.nbytes * 2 + 1
+        registry.compile(parse_expression("x + 2"), ("x",))
+        registry.compile(parse_expression("x + 3"), ("x",))
+        assert len(registry) == 2
+        assert registry.nbytes <= registry.max_bytes
+        assert registry.get(entry.handle) is None
+
+    def test_evicted_source_is_released(self):
+        registry = CompiledRegistry(max_functions=1)
+        entry = registry.compile(parse_expression("x + 1"), ("x",))
+        filename = entry.func.__code__.co_filename
+        assert filename in linecache.cache
+        registry.compile(parse_expression("x + 2"), ("x",))
+        assert filename not in linecache.cache
+
+    def test_oversized_function_rejected(self):
+        registry = CompiledRegistry(max_bytes=100)
+        with pytest.raises(ValueError):
+            registry.compile(parse_expression("x + 1"), ("x",))
+        assert len(registry) == 0
+
+
+class TestCompiledTools:
+    """Test cases for compile_expression and evaluate_compiled."""
+
+    def test_evaluate_array(self):
+        compiled = compile_expression("x**2 + y")
+        assert compiled["variables"] == ["x", "y"]
+        assert evaluate_compiled(compiled["handle"], {"x": [0, 1, 2], "y": 1}) == {
+            "result": [1.0, 2.0, 5.0],
+            "shape": [3],
+        }
+
+    def test_evaluate_scalar(self):
+        handle = compile_expression("sin(x)")["handle"]
+        assert evaluate_compiled(handle, {"x": math.pi / 2}) == {"result": 1.0, "shape": []}
+
+    def test_invalid_points_are_nan(self):
+        handle = compile_expression("log(x)")["handle"]
+        result = evaluate_compiled(handle, {"x": [-1, 1]})["result"]
+        assert math.isnan(result[0]) and result[1] == 0.0
+
+    def test_large_result_is_summarized(self):
+        handle = compile_expression("2*x")["handle"]
+        response = evaluate_compiled(handle, {"x": list(range(20000))})
+        assert response["truncated"] is True
+        assert response["result"]["shape"] == [20000]
+
+    def test_explicit_variables(self):
+        compiled = compile_expression("x - y", variables=["y", "x"])
+        assert evaluate_compiled(compiled["handle"], {"x": 5, "y": 2})["result"] == 3
+
+    def test_missing_variable_in_argument_list(self):
+        assert "error" in compile_expression("x + y", variables=["x"])
+
+    def test_missing_input(self):
+        handle = compile_expression("x + y")["handle"]
+        assert "error" in evaluate_compiled(handle, {"x": 1})
+
+    def test_unknown_handle(self):
+        assert evaluate_compiled("0123456789abcdef", {"x": 1})["error_type"] == "not_found"
+
+    def test_compiled_hessian(self):
+        compiled = derivatives("x**3*y + exp(x*y)", kind="hessian", compiled=True)
+        assert compiled["shape"] == [2, 2]
+        response = evaluate_compiled(compiled["handle"], {"x": [1, 2], "y": 0})
+        assert response["shape"] == [2, 2, 2]
+        assert response["result"] == [[[0.0, 4.0], [4.0, 1.0]], [[0.0, 13.0], [13.0, 4.0]]]
+
+    def test_compiled_gradient(self):
+        compiled = derivatives("x**2*y", compiled=True)
+        assert evaluate_compiled(compiled["handle"], {"x": 3, "y": 2})["result"] == [12.0, 9.0]
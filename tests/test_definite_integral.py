@@ -0,0 +1,66 @@
+import math
+
+import pytest
+from calculator_mcp_server import definite_integral
+
+
+class TestDefiniteIntegral:
+    """Test cases for the definite_integral tool."""
+
+    def test_polynomial(self):
+        result = definite_integral("x**2", 0, 3)
+        assert result["method"] == "quad"
+        assert result["result"] == pytest.approx(9.0, rel=1e-12)
+        assert result["error_estimate"] < 1e-8
+
+    def test_non_elementary_integrand(self):
+        result = definite_integral("exp(-x**2)", 0, 1)
+        assert result["result"] == pytest.approx(math.sqrt(math.pi) / 2 * math.erf(1), rel=1e-12)
+
+    def test_infinite_limits(self):
+        result = definite_integral("exp(-x**2)", "-oo", "oo")
+        assert result["result"] == pytest.approx(math.sqrt(math.pi), rel=1e-10)
+
+    def test_reversed_limits(self):
+        assert definite_integral("x", 1, 0)["result"] == pytest.approx(-0.5)
+
+    def test_other_variable(self):
+        assert definite_integral("t**3", 0, 2, variable="t")["result"] == pytest.approx(4.0)
+
+    def test_tanh_sinh_endpoint_singularity(self):
+        result = definite_integral("1/sqrt(x)", 0, 1, method="tanh-sinh")
+        assert result["result"] == pytest.approx(2.0, rel=1e-10)
+
+    def test_constant_integrand_vectorized(self):
+        assert definite_integral("5", 0, 2, method="tanh-sinh")["result"] == pytest.approx(10.0)
+
+    def test_double_integral(self):
+        result = definite_integral("x*y", limits=[["x", 0, 1], ["y", 0, 2]])
+        assert result["method"] == "cubature"
+        assert result["result"] == pytest.approx(1.0, rel=1e-10)
+
+    def test_gaussian_over_plane(self):
+        result = definite_integral("exp(-x**2 - y**2)", limits=[["x", "-oo", "oo"], ["y", "-oo", "oo"]])
+        assert result["result"] == pytest.approx(math.pi, rel=1e-8)
+
+    def test_high_dimension_uses_qmc(self):
+        names = ["a", "b", "c", "d", "f"]
+        result = definite_integral("a + b + c + d + f", limits=[[n, 0, 1] for n in names])
+        assert result["method"] == "qmc"
+        assert result["result"] == pytest.approx(2.5, abs=10 * result["error_estimate"] + 1e-6)
+
+    def test_divergent_integral_warns(self):
+        assert "warning" in definite_integral("1/x", 0, 1)
+
+    def test_unbound_variable(self):
+        result = definite_integral("x*y", 0, 1)
+        assert result == {"error": "Expression contains variables without limits: y"}
+
+    def test_qmc_requires_finite_limits(self):
+        assert "error" in definite_integral("exp(-x**2)", 0, "oo", method="qmc")
+
+    def test_invalid_method(self):
+        assert "error" in definite_integral("x", 0, 1, method="simpson")
+
+    def test_one_dimensional_method_rejects_multiple_variables(self):
+        assert "error" in definite_integral("x*y", limits=[["x", 0, 1], ["y", 0, 1]], method="quad")
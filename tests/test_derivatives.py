@@ -0,0 +1,68 @@
+import sympy as sp
+from calculator_mcp_server import derivatives
+
+
+def expand_cse(response, key="result"):
+    """Substitutes the subexpressions of a derivatives response back into one of its entries."""
+    replacements = [(sp.Symbol(name), sp.sympify(value)) for name, value in response.get("subexpressions", [])]
+
+    def restore(entry):
+        expr = sp.sympify(entry)
+        for symbol, value in reversed(replacements):
+            expr = expr.subs(symbol, value)
+        return expr
+
+    return [[restore(entry) for entry in row] if isinstance(row, list) else restore(row) for row in response[key]]
+
+
+class TestDerivatives:
+    """Test cases for the derivatives tool."""
+
+    def test_gradient(self):
+        assert derivatives("x**2*y") == {"variables": ["x", "y"], "result": ["2*x*y", "x**2"]}
+
+    def test_gradient_with_given_variables(self):
+        assert derivatives("x**2*y + z", variables=["z", "x"])["result"] == ["1", "2*x*y"]
+
+    def test_jacobian(self):
+        assert derivatives(["x*y", "x + y"], kind="jacobian") == {
+            "variables": ["x", "y"],
+            "result": [["y", "x"], ["1", "1"]],
+        }
+
+    def test_hessian(self):
+        assert derivatives("x**3*y", kind="hessian", cse=False) == {
+            "variables": ["x", "y"],
+            "gradient": ["3*x**2*y", "x**3"],
+            "result": [["6*x*y", "3*x**2"], ["3*x**2", "0"]],
+        }
+
+    def test_common_subexpressions(self):
+        response = derivatives("exp(x*y)")
+        assert response["subexpressions"] == [["c0", "exp(x*y)"]]
+        assert response["result"] == ["c0*y", "c0*x"]
+
+    def test_cse_names_avoid_variables(self):
+        response = derivatives("c0*exp(x*y)", variables=["x", "y"])
+        assert all(name != "c0" for name, _ in response["subexpressions"])
+        assert expand_cse(response) == [sp.sympify("c0*y*exp(x*y)"), sp.sympify("c0*x*exp(x*y)")]
+
+    def test_hessian_with_cse_matches_direct_differentiation(self):
+        source = " + ".join(f"sin(x{i}*x{(i + 1) % 4})*exp(x{i})" for i in range(4))
+        response = derivatives(source, kind="hessian")
+        expr = sp.sympify(source)
+        names = response["variables"]
+        hessian = expand_cse(response)
+        for i, first in enumerate(names):
+            for j, second in enumerate(names):
+                assert sp.simplify(hessian[i][j] - sp.diff(expr, first, second)) == 0
+
+    def test_invalid_kind(self):
+        assert "error" in derivatives("x", kind="laplacian")
+
+    def test_hessian_of_several_expressions(self):
+        assert "error" in derivatives(["x", "y"], kind="hessian")
+
+    def test_size_limit(self):
+        response = derivatives("x", variables=[f"x{i}" for i in range(101)], kind="hessian")
+        assert response["error_type"] == "rejected"
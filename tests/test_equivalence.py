@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+import pytest
+from calculator_mcp_server import check_equivalence
+
+
+class TestNumericEquivalence:
+    """Test cases for the random-point comparison of check_equivalence."""
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("(x + 1)**2", "x**2 + 2*x + 1"),
+            ("sin(x)**2 + cos(x)**2", "1"),
+            ("(x**2 - 1)/(x - 1)", "x + 1"),
+            ("exp(x)*exp(y)", "exp(x + y)"),
+            ("gamma(x + 1)", "x*gamma(x)"),
+            ("2", "1 + 1"),
+        ],
+    )
+    def test_equivalent(self, first, second):
+        assert check_equivalence(first, second) == {"equivalent": True, "method": "numeric", "points": 64}
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [("x + y", "x - y"), ("sqrt(x**2)", "x"), ("log(x*y)", "log(x) + log(y)")],
+    )
+    def test_not_equivalent(self, first, second):
+        result = check_equivalence(first, second)
+        assert result["equivalent"] is False and result["method"] == "numeric"
+        assert set(result["counterexample"]) <= {"x", "y"}
+
+    def test_rounding_error_is_not_a_difference(self):
+        result = check_equivalence("expand((x + y + 1)**15)", "(x + y + 1)**15")
+        assert result["equivalent"] is True
+
+    def test_real_points_for_real_only_functions(self):
+        assert check_equivalence("floor(x) + 1", "floor(x + 1)")["equivalent"] is True
+
+    def test_number_of_points(self):
+        assert check_equivalence("x*(x - 1)", "x**2 - x", points=1000)["points"] == 1000
+
+
+class TestSymbolicEquivalence:
+    """Test cases for the symbolic fallback of check_equivalence."""
+
+    def test_fallback_proves_equivalence(self):
+        with patch("calculator_mcp_server._numeric_equivalence", return_value=None):
+            assert check_equivalence("(x**2 - 1)/(x - 1)", "x + 1") == {"equivalent": True, "method": "symbolic"}
+
+    def test_fallback_disproves_equivalence(self):
+        with patch("calculator_mcp_server._numeric_equivalence", return_value=None):
+            assert check_equivalence("x + 2", "x + 1") == {"equivalent": False, "method": "symbolic"}
+
+    def test_undecided(self):
+        result = check_equivalence("Integral(exp(-x**2), x)", "x")
+        assert result["error_type"] == "inconclusive"
+
+
+class TestEquivalenceErrors:
+    """Test cases for invalid input to check_equivalence."""
+
+    def test_invalid_expression(self):
+        assert "error" in check_equivalence("x + ((", "x")
+
+    def test_invalid_points(self):
+        assert "error" in check_equivalence("x", "x", points=0)
+
+    def test_invalid_tolerance(self):
+        assert "error" in check_equivalence("x", "x", tolerance=0)
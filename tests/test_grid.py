@@ -0,0 +1,95 @@
+import base64
+
+import numpy as np
+import pytest
+from calculator_mcp_server import evaluate_grid, GRID_CHUNK_POINTS, GRID_PAGE_POINTS
+
+
+class TestEvaluateGrid:
+    """Test cases for the evaluate_grid tool."""
+
+    def test_array_output(self):
+        result = evaluate_grid("x * y", {"x": [1, 2], "y": [10, 20, 30]}, output="array")
+        assert result == {
+            "result": [10.0, 20.0, 30.0, 20.0, 40.0, 60.0],
+            "shape": [2, 3],
+            "offset": 0,
+            "count": 6,
+            "next_offset": None,
+        }
+
+    def test_range_specifications(self):
+        result = evaluate_grid(
+            "x + y",
+            {"x": {"start": 0, "stop": 1, "num": 3}, "y": {"start": 0, "stop": 1, "step": 0.5}},
+            output="array",
+        )
+        assert result["shape"] == [3, 2]
+        assert result["result"] == [0.0, 0.5, 0.5, 1.0, 1.0, 1.5]
+
+    def test_summary_statistics(self):
+        result = evaluate_grid("x**2 + y**2", {"x": [-1, 0, 1], "y": [0, 1]})
+        summary = result["result"]
+        assert summary["count"] == 6
+        assert summary["min"] == 0.0
+        assert summary["argmin"] == {"x": 0.0, "y": 0.0}
+        assert summary["max"] == 2.0
+        assert summary["mean"] == pytest.approx(7 / 6)
+        assert summary["std"] == pytest.approx(np.std([1, 2, 0, 1, 1, 2]))
+
+    def test_summary_across_chunks_matches_numpy(self):
+        x = np.linspace(0, 3, 300)
+        y = np.linspace(-1, 1, 500)
+        assert x.size * y.size > GRID_CHUNK_POINTS
+        result = evaluate_grid("sin(x) * y", {"x": x.tolist(), "y": y.tolist()})
+        values = np.sin(x)[:, None] * y[None, :]
+        summary = result["result"]
+        assert summary["count"] == values.size
+        assert summary["mean"] == pytest.approx(values.mean(), abs=1e-12)
+        assert summary["std"] == pytest.approx(values.std())
+        assert summary["max"] == pytest.approx(values.max())
+
+    def test_non_finite_values_counted(self):
+        summary = evaluate_grid("log(x)", {"x": [-1, 0, 1, np.e]})["result"]
+        assert summary["nan"] == 1
+        assert summary["infinite"] == 1
+        assert summary["finite"] == 2
+        assert summary["max"] == pytest.approx(1.0)
+
+    def test_paging(self):
+        parameters = {"x": list(range(7)), "y": list(range(5))}
+        full = evaluate_grid("x * 5 + y", parameters, output="array")["result"]
+        page = evaluate_grid("x * 5 + y", parameters, output="array", offset=8, limit=10)
+        assert page["result"] == full[8:18]
+        assert page["next_offset"] == 18
+        last = evaluate_grid("x * 5 + y", parameters, output="array", offset=30, limit=10)
+        assert last["count"] == 5
+        assert last["next_offset"] is None
+
+    def test_default_page_size(self):
+        parameters = {"x": list(range(1000)), "y": list(range(300))}
+        page = evaluate_grid("x * 300 + y", parameters, output="array")
+        assert page["count"] == GRID_PAGE_POINTS
+        assert page["next_offset"] == GRID_PAGE_POINTS
+        rest = evaluate_grid("x * 300 + y", parameters, output="array", offset=page["next_offset"], limit=10**9)
+        assert rest["count"] == GRID_PAGE_POINTS
+        data = np.frombuffer(base64.b64decode(rest["result"]["data"]), dtype="<f8")
+        assert data[0] == GRID_PAGE_POINTS
+
+    def test_large_array_is_encoded(self):
+        result = evaluate_grid("x + y", {"x": list(range(200)), "y": list(range(100))}, output="array")
+        assert result["truncated"] is True
+        data = np.frombuffer(base64.b64decode(result["result"]["data"]), dtype="<f8")
+        assert data[101] == 2.0
+
+    def test_oversized_grid_rejected(self):
+        result = evaluate_grid("x", {"x": {"start": 0, "stop": 1, "num": 2 * 10**9}})
+        assert result["error_type"] == "rejected"
+
+    def test_invalid_range(self):
+        result = evaluate_grid("x", {"x": {"start": 0, "stop": 1}})
+        assert "error" in result
+
+    def test_invalid_output(self):
+        result = evaluate_grid("x", {"x": [1]}, output="list")
+        assert "error" in result
@@ -0,0 +1,57 @@
+import threading
+import time
+import pytest
+import calculator_mcp_server
+from calculator_mcp_server import integrate
+
+
+class TestIntegrateBudget:
+    """Test cases for the time-budgeted tiered integration in integrate."""
+
+    def test_special_function_closed_form(self):
+        assert integrate("exp(-x**2)") == {"result": "sqrt(pi)*erf(x)/2"}
+
+    def test_no_closed_form(self):
+        result = integrate("sin(sin(x))")
+        assert result["error_type"] == "no_closed_form"
+        assert [m["method"] for m in result["methods"]] == ["table", "manual", "heurisch", "risch", "meijerg"]
+
+    def test_nonelementary_reported(self):
+        result = integrate("x*exp(exp(exp(x)))")
+        assert result["error"] == "No elementary closed form exists"
+
+    def test_budget_bounds_latency(self, monkeypatch):
+        def slow(expr, var):
+            time.sleep(5)
+
+        monkeypatch.setattr(calculator_mcp_server, "_INTEGRATION_METHODS", [("slow", slow, 1.0)])
+        start = time.monotonic()
+        result = integrate("sin(sin(x))", timeout=0.2)
+        assert time.monotonic() - start < 1.0
+        assert result["error_type"] == "timeout"
+        assert result["methods"] == [{"method": "slow", "outcome": "timeout"}]
+
+    def test_abandoned_threads_are_bounded(self, monkeypatch):
+        release = threading.Event()
+
+        def stuck(expr, var):
+            release.wait(10)
+
+        monkeypatch.setattr(calculator_mcp_server, "_INTEGRATION_METHODS", [("stuck", stuck, 1.0)])
+        # Overrunning computations of earlier tests may still be running
+        limit = calculator_mcp_server._abandoned_budget_threads + 1
+        monkeypatch.setattr(calculator_mcp_server, "BUDGET_MAX_ABANDONED_THREADS", limit)
+        try:
+            assert integrate("sin(sin(x))", timeout=0.1)["error_type"] == "timeout"
+            result = integrate("sin(sin(x))", timeout=0.1)
+            assert result["error_type"] == "rejected"
+            assert "--symbolic-workers" in result["error"]
+        finally:
+            release.set()
+        deadline = time.monotonic() + 5
+        while calculator_mcp_server._abandoned_budget_threads >= limit and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert integrate("sin(sin(x))", timeout=0.1)["error_type"] == "no_closed_form"
+
+    def test_invalid_timeout(self):
+        assert "error" in integrate("x", timeout=0)
@@ -36,112 +36,112 @@ class TestJSONRPCMessageHandling:
 class TestToolCallValidation:
     """Test cases for tool call parameter validation."""
 
-    def test_calculate_valid_expression(self):
+    def test_calculate_valid_expression(self, call_tool):
         """Test calculate tool with valid expression."""
-        result = app._tool_manager._tools["calculate"].fn("2 + 2")
+        result = call_tool("calculate", "2 + 2")
         assert result == {"result": 4}
 
-    def test_calculate_invalid_expression(self):
+    def test_calculate_invalid_expression(self, call_tool):
         """Test calculate tool with invalid expression."""
-        result = app._tool_manager._tools["calculate"].fn("invalid * expression")
+        result = call_tool("calculate", "invalid * expression")
         assert "error" in result
 
-    def test_solve_equation_valid(self):
+    def test_solve_equation_valid(self, call_tool):
         """Test solve_equation with valid equation."""
-        result = app._tool_manager._tools["solve_equation"].fn("x**2 - 4 = 0")
+        result = call_tool("solve_equation", "x**2 - 4 = 0")
         assert "solutions" in result
 
-    def test_solve_equation_invalid_format(self):
+    def test_solve_equation_invalid_format(self, call_tool):
         """Test solve_equation with invalid format (no =)."""
-        result = app._tool_manager._tools["solve_equation"].fn("x**2 - 4")
+        result = call_tool("solve_equation", "x**2 - 4")
         assert "error" in result
 
-    def test_solve_equation_multiple_variables(self):
+    def test_solve_equation_multiple_variables(self, call_tool):
         """Test solve_equation with multiple variables."""
-        result = app._tool_manager._tools["solve_equation"].fn("x + y = 5")
+        result = call_tool("solve_equation", "x + y = 5")
         assert "error" in result
 
-    def test_mean_valid_data(self):
+    def test_mean_valid_data(self, call_tool):
         """Test mean tool with valid data."""
-        result = app._tool_manager._tools["mean"].fn([1, 2, 3, 4])
+        result = call_tool("mean", [1, 2, 3, 4])
         assert result == {"result": 2.5}
 
-    def test_mean_empty_data(self):
+    def test_mean_empty_data(self, call_tool):
         """Test mean tool with empty data."""
-        result = app._tool_manager._tools["mean"].fn([])
+        result = call_tool("mean", [])
         assert "error" in result
 
-    def test_matrix_addition_valid(self):
+    def test_matrix_addition_valid(self, call_tool):
         """Test matrix_addition with valid matrices."""
-        result = app._tool_manager._tools["matrix_addition"].fn([[1, 2]], [[3, 4]])
+        result = call_tool("matrix_addition", [[1, 2]], [[3, 4]])
         assert result == {"result": [[4, 6]]}
 
-    def test_matrix_addition_dimension_mismatch(self):
+    def test_matrix_addition_dimension_mismatch(self, call_tool):
         """Test matrix_addition with dimension mismatch."""
-        result = app._tool_manager._tools["matrix_addition"].fn([[1, 2]], [[3, 4, 5]])
+        result = call_tool("matrix_addition", [[1, 2]], [[3, 4, 5]])
         assert "error" in result
 
-    def test_vector_dot_product_valid(self):
+    def test_vector_dot_product_valid(self, call_tool):
         """Test vector_dot_product with valid vectors."""
-        result = app._tool_manager._tools["vector_dot_product"].fn((1, 2), (3, 4))
+        result = call_tool("vector_dot_product", (1, 2), (3, 4))
         assert result == {"result": 11.0}
 
-    def test_vector_dot_product_dimension_mismatch(self):
+    def test_vector_dot_product_dimension_mismatch(self, call_tool):
         """Test vector_dot_product with dimension mismatch."""
-        result = app._tool_manager._tools["vector_dot_product"].fn((1, 2), (3, 4, 5))
+        result = call_tool("vector_dot_product", (1, 2), (3, 4, 5))
         assert "error" in result
 
 
 class TestResponseFormatting:
     """Test cases for response formatting."""
 
-    def test_success_response_structure(self):
+    def test_success_response_structure(self, call_tool):
         """Test that success responses have correct JSON-RPC structure."""
-        result = app._tool_manager._tools["calculate"].fn("2 + 2")
+        result = call_tool("calculate", "2 + 2")
         # Responses should be dicts with either "result" or "error"
         assert isinstance(result, dict)
         assert "result" in result or "error" in result
 
-    def test_error_response_structure(self):
+    def test_error_response_structure(self, call_tool):
         """Test that error responses have correct structure."""
-        result = app._tool_manager._tools["calculate"].fn("invalid")
+        result = call_tool("calculate", "invalid")
         assert isinstance(result, dict)
         assert "error" in result
         assert isinstance(result["error"], str)
 
-    def test_calculate_response_types(self):
+    def test_calculate_response_types(self, call_tool):
         """Test that calculate returns appropriate types."""
         # Numeric result
-        result = app._tool_manager._tools["calculate"].fn("2 + 2")
+        result = call_tool("calculate", "2 + 2")
         assert result["result"] == 4
 
         # Error string
-        result = app._tool_manager._tools["calculate"].fn("undefined_var")
+        result = call_tool("calculate", "undefined_var")
         assert isinstance(result["error"], str)
 
-    def test_solve_equation_response_format(self):
+    def test_solve_equation_response_format(self, call_tool):
         """Test solve_equation response format."""
-        result = app._tool_manager._tools["solve_equation"].fn("x - 2 = 0")
+        result = call_tool("solve_equation", "x - 2 = 0")
         assert "solutions" in result
         assert isinstance(result["solutions"], str)
 
-    def test_statistical_tools_response_format(self):
+    def test_statistical_tools_response_format(self, call_tool):
         """Test statistical tools return float results."""
-        result = app._tool_manager._tools["mean"].fn([1.0, 2.0, 3.0])
+        result = call_tool("mean", [1.0, 2.0, 3.0])
         assert isinstance(result["result"], float)
 
-    def test_matrix_tools_response_format(self):
+    def test_matrix_tools_response_format(self, call_tool):
         """Test matrix tools return list of lists."""
-        result = app._tool_manager._tools["matrix_transpose"].fn([[1, 2], [3, 4]])
+        result = call_tool("matrix_transpose", [[1, 2], [3, 4]])
         assert isinstance(result["result"], list)
         assert all(isinstance(row, list) for row in result["result"])
 
-    def test_vector_tools_response_format(self):
+    def test_vector_tools_response_format(self, call_tool):
         """Test vector tools return appropriate types."""
         # Magnitude returns float
-        result = app._tool_manager._tools["vector_magnitude"].fn((3, 4))
+        result = call_tool("vector_magnitude", (3, 4))
         assert isinstance(result["result"], float)
 
         # Cross product returns list
-        result = app._tool_manager._tools["vector_cross_product"].fn((1, 0, 0), (0, 1, 0))
+        result = call_tool("vector_cross_product", (1, 0, 0), (0, 1, 0))
         assert isinstance(result["result"], list)
\ No newline at end of file
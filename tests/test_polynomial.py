@@ -0,0 +1,51 @@
+import math
+import pytest
+import sympy as sp
+from calculator_mcp_server import (
+    factorize,
+    solve_equation,
+)
+
+
+class TestPolynomialFastPath:
+    """Test cases for the polynomial fast path of solve_equation and factorize."""
+
+    def test_exact_roots_match_general_solver(self):
+        x = sp.Symbol("x")
+        for equation in ["x**2 + 1 = 0", "2*x**2 + 3*x = 1", "x**4 = 2", "(x - 1)**3*(x + 2) = 0"]:
+            left, right = equation.split("=")
+            expected = sp.solve(sp.sympify(left) - sp.sympify(right), x)
+            assert solve_equation(equation) == {"solutions": str(expected)}
+
+    def test_roots_without_radicals(self):
+        result = solve_equation("x**5 - x + 1 = 0")
+        assert result["solutions"].count("CRootOf") == 5
+
+    def test_numeric_roots(self):
+        solutions = solve_equation("x**2 = 2", numeric=True)["solutions"]
+        values = [float(value) for value in solutions.strip("[]").split(",")]
+        assert values == pytest.approx([-math.sqrt(2), math.sqrt(2)], rel=1e-14)
+
+    def test_numeric_complex_roots(self):
+        solutions = solve_equation("x**2 + 1 = 0", numeric=True)["solutions"]
+        assert solutions.startswith("[-") and solutions.endswith("*I]")
+
+    def test_numeric_high_degree(self):
+        solutions = solve_equation("x**100 - 3*x + 1 = 0", numeric=True)["solutions"]
+        assert solutions.count(",") == 99
+
+    def test_numeric_non_polynomial(self):
+        assert solve_equation("1/x = 4", numeric=True) == {"solutions": "[0.25]"}
+
+    def test_factor_list_matches_factor(self):
+        for expression in ["x**60 - 1", "2*x**2 - 2", "x**2*y - y", "6*x**2/4 - 3/2"]:
+            assert factorize(expression) == {"result": str(sp.factor(sp.sympify(expression)))}
+
+    def test_non_unit_content_kept_in_front(self):
+        assert factorize("2*x + 4") == {"result": "2*(x + 2)"}
+        assert factorize("3*x - 3") == {"result": "3*(x - 1)"}
+        assert factorize("-2*x - 4") == {"result": "-2*(x + 2)"}
+        assert factorize("x/3 + 2/3") == {"result": "(x + 2)/3"}
+
+    def test_non_polynomial_factorization(self):
+        assert factorize("(x**2 - 1)/(x + 1)") == {"result": "x - 1"}
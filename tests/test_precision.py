@@ -0,0 +1,65 @@
+import math
+import pytest
+from calculator_mcp_server import (
+    calculate,
+    ESCALATION_MAX_DIGITS,
+)
+
+
+class TestAdaptivePrecision:
+    """Test cases for calculate's escalation to arbitrary precision."""
+
+    def test_fast_path_has_no_precision_entry(self):
+        assert calculate("sqrt(2)") == {"result": math.sqrt(2)}
+
+    def test_overflow_escalates(self):
+        result = calculate("exp(1000)")
+        assert result["result"].startswith("1.970071114017")
+        assert result["result"].endswith("e+434")
+        assert result["precision"] == {"mode": "mpmath", "digits": 30, "reason": "overflow"}
+
+    def test_cancellation_escalates(self):
+        result = calculate("1 - cos(1e-10)")
+        assert result["result"] == pytest.approx(5e-21, rel=1e-9)
+        assert result["precision"]["reason"] == "cancellation"
+
+    def test_absorbed_operand_escalates(self):
+        result = calculate("1e16 + 1 - 1e16")
+        assert result["result"] == 1.0
+        assert result["precision"]["reason"] == "cancellation"
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("2.5 - 2.5", 0.0),
+        ("1.0 - 1", 0.0),
+        ("-2.5 + 2.5", 0.0),
+        ("3.0 - 3.0 + 1", 1.0),
+    ])
+    def test_exact_zero_of_literals_is_not_cancellation(self, expression, expected):
+        assert calculate(expression) == {"result": expected}
+
+    def test_zero_of_computed_operands_is_verified(self):
+        result = calculate("sin(pi/2) - 1")
+        assert result["result"] == 0.0
+        assert result["precision"]["reason"] == "cancellation"
+
+    def test_decimal_literals_are_exact_after_escalation(self):
+        result = calculate("0.1 + 0.2 - 0.3")
+        assert result["result"] == 0.0
+
+    def test_requested_digits(self):
+        result = calculate("sqrt(2)", digits=40)
+        assert result["result"] == "1.41421356237309504880168872420969807857"
+        assert result["precision"]["reason"] == "requested"
+
+    def test_integer_arithmetic_stays_exact(self):
+        assert calculate("2**100") == {"result": 2**100}
+
+    def test_invalid_digits(self):
+        assert "error" in calculate("pi", digits=0)
+
+    def test_digits_capped(self):
+        result = calculate("exp(pi)", digits=ESCALATION_MAX_DIGITS + 1)
+        assert result["error"] == f"Digits must be between 1 and {ESCALATION_MAX_DIGITS}"
+
+    def test_digits_with_variables_rejected(self):
+        assert "error" in calculate("x", {"x": [1.0]}, digits=10)
@@ -0,0 +1,44 @@
+import base64
+import pytest
+import numpy as np
+from calculator_mcp_server import calculate
+
+
+class TestResultEncoding:
+    """Test cases for size-aware encoding of calculate results."""
+
+    def test_small_integer_returned_whole(self):
+        result = calculate("10**999")
+        assert result == {"result": 10**999}
+
+    def test_huge_integer_summarized(self):
+        result = calculate("2**10000")
+        assert result["truncated"] is True
+        summary = result["result"]
+        assert summary["digits"] == 3011
+        assert summary["leading"] == "19950631168807583848"
+        assert summary["trailing"] == "81774304792596709376"
+        assert summary["scientific"] == "1.9950631168807583848e+3010"
+
+    def test_summary_at_power_of_ten(self):
+        summary = calculate("-(10**1001 - 1)")["result"]
+        assert summary["digits"] == 1001
+        assert summary["leading"] == "-" + "9" * 20
+
+    def test_full_result_returns_decimal_string(self):
+        result = calculate("2**10000", full_result=True)
+        assert "truncated" not in result
+        assert result["result"].startswith("19950631168807583848")
+        assert len(result["result"]) == 3011
+
+    def test_small_array_returned_as_list(self):
+        assert calculate("np.arange(5)") == {"result": [0, 1, 2, 3, 4]}
+
+    def test_large_array_encoded_as_base64(self):
+        result = calculate("np.arange(20000) * 1.0")
+        assert result["truncated"] is True
+        encoded = result["result"]
+        assert encoded["shape"] == [20000]
+        assert encoded["dtype"] == "f8"
+        data = np.frombuffer(base64.b64decode(encoded["data"]), dtype="<f8")
+        assert np.array_equal(data, np.arange(20000) * 1.0)
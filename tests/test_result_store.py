@@ -0,0 +1,77 @@
+import pytest
+import calculator_mcp_server
+from calculator_mcp_server import (
+    ResultStore,
+    configure_result_store,
+    factorize,
+    integrate,
+    solve_equation,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    configure_result_store(str(tmp_path / "results.db"))
+    yield calculator_mcp_server.RESULT_STORE
+    configure_result_store(None)
+
+
+class TestResultStore:
+    """Test cases for the SQLite-backed result cache."""
+
+    def test_put_and_get(self, tmp_path):
+        store = ResultStore(str(tmp_path / "results.db"))
+        assert store.get("integrate", "Symbol('x')", "x") is None
+        store.put("integrate", "Symbol('x')", "x", {"result": "x**2/2"})
+        assert store.get("integrate", "Symbol('x')", "x") == {"result": "x**2/2"}
+        assert store.stats()["hits"] == 1
+        assert store.stats()["misses"] == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "results.db")
+        first = ResultStore(path)
+        first.put("solve", "expr", "x", {"solutions": "[1]"})
+        first.close()
+        assert ResultStore(path).get("solve", "expr", "x") == {"solutions": "[1]"}
+
+    def test_shared_between_open_connections(self, tmp_path):
+        path = str(tmp_path / "results.db")
+        first, second = ResultStore(path), ResultStore(path)
+        first.put("factor", "expr", "", {"result": "(x - 1)*(x + 1)"})
+        assert second.get("factor", "expr", "") == {"result": "(x - 1)*(x + 1)"}
+
+    def test_size_based_eviction(self, tmp_path):
+        store = ResultStore(str(tmp_path / "results.db"), max_bytes=300)
+        for i in range(10):
+            store.put("integrate", f"expr{i}", "x", {"result": "y" * 50})
+            # Keep the first entry recently used
+            store.get("integrate", "expr0", "x")
+        stats = store.stats()
+        assert stats["bytes"] <= 300
+        assert store.get("integrate", "expr0", "x") is not None
+        assert store.get("integrate", "expr1", "x") is None
+
+
+class TestMemoizedTools:
+    """Test cases for symbolic tools using the result cache."""
+
+    def test_integrate_reuses_result(self, store):
+        first = integrate("x*exp(x)")
+        assert store.stats()["entries"] == 1
+        assert integrate("exp(x) * x") == first
+        assert store.stats()["hits"] == 1
+
+    def test_variable_is_part_of_key(self, store):
+        assert integrate("x*y", "y") == {"result": "x*y**2/2"}
+        assert integrate("x*y", "x") == {"result": "x**2*y/2"}
+
+    def test_solve_and_factorize_cached(self, store):
+        assert solve_equation("x**2 = 4") == {"solutions": "[-2, 2]"}
+        assert factorize("x**2 - 1") == {"result": "(x - 1)*(x + 1)"}
+        assert solve_equation("x**2 = 4") == {"solutions": "[-2, 2]"}
+        assert factorize("x**2 - 1") == {"result": "(x - 1)*(x + 1)"}
+        assert store.stats()["hits"] == 2
+
+    def test_errors_not_cached(self, store):
+        assert "error" in solve_equation("x + y = 1")
+        assert store.stats()["entries"] == 0
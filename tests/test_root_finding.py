@@ -0,0 +1,43 @@
+import math
+import pytest
+from calculator_mcp_server import solve_equation
+
+
+class TestNumericRootFinding:
+    """Test cases for the numeric root-finding fallback of solve_equation."""
+
+    @staticmethod
+    def roots(result):
+        return [float(value) for value in result["solutions"].strip("[]").split(",") if value]
+
+    def test_transcendental_equation(self):
+        result = solve_equation("x*exp(x) = 3", method="numeric")
+        assert result["method"] == "numeric" and result["interval"] == [-10.0, 10.0]
+        assert self.roots(result) == pytest.approx([1.0499088949640398], rel=1e-12)
+
+    def test_falls_back_when_symbolic_solver_is_too_slow(self):
+        result = solve_equation("cos(x) = x", timeout=0.5)
+        assert result["method"] == "numeric"
+        assert self.roots(result) == pytest.approx([0.7390851332151607], rel=1e-12)
+
+    def test_symbolic_solution_is_preferred(self):
+        assert solve_equation("x*exp(x) = 3") == {"solutions": "[LambertW(3)]"}
+
+    def test_all_roots_in_interval(self):
+        result = solve_equation("sin(x) = 0", method="numeric", interval=[-7, 7])
+        assert self.roots(result) == pytest.approx([-2 * math.pi, -math.pi, 0.0, math.pi, 2 * math.pi], abs=1e-12)
+
+    def test_poles_are_not_roots(self):
+        result = solve_equation("tan(x) = x", method="numeric", interval=[1, 5])
+        assert self.roots(result) == pytest.approx([4.493409457909064], rel=1e-12)
+
+    def test_double_root(self):
+        result = solve_equation("(x - 1.5)**2*exp(x) = 0", method="numeric")
+        assert self.roots(result) == pytest.approx([1.5], rel=1e-6)
+
+    def test_no_real_roots(self):
+        assert solve_equation("exp(x) = -1", method="numeric")["solutions"] == "[]"
+
+    def test_invalid_arguments(self):
+        assert "error" in solve_equation("x = 1", method="bisection")
+        assert "error" in solve_equation("x = 1", method="numeric", interval=[2, 1])
@@ -1,3 +1,5 @@
+import math
+
 import pytest
 from calculator_mcp_server import calculate
 
@@ -114,4 +116,96 @@ class TestSecurityVulnerabilities:
         large_num = "10**" + str(10**6)
         result = calculate(large_num)
         # Should handle large exponents gracefully
-        assert isinstance(result, dict)
\ No newline at end of file
+        assert isinstance(result, dict)
+
+class TestRestrictedEvaluator:
+    """Test cases for the AST-based restricted evaluator."""
+
+    def test_private_attribute_access_rejected(self):
+        result = calculate("(1).__class__")
+        assert "error" in result
+        assert "__class__" in result["error"]
+
+    def test_numpy_file_access_rejected(self):
+        result = calculate("np.load('/etc/passwd')")
+        assert "error" in result
+        assert "not allowed" in result["error"]
+
+    def test_numpy_submodules_unreachable(self):
+        for expression in ["np.f2py.os.getcwd()", "np.f2py.subprocess", "np.lib", "np.testing", "np.linalg.linalg"]:
+            result = calculate(expression)
+            assert "error" in result
+            assert "not allowed" in result["error"]
+
+    def test_math_module_allowlisted(self):
+        assert calculate("math.sqrt(16)") == {"result": 4.0}
+        assert "not allowed" in calculate("math.sys")["error"]
+
+    @pytest.mark.parametrize("method", ["dump('{path}')", "tofile('{path}')", "dumps()"])
+    def test_array_io_methods_rejected(self, tmp_path, method):
+        path = tmp_path / "out"
+        for value in ["np.zeros(3)", "np.sum(np.zeros(3))"]:
+            result = calculate(f"{value}.{method.format(path=path)}")
+            assert "not allowed" in result["error"]
+        assert not path.exists()
+
+    def test_raw_memory_rejected(self):
+        assert "not allowed" in calculate("np.zeros(3).ctypes")["error"]
+
+    def test_module_valued_attribute_rejected(self):
+        import os
+        import types
+        from calculator_mcp_server import ExpressionCompiler
+        program = ExpressionCompiler().compile("value.os")
+        with pytest.raises(ValueError, match="not allowed"):
+            program({"value": types.SimpleNamespace(os=os)})
+
+    def test_allowlisted_numpy_functions(self):
+        assert calculate("np.linalg.det(np.eye(3))") == {"result": 1.0}
+        assert calculate("np.zeros(3).shape") == {"result": (3,)}
+
+    @pytest.mark.parametrize("expression", [
+        '"{0.__globals__[os].environ}".format(cot)',
+        '"{0.__class__.__mro__}".format(1)',
+        '"{0.__globals__}".format_map(cot)',
+    ])
+    def test_format_string_escape_rejected(self, expression):
+        result = calculate(expression)
+        assert "error" in result
+        assert "PATH" not in result["error"]
+
+    def test_format_method_rejected(self):
+        assert "not allowed" in calculate("np.zeros(1).dtype.str.format(cot)")["error"]
+
+    def test_helpers_do_not_expose_module_globals(self):
+        from calculator_mcp_server import ALLOW_FUNCTION, VECTOR_FUNCTION
+        for table in (ALLOW_FUNCTION, VECTOR_FUNCTION):
+            for name in ("cot", "csc", "sec", "log", "isqrt"):
+                helper = table[name]
+                if hasattr(helper, "__globals__"):
+                    assert helper.__globals__ == {"__builtins__": {}}
+        assert calculate("cot(1)")["result"] == pytest.approx(1 / math.tan(1))
+        assert calculate("log(8, 2) + isqrt(x)", {"x": [16.0]})["result"] == [7.0]
+
+    @pytest.mark.parametrize("expression", ["np.zeros(2).view", "np.asarray", "sin", "np"])
+    def test_callable_results_rejected(self, expression):
+        result = calculate(expression)
+        assert "not a value" in result["error"]
+
+    def test_comprehension_rejected(self):
+        result = calculate("[x for x in (1, 2)]")
+        assert "error" in result
+        assert "Unsupported syntax" in result["error"]
+
+    def test_lambda_rejected(self):
+        result = calculate("(lambda: 1)()")
+        assert "error" in result
+
+    def test_matches_python_semantics(self):
+        for expression in ["7 // 2", "-2 ** 2", "1 < 2 < 3", "2 if 0 else 3", "math.floor(2.5)", "(1, 2)[1]"]:
+            assert calculate(expression) == {"result": eval(expression, {"math": __import__("math")})}
+
+    def test_large_constant_power_not_folded_at_compile_time(self):
+        from calculator_mcp_server import ExpressionCompiler, ALLOW_FUNCTION
+        program = ExpressionCompiler().compile("2 ** 100000 > 1")
+        assert program(ALLOW_FUNCTION) is True
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+import sympy as sp
+import calculator_mcp_server
+from calculator_mcp_server import SYMPY_CACHE, series
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    SYMPY_CACHE.clear()
+    yield
+    SYMPY_CACHE.clear()
+
+
+class TestSeries:
+    """Test cases for the series tool."""
+
+    def test_maclaurin_series(self):
+        assert series("sin(x)") == {
+            "result": "x - x**3/6 + x**5/120 + O(x**6)",
+            "coefficients": ["0", "1", "0", "-1/6", "0", "1/120"],
+        }
+
+    def test_matches_sympy(self):
+        for expression in ["exp(x)*cos(x)", "tan(x)", "log(1 + x)", "1/(1 - x)"]:
+            expected = sp.series(sp.sympify(expression), sp.Symbol("x"), 0, 8)
+            assert sp.sympify(series(expression, order=8)["result"]) == expected
+
+    def test_other_point(self):
+        assert series("1/x", point=1, order=3) == {
+            "result": "1 - (x - 1) + (x - 1)**2 + O((x - 1)**3, (x, 1))",
+            "coefficients": ["1", "-1", "1"],
+        }
+
+    def test_symbolic_point(self):
+        result = series("sin(x)", point="pi/4", order=2)
+        assert result["coefficients"] == ["sqrt(2)/2", "sqrt(2)/2"]
+
+    def test_numeric_coefficients(self):
+        assert series("exp(x)", order=4, numeric=True)["coefficients"] == pytest.approx([1.0, 1.0, 0.5, 1 / 6])
+
+    def test_removable_singularity(self):
+        result = series("sin(x)/x")
+        assert result["result"] == "1 - x**2/6 + x**4/120 + O(x**6)"
+        assert result["coefficients"] == ["1", "0", "-1/6", "0", "1/120", "0"]
+
+    def test_laurent_series_has_no_coefficients(self):
+        result = series("cos(x)/x", order=3)
+        assert result["result"] == str(sp.series(sp.sympify("cos(x)/x"), sp.Symbol("x"), 0, 3))
+        assert "coefficients" not in result
+
+    def test_higher_order_reuses_derivatives(self):
+        series("tan(x)", order=10)
+        with patch("calculator_mcp_server.diff", wraps=calculator_mcp_server.diff) as counted:
+            result = series("tan(x)", order=11)
+        assert counted.call_count == 1
+        assert result["coefficients"][9] == "62/2835"
+
+    def test_parametric_expression_uses_derivatives(self):
+        with patch("calculator_mcp_server.sp.series", wraps=sp.series) as expanded:
+            result = series("exp(a*x)", order=4)
+        assert expanded.call_count == 0
+        assert result["coefficients"] == ["1", "a", "a**2/2", "a**3/6"]
+        assert sp.sympify(result["result"]) == sp.series(sp.sympify("exp(a*x)"), sp.Symbol("x"), 0, 4)
+        assert SYMPY_CACHE.get(("taylor", sp.sympify("exp(a*x)"), sp.Symbol("x"), sp.S.Zero, False)) is not None
+
+    def test_parametric_numeric_coefficients(self):
+        result = series("exp(a*x)", order=3, numeric=True)
+        assert result["coefficients"][:2] == [1.0, "a"]
+        assert sp.sympify(result["coefficients"][2]) == sp.sympify("0.5*a**2")
+
+    def test_invalid_order(self):
+        assert "error" in series("x", order=0)
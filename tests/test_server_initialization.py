@@ -41,6 +41,18 @@ class TestToolRegistration:
             "summation",
             "expand",
             "factorize",
+            "calculate_batch",
+            "evaluate_grid",
+            "workspace",
+            "definite_integral",
+            "solve_system",
+            "derivatives",
+            "compile_expression",
+            "evaluate_compiled",
+            "series",
+            "simplify",
+            "check_equivalence",
+            "symbolic_batch",
         ]
         registered_tools = list(app._tool_manager._tools.keys())
         assert len(registered_tools) == len(expected_tools)
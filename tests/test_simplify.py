@@ -0,0 +1,47 @@
+import time
+from unittest.mock import patch
+
+import sympy as sp
+from calculator_mcp_server import simplify
+
+
+def slow_rewrite(expr):
+    time.sleep(1)
+    return sp.Integer(0)
+
+
+class TestSimplify:
+    """Test cases for the simplify tool."""
+
+    def test_rational_function(self):
+        assert simplify("(x**2 - 1)/(x - 1)") == {"result": "x + 1", "ops": 1, "original_ops": 4, "steps": ["cancel"]}
+
+    def test_trigonometric_identity(self):
+        result = simplify("sin(x)**2 + cos(x)**2")
+        assert result["result"] == "1" and result["steps"] == ["trigsimp"]
+
+    def test_powers(self):
+        assert simplify("exp(x)*exp(y)")["result"] == "exp(x + y)"
+
+    def test_result_is_equivalent(self):
+        expression = "1/(x + 1) - 1/(x - 1) + 2/(x**2 - 1) + x**a*x**b"
+        result = simplify(expression)
+        assert result["ops"] < result["original_ops"]
+        assert sp.simplify(sp.sympify(result["result"]) - sp.sympify(expression)) == 0
+
+    def test_already_simple(self):
+        assert simplify("(x + 1)**2") == {"result": "(x + 1)**2", "ops": 2, "original_ops": 2, "steps": []}
+
+    def test_budget_returns_best_so_far(self):
+        rewrites = [("cancel", sp.cancel), ("slow", slow_rewrite)]
+        with patch("calculator_mcp_server._SIMPLIFY_REWRITES", rewrites):
+            start = time.monotonic()
+            result = simplify("(x**2 - 1)/(x - 1)", timeout=0.2)
+        assert time.monotonic() - start < 0.9
+        assert result["result"] == "x + 1" and result["budget_exhausted"] is True
+
+    def test_invalid_expression(self):
+        assert "error" in simplify("x + ((")
+
+    def test_invalid_timeout(self):
+        assert "error" in simplify("x", timeout=0)
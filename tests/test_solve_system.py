@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+import pytest
+from calculator_mcp_server import solve_system
+
+
+def tridiagonal_system(n):
+    """Equations x{i-1} + 4*x{i} + x{i+1} = i and their dense coefficient matrix."""
+    equations = []
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        terms = [f"4*x{i}"]
+        matrix[i, i] = 4
+        if i > 0:
+            terms.insert(0, f"x{i - 1}")
+            matrix[i, i - 1] = 1
+        if i < n - 1:
+            terms.append(f"x{i + 1}")
+            matrix[i, i + 1] = 1
+        equations.append(" + ".join(terms) + f" = {i}")
+    return equations, matrix
+
+
+class TestLinearSystems:
+    """Test cases for linear systems in solve_system."""
+
+    def test_exact_solution(self):
+        assert solve_system(["x + y = 3", "x - y = 1"]) == {
+            "solutions": [{"x": "2", "y": "1"}],
+            "method": "linsolve",
+        }
+
+    def test_numeric_solution(self):
+        assert solve_system(["x + y = 3", "x - y = 1"], numeric=True) == {
+            "solutions": [{"x": 2.0, "y": 1.0}],
+            "method": "dense",
+        }
+
+    def test_unexpanded_equations(self):
+        result = solve_system(["2*(x + y) = 3", "x*(1 + y) - x*y = 1"])
+        assert result["solutions"] == [{"x": "1", "y": "1/2"}]
+
+    def test_underdetermined_system(self):
+        assert solve_system(["x + y = 3"])["solutions"] == [{"x": "3 - y", "y": "y"}]
+
+    def test_inconsistent_system(self):
+        assert solve_system(["x + y = 3", "2*x + 2*y = 1"], numeric=True)["solutions"] == []
+
+    def test_symbolic_coefficients(self):
+        result = solve_system(["a*x + y = 3", "x - y = 1"], variables=["x", "y"])
+        assert result["solutions"] == [{"x": "4/(a + 1)", "y": "(3 - a)/(a + 1)"}]
+
+    def test_complex_coefficients(self):
+        result = solve_system(["x + I*y = 1", "x - y = 0"], numeric=True)
+        assert result["solutions"] == [{"x": "0.5 - 0.5*I", "y": "0.5 - 0.5*I"}]
+
+    def test_large_sparse_system(self):
+        equations, matrix = tridiagonal_system(500)
+        result = solve_system(equations)
+        assert result["method"] == "sparse"
+        expected = np.linalg.solve(matrix, np.arange(500.0))
+        values = [result["solutions"][0][f"x{i}"] for i in range(500)]
+        assert values == pytest.approx(expected, rel=1e-10, abs=1e-12)
+
+    def test_medium_dense_system(self):
+        equations = [f"{i + 2}*x{i} + x{(i + 1) % 40} = 1" for i in range(40)]
+        result = solve_system(equations)
+        assert result["method"] == "dense"
+        assert result["solutions"][0]["x0"] == pytest.approx(math.exp(-1), rel=1e-3)
+
+
+class TestNonlinearSystems:
+    """Test cases for nonlinear systems in solve_system."""
+
+    def test_symbolic_solutions(self):
+        result = solve_system(["x**2 + y**2 = 1", "x = y"])
+        assert result["method"] == "solve"
+        assert result["solutions"] == [
+            {"x": "-sqrt(2)/2", "y": "-sqrt(2)/2"},
+            {"x": "sqrt(2)/2", "y": "sqrt(2)/2"},
+        ]
+
+    def test_numeric_solution_uses_nsolve(self):
+        result = solve_system(["x**2 + y**2 = 1", "x = y"], numeric=True, initial_guess=[1, 1])
+        assert result["method"] == "nsolve"
+        assert result["solutions"][0]["x"] == pytest.approx(math.sqrt(0.5), rel=1e-12)
+
+    def test_nsolve_after_symbolic_timeout(self):
+        result = solve_system(["sin(x) = y", "x + y = 1"], timeout=0.5)
+        assert result["method"] == "nsolve"
+        x, y = result["solutions"][0]["x"], result["solutions"][0]["y"]
+        assert math.sin(x) == pytest.approx(y) and x + y == pytest.approx(1)
+
+
+class TestSolveSystemErrors:
+    """Test cases for invalid input to solve_system."""
+
+    def test_missing_equals(self):
+        assert "error" in solve_system(["x + y"])
+
+    def test_no_equations(self):
+        assert "error" in solve_system([])
+
+    def test_initial_guess_length(self):
+        assert "error" in solve_system(["x*y = 1", "x = y"], numeric=True, initial_guess=[1])
@@ -0,0 +1,63 @@
+import math
+import pytest
+from calculator_mcp_server import summation
+
+
+class TestSummationEngines:
+    """Test cases for the numeric and accelerated engines of summation."""
+
+    def test_closed_form_is_preferred(self):
+        assert summation("1/x**2", 1, "oo") == {"result": pytest.approx(math.pi ** 2 / 6)}
+
+    def test_numeric_float_sum(self):
+        result = summation("1/x", 1, 10**6, method="numeric")
+        assert result["method"] == "numeric" and result["terms"] == 10**6
+        assert result["result"] == pytest.approx(14.392726722865723631, rel=1e-15)
+
+    def test_long_numeric_sum_runs_without_pool(self):
+        result = summation("1/x", 1, 10**6)
+        assert result["method"] == "numeric"
+        assert result["result"] == pytest.approx(14.392726722865723631, rel=1e-15)
+
+    def test_numeric_integer_sum_is_exact(self):
+        n = 10**6
+        result = summation("x**2", 1, n, method="numeric")
+        assert result["result"] == n * (n + 1) * (2 * n + 1) // 6
+
+    def test_integral_non_polynomial_summand(self):
+        result = summation("floor(sqrt(x))", 1, 10**4, method="numeric")
+        assert result["result"] == sum(math.isqrt(k) for k in range(1, 10**4 + 1))
+
+    def test_reversed_bounds(self):
+        assert summation("x", 5, 1, method="numeric")["result"] == summation("x", 5, 1)["result"] == -9
+
+    def test_undefined_term(self):
+        assert "error" in summation("1/x", 0, 10, method="numeric")
+
+    def test_accelerated_infinite_sum(self):
+        result = summation("sin(x)/x**2", 1, "oo")
+        assert result["method"] == "accelerated"
+        assert result["result"] == pytest.approx(1.0139591323607685, rel=1e-13)
+
+    def test_accelerated_slowly_converging_sum(self):
+        result = summation("1/x**1.5", 1, "oo", method="numeric")
+        assert result["result"] == pytest.approx(2.612375348685488, rel=1e-13)
+
+    @pytest.mark.parametrize("expression, start, end", [
+        ("(-1)**x", 0, "oo"),
+        ("sin(x)", 1, "oo"),
+        ("1/sqrt(x)", 1, "oo"),
+        ("1/log(x)", 2, "oo"),
+        ("(-1)**x", "-oo", 0),
+    ])
+    def test_divergent_series_rejected(self, expression, start, end):
+        result = summation(expression, start, end, method="numeric")
+        assert "result" not in result
+        assert "diverge" in result["error"]
+
+    def test_accelerated_sum_to_minus_infinity(self):
+        result = summation("1/(x**2 + 1)", "-oo", "oo", method="numeric")
+        assert result["result"] == pytest.approx(math.pi / math.tanh(math.pi), rel=1e-13)
+
+    def test_invalid_method(self):
+        assert "error" in summation("x", 1, 5, method="fast")
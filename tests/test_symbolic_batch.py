@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+import pytest
+import sympy as sp
+import calculator_mcp_server
+from calculator_mcp_server import differentiate, expand, factorize, integrate, symbolic_batch
+
+EXPRESSIONS = ["x**2 + 3*x", "sin(x)*exp(x)", "(x + 1)**3", "x**2 - 5*x + 6", "y", "x + ((", "1/x"]
+
+
+class TestSymbolicBatch:
+    """Test cases for the symbolic_batch tool."""
+
+    @pytest.mark.parametrize(
+        "operation, tool",
+        [
+            ("differentiate", lambda e: differentiate(e)),
+            ("integrate", lambda e: integrate(e)),
+            ("expand", expand),
+            ("factorize", factorize),
+        ],
+    )
+    def test_matches_single_tools(self, operation, tool):
+        assert symbolic_batch(operation, EXPRESSIONS) == {"results": [tool(e) for e in EXPRESSIONS]}
+
+    def test_variable(self):
+        assert symbolic_batch("differentiate", ["x*y", "y**2"], variable="y") == {
+            "results": [{"result": "x"}, {"result": "2*y"}]
+        }
+
+    def test_repeated_expressions_computed_once(self):
+        with patch("calculator_mcp_server.diff", wraps=calculator_mcp_server.diff) as diff:
+            result = symbolic_batch("differentiate", ["x**3", "x**2", "x**3"])
+        assert result == {"results": [{"result": "3*x**2"}, {"result": "2*x"}, {"result": "3*x**2"}]}
+        assert diff.call_count == 2
+
+    def test_failing_item_does_not_affect_others(self):
+        with patch("calculator_mcp_server.diff", side_effect=[ValueError("boom"), sp.Integer(1)]):
+            result = symbolic_batch("differentiate", ["x**2", "x"])
+        assert result == {"results": [{"error": "Invalid expression"}, {"result": "1"}]}
+
+
+class TestSymbolicBatchErrors:
+    """Test cases for invalid input to symbolic_batch."""
+
+    def test_unknown_operation(self):
+        assert "error" in symbolic_batch("simplify", ["x"])
+
+    def test_empty_list(self):
+        assert "error" in symbolic_batch("expand", [])
+
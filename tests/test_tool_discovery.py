@@ -29,7 +29,10 @@ class TestToolDiscovery:
             "correlation_coefficient", "linear_regression", "confidence_interval",
             "matrix_addition", "matrix_multiplication", "matrix_transpose",
             "matrix_determinant", "vector_dot_product", "vector_cross_product",
-            "vector_magnitude", "plot_function", "summation", "expand", "factorize"
+            "vector_magnitude", "plot_function", "summation", "expand", "factorize",
+            "calculate_batch", "evaluate_grid", "workspace", "definite_integral",
+            "solve_system", "derivatives", "compile_expression", "evaluate_compiled", "series",
+            "simplify", "check_equivalence", "symbolic_batch",
         ]
 
         for tool_name in expected_tools:
@@ -45,7 +48,7 @@ class TestToolDiscovery:
     def test_tool_count_matches_expected(self):
         """Test that the number of registered tools matches expected count."""
         tools = app._tool_manager._tools
-        expected_count = 23  # Based on the expected_tools list
+        expected_count = 35  # Based on the expected_tools list
         assert len(tools) == expected_count, f"Expected {expected_count} tools, but found {len(tools)}"
 
     def test_no_duplicate_tools(self):
@@ -0,0 +1,31 @@
+import math
+import pytest
+from calculator_mcp_server import calculate
+
+
+class TestCalculateVariables:
+    """Test cases for calculate with array variable bindings."""
+
+    def test_single_variable(self):
+        result = calculate("x**2 + 1", {"x": [0, 1, 2]})
+        assert result == {"result": [1.0, 2.0, 5.0]}
+
+    def test_vectorized_functions(self):
+        result = calculate("sin(x) + sqrt(y)", {"x": [0, math.pi / 2], "y": [4, 9]})
+        assert result["result"] == pytest.approx([2.0, 4.0])
+
+    def test_log_with_base(self):
+        result = calculate("log(x, 10)", {"x": [10, 100]})
+        assert result["result"] == pytest.approx([1.0, 2.0])
+
+    def test_reduction_returns_scalar(self):
+        result = calculate("sum(x * y)", {"x": [1, 2, 3], "y": [4, 5, 6]})
+        assert result == {"result": 32.0}
+
+    def test_mismatched_lengths(self):
+        result = calculate("x + y", {"x": [1, 2], "y": [1, 2, 3]})
+        assert "error" in result
+
+    def test_invalid_variable_name(self):
+        result = calculate("1", {"__class__": [1.0]})
+        assert "error" in result
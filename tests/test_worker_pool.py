@@ -0,0 +1,216 @@
+import asyncio
+import time
+import pytest
+import sympy as sp
+from calculator_mcp_server import (
+    app,
+    calculate,
+    calculate_batch,
+    configure_calculate_pool,
+    configure_symbolic_pool,
+    expand,
+    factorize,
+    integrate,
+    solve_equation,
+    summation,
+    symbolic_batch,
+    WorkerPool,
+    WorkerTimeout,
+    _ship,
+    _unship,
+)
+
+
+WARMED_UP = False
+
+
+def mark_warmed_up():
+    global WARMED_UP
+    WARMED_UP = True
+
+
+def is_warmed_up():
+    return WARMED_UP
+
+
+@pytest.fixture
+def calculate_pool():
+    """Fixture enabling a small isolated worker pool for calculate."""
+    configure_calculate_pool(2, timeout=1.0, memory_limit=64 * 1024 * 1024)
+    yield
+    configure_calculate_pool(0)
+
+
+@pytest.fixture(scope="module")
+def symbolic_pool():
+    """Fixture enabling a small warmed-up SymPy worker pool for the symbolic tools."""
+    configure_symbolic_pool(2, timeout=5.0)
+    yield
+    configure_symbolic_pool(0)
+
+
+class TestIsolatedCalculate:
+    """Test cases for calculate running in the isolated worker pool."""
+
+    def test_results_match_inline(self, calculate_pool):
+        assert calculate("2 + 3") == {"result": 5}
+        assert calculate("x * 2", {"x": [1, 2]}) == {"result": [2.0, 4.0]}
+        assert "name 'invalid' is not defined" in calculate("invalid")["error"]
+
+    def test_timeout_is_reported_and_worker_replaced(self, calculate_pool):
+        start = time.time()
+        result = calculate("factorial(10**7)")
+        assert result["error_type"] == "timeout"
+        assert result["limit"] == 1.0
+        assert time.time() - start < 5.0
+        # The pool keeps serving requests after a worker was killed
+        assert calculate("1 + 1") == {"result": 2}
+
+    def test_memory_limit(self, calculate_pool):
+        result = calculate("np.ones(10**7)")
+        assert result["error_type"] == "memory"
+        assert calculate("2 * 2") == {"result": 4}
+
+    def test_unbounded_estimate_uses_pool(self, calculate_pool):
+        # Broadcasting two small arrays builds 10**8 elements, which the estimate cannot bound
+        result = calculate("np.ones((10**4, 1)) * np.ones(10**4)")
+        assert result["error_type"] == "memory"
+
+    def test_batch_uses_pool(self, calculate_pool):
+        result = calculate_batch(["1 + 1", "factorial(10**7)", "3 * 3"])
+        assert result["results"][0] == {"result": 2}
+        assert result["results"][1]["error_type"] == "timeout"
+        assert result["results"][2] == {"result": 9}
+
+
+class TestEventLoop:
+    """Test cases for pooled tools running off the server's event loop."""
+
+    def test_pooled_tools_are_awaited(self):
+        for name in ["calculate", "calculate_batch", "evaluate_grid"]:
+            assert app._tool_manager._tools[name].is_async
+
+    def test_symbolic_tools_are_awaited(self):
+        for name in ["solve_equation", "solve_system", "integrate", "summation", "expand", "factorize",
+                     "simplify", "check_equivalence", "symbolic_batch"]:
+            assert app._tool_manager._tools[name].is_async
+
+    def test_symbolic_call_does_not_block_other_clients(self, symbolic_pool):
+        async def timed(tool, arguments, delay=0.0):
+            await asyncio.sleep(delay)
+            start = time.monotonic()
+            await app.call_tool(tool, arguments)
+            return time.monotonic() - start
+
+        async def main():
+            return await asyncio.gather(
+                timed("integrate", {"expression": "1/(x**5 + x + 1)", "timeout": 1}),
+                timed("expand", {"expression": "(x + 1)**2"}, delay=0.2),
+            )
+
+        slow, fast = asyncio.run(main())
+        assert slow > 0.8
+        assert fast < 0.5
+
+    def test_pooled_call_does_not_block_other_clients(self, calculate_pool):
+        async def timed(expression, delay=0.0):
+            await asyncio.sleep(delay)
+            start = time.monotonic()
+            await app.call_tool("calculate", {"expression": expression})
+            return time.monotonic() - start
+
+        async def main():
+            return await asyncio.gather(timed("factorial(10**7)"), timed("1 + 1", delay=0.2))
+
+        slow, fast = asyncio.run(main())
+        assert slow > 0.5
+        assert fast < 0.3
+
+
+class TestWorkerPool:
+    """Test cases for the generic worker pool."""
+
+    def test_exceptions_are_reraised(self):
+        pool = WorkerPool(1, timeout=1.0)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                pool.run(divmod, 1, 0)
+            assert pool.run(divmod, 7, 2) == (3, 1)
+        finally:
+            pool.shutdown()
+
+    def test_timeout_raises(self):
+        pool = WorkerPool(1, timeout=5.0)
+        try:
+            with pytest.raises(WorkerTimeout):
+                pool.run(time.sleep, 2, timeout=0.2)
+            assert pool.run(divmod, 7, 2) == (3, 1)
+        finally:
+            pool.shutdown()
+
+    def test_replacement_is_warmed_up(self):
+        pool = WorkerPool(1, timeout=5.0, warmup=(mark_warmed_up,))
+        try:
+            assert pool.run(is_warmed_up) is True
+            with pytest.raises(WorkerTimeout):
+                pool.run(time.sleep, 2, timeout=0.2)
+            assert pool.run(is_warmed_up) is True
+        finally:
+            pool.shutdown()
+
+    def test_workers_are_not_forked_from_server(self):
+        pool = WorkerPool(1, timeout=5.0)
+        try:
+            assert pool._context.get_start_method() in ("forkserver", "spawn")
+            assert pool.run(divmod, 7, 2) == (3, 1)
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.parametrize("timeout", [0, -1.0])
+    def test_non_positive_timeout_rejected(self, timeout):
+        with pytest.raises(ValueError):
+            WorkerPool(1, timeout=timeout)
+        with pytest.raises(ValueError):
+            configure_calculate_pool(1, timeout=timeout)
+        with pytest.raises(ValueError):
+            configure_symbolic_pool(1, timeout=timeout)
+
+
+class TestBudgetedIntegration:
+    """Test cases for integrate methods running in the worker pool."""
+
+    def test_runaway_method_killed(self, symbolic_pool):
+        start = time.time()
+        result = integrate("1/(x**5 + x + 1)", timeout=1)
+        assert result["error_type"] == "timeout"
+        assert time.time() - start < 3.0
+        assert integrate("x**2") == {"result": "x**3/3"}
+        assert calculate("1 + 1") == {"result": 2}
+
+
+class TestSymbolicPool:
+    """Test cases for the symbolic tools running in the SymPy worker pool."""
+
+    def test_results_match_inline(self, symbolic_pool):
+        assert expand("(x + 1)**2") == {"result": "x**2 + 2*x + 1"}
+        assert factorize("x**2 - 1") == {"result": "(x - 1)*(x + 1)"}
+        assert summation("x", 1, 5) == {"result": 15}
+        assert solve_equation("x**2 = 4") == {"solutions": "[-2, 2]"}
+        assert integrate("x*exp(x)") == {"result": "x*exp(x) - exp(x)"}
+
+    def test_errors_are_reported(self, symbolic_pool):
+        assert expand("(x + ") == {"error": "Invalid expression"}
+        assert "error" in summation("1/x", 0, 10, method="numeric")
+
+    def test_batch_uses_pool(self, symbolic_pool):
+        expressions = [f"x**{i} - 1" for i in range(2, 12)] + ["x + (("]
+        pooled = symbolic_batch("factorize", expressions)
+        assert pooled == {"results": [factorize(expression) for expression in expressions]}
+        assert pooled["results"][-1] == {"error": "Invalid expression"}
+
+    def test_srepr_shipping_round_trip(self):
+        x = sp.Symbol("x", positive=True)
+        args = (sp.sin(x) / x, [x, sp.Dummy("t")], 3, "text")
+        shipped = _ship(args)
+        assert all(isinstance(item, str) for item in shipped[1])
+        assert _unship(shipped) == args
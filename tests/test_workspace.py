@@ -0,0 +1,173 @@
+import mpmath
+import numpy as np
+import pytest
+from calculator_mcp_server import (
+    calculate,
+    calculate_batch,
+    estimate_expression_cost,
+    workspace,
+    Workspace,
+    WorkspaceStore,
+    WORKSPACES,
+    _used_bindings,
+)
+
+
+class FakeSession:
+    """Stands in for an MCP server session."""
+
+
+class FakeContext:
+    """Minimal request context exposing a session."""
+
+    def __init__(self, session):
+        self.session = session
+
+
+@pytest.fixture(autouse=True)
+def clean_workspaces():
+    WORKSPACES.clear()
+    yield
+    WORKSPACES.clear()
+
+
+class TestWorkspaceAssignment:
+    """Test cases for named results in calculate."""
+
+    def test_assign_and_reference(self):
+        assert calculate("a = 6 * 7") == {"result": 42, "name": "a"}
+        assert calculate("a + 1") == {"result": 43}
+
+    def test_comparison_is_not_assignment(self):
+        calculate("a = 3")
+        assert calculate("a == 3") == {"result": True}
+        assert calculate("a <= 2") == {"result": False}
+
+    def test_reassignment_replaces_value(self):
+        calculate("a = 1")
+        calculate("a = a + 1")
+        assert calculate("a") == {"result": 2}
+
+    def test_array_value(self):
+        calculate("v = np.arange(4)")
+        assert calculate("sum(v)") == {"result": 6}
+
+    def test_escalated_value_keeps_precision(self):
+        response = calculate("b = exp(1000)")
+        assert response["precision"]["reason"] == "overflow"
+        result = calculate("log(b)", digits=30)["result"]
+        assert abs(mpmath.mpf(result) - 1000) < 1e-20
+
+    def test_reserved_name_rejected(self):
+        assert "error" in calculate("sin = 1")
+        assert "error" in calculate("_x = 1")
+
+    def test_failed_assignment_stores_nothing(self):
+        assert "error" in calculate("a = 1 / 0")
+        assert "error" in calculate("a")
+
+    def test_batch_reads_workspace(self):
+        calculate("a = 10")
+        assert calculate_batch(["a + 1", "a * 2"]) == {"results": [{"result": 11}, {"result": 20}]}
+
+    def test_workspace_size_feeds_cost_estimate(self):
+        calculate("big = 10**10000")
+        assert calculate("big ** big")["error_type"] == "rejected"
+
+
+class TestSessionIsolation:
+    """Test cases for per-session workspaces."""
+
+    def test_sessions_do_not_share_values(self):
+        first, second = FakeContext(FakeSession()), FakeContext(FakeSession())
+        calculate("a = 1", ctx=first)
+        calculate("a = 2", ctx=second)
+        assert calculate("a", ctx=first) == {"result": 1}
+        assert calculate("a", ctx=second) == {"result": 2}
+        assert "error" in calculate("a")
+
+    def test_idle_workspace_evicted(self):
+        store = WorkspaceStore(idle_timeout=0.0)
+        session = FakeSession()
+        store.get(session).set("a", 1)
+        store.get(FakeSession())
+        assert "a" not in store.get(session).values
+
+    def test_least_recently_used_session_dropped(self):
+        store = WorkspaceStore(max_sessions=2)
+        sessions = [FakeSession() for _ in range(3)]
+        for session in sessions:
+            store.get(session)
+        assert len(store) == 2
+
+
+class TestWorkspaceLimits:
+    """Test cases for workspace memory caps."""
+
+    def test_memory_limit(self):
+        store = Workspace(max_bytes=1000)
+        store.set("a", 1)
+        with pytest.raises(ValueError):
+            store.set("b", 10**10000)
+
+    def test_variable_limit(self):
+        store = Workspace(max_variables=1)
+        store.set("a", 1)
+        store.set("a", 2)
+        with pytest.raises(ValueError):
+            store.set("b", 3)
+
+    def test_calculate_reports_limit(self):
+        WORKSPACES.get().max_bytes = 100
+        result = calculate("v = np.ones(1000)")
+        assert result["error_type"] == "rejected"
+
+
+class TestWorkspaceTool:
+    """Test cases for the workspace tool."""
+
+    def test_list(self):
+        calculate("a = 2 ** 10")
+        result = workspace()
+        assert result["result"]["a"]["type"] == "int"
+        assert result["bytes"] > 0
+
+    def test_delete(self):
+        calculate("a = 1")
+        result = workspace("delete", ["a", "missing"])
+        assert result == {"result": {"deleted": ["a"], "missing": ["missing"]}}
+        assert "error" in calculate("a")
+
+    def test_clear(self):
+        calculate("a = 1")
+        calculate("b = 2")
+        assert workspace("clear") == {"result": {"deleted": ["a", "b"]}}
+        assert workspace()["result"] == {}
+
+    def test_invalid_action(self):
+        assert "error" in workspace("drop")
+
+
+class TestWorkspaceCost:
+    """Test cases for admission control of expressions using workspace values."""
+
+    def test_only_referenced_bindings_are_used(self):
+        bindings = {"a": 1, "b": np.ones(10), "sin": 3}
+        assert _used_bindings("a * sin(2)", bindings) == {"a": 1, "sin": 3}
+        assert _used_bindings("b.sum() + 1", bindings).keys() == {"b"}
+        assert _used_bindings("a +", bindings) == {}
+
+    def test_estimate_cached_by_binding_shape(self):
+        cost = estimate_expression_cost("v * 2", {"v": np.ones(10), "w": 1})
+        assert estimate_expression_cost("v * 2", {"v": np.zeros(10)}) is cost
+        assert estimate_expression_cost("v * 2", {"v": np.ones(20)}) is not cost
+
+    def test_estimate_depends_on_binding_size(self):
+        assert estimate_expression_cost("n ** 2", {"n": 3})["class"] == "cheap"
+        assert estimate_expression_cost("n ** 2", {"n": 2 ** 2**22})["class"] == "expensive"
+
+    def test_unrelated_large_value_does_not_affect_results(self):
+        calculate("big = np.ones(10**4)")
+        calculate("a = 6")
+        assert calculate("a * 7") == {"result": 42}
+        assert calculate_batch(["a + 1", "big.size"]) == {"results": [{"result": 7}, {"result": 10000}]}